@@ -8,6 +8,7 @@ import discord
 from discord import utils
 from discord.ext import commands
 
+from cache import messages
 from database import errors, guilds
 from database import settings as settings_db
 from resources import functions, settings
@@ -97,4 +98,7 @@ if __name__ == '__main__':
         bot.load_extension(extension)
 
 
-bot.run(settings.TOKEN)
\ No newline at end of file
+bot.run(settings.TOKEN)
+
+# Runs after the bot was closed (/dev shutdown) or the process received SIGINT/SIGTERM
+functions.await_coroutine(messages.save_messages_to_file())
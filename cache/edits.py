@@ -0,0 +1,95 @@
+# edits.py
+"""Contains the edit subscriptions and access to them. Subscriptions are fed by cogs.cache.
+
+Helpers that need to follow the edits of a game message subscribe to its message id. Raw edit events are routed
+to the matching subscription with a single dict lookup, so the cost of an edit event doesn't grow with the amount of
+active helpers.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+
+import discord
+from discord import utils
+
+from resources import settings
+
+
+_SUBSCRIPTIONS = {}
+
+
+class Subscription():
+    """Queue of raw edit events for one message"""
+    __slots__ = ('expires_at', 'message_id', 'queue')
+
+    def __init__(self, message_id: int, expires_at: datetime) -> None:
+        self.expires_at = expires_at
+        self.message_id = message_id
+        self.queue = asyncio.Queue()
+
+    async def wait_for_edit(self, timeout: float = settings.INTERACTION_TIMEOUT) -> discord.RawMessageUpdateEvent:
+        """Waits for the next edit of the message. Also extends the subscription by the timeout.
+
+        Returns
+        -------
+        The raw edit event.
+
+        Raises
+        ------
+        TimeoutError if the message wasn't edited within the timeout. The subscription is removed in that case.
+        """
+        self.expires_at = utils.utcnow() + timedelta(seconds=timeout)
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            await unsubscribe(self)
+            raise
+
+
+async def subscribe(message_id: int, timeout: float = settings.INTERACTION_TIMEOUT) -> Optional[Subscription]:
+    """Subscribes to the edits of a message. Every message can only have one subscription.
+
+    Returns
+    -------
+    The subscription. None if the message already has an active subscription.
+    """
+    subscription = _SUBSCRIPTIONS.get(message_id, None)
+    if subscription is not None and subscription.expires_at > utils.utcnow(): return None
+    subscription = Subscription(message_id, utils.utcnow() + timedelta(seconds=timeout))
+    _SUBSCRIPTIONS[message_id] = subscription
+    return subscription
+
+
+async def unsubscribe(subscription: Subscription) -> None:
+    """Removes a subscription. Does nothing if the message is subscribed to by a newer subscription."""
+    if _SUBSCRIPTIONS.get(subscription.message_id, None) is subscription:
+        del _SUBSCRIPTIONS[subscription.message_id]
+
+
+async def dispatch_edit(payload: discord.RawMessageUpdateEvent) -> bool:
+    """Hands a raw edit event to the subscription of its message.
+
+    Returns
+    -------
+    True if the message had a subscription, False otherwise.
+    """
+    subscription = _SUBSCRIPTIONS.get(payload.message_id, None)
+    if subscription is None: return False
+    subscription.queue.put_nowait(payload)
+    return True
+
+
+async def delete_expired_subscriptions() -> int:
+    """Deletes subscriptions whose subscribers stopped waiting without unsubscribing.
+
+    Returns
+    -------
+    Amount of subscriptions deleted: int
+    """
+    current_time = utils.utcnow()
+    expired_message_ids = [message_id for message_id, subscription in _SUBSCRIPTIONS.items()
+                           if subscription.expires_at < current_time]
+    for message_id in expired_message_ids:
+        del _SUBSCRIPTIONS[message_id]
+    return len(expired_message_ids)
@@ -0,0 +1,33 @@
+# embeds.py
+"""Contains the pre-rendered fields of static embeds, e.g. of /help.
+
+The fields are rendered by content.main. They contain slash mentions, so they are removed whenever the command
+mentions are rebuilt.
+"""
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+_HELP_FIELDS_SIZE = 100
+_HELP_FIELDS = OrderedDict() # prefix: Tuple[(field name, field value)]
+
+
+async def get_help_fields(prefix: str) -> Optional[Tuple[Tuple[str, str], ...]]:
+    """Returns the rendered help fields for a prefix. Returns None if they aren't rendered yet."""
+    help_fields = _HELP_FIELDS.get(prefix, None)
+    if help_fields is not None: _HELP_FIELDS.move_to_end(prefix)
+    return help_fields
+
+
+async def store_help_fields(prefix: str, help_fields: Tuple[Tuple[str, str], ...]) -> None:
+    """Stores the rendered help fields for a prefix"""
+    _HELP_FIELDS[prefix] = help_fields
+    _HELP_FIELDS.move_to_end(prefix)
+    if len(_HELP_FIELDS) > _HELP_FIELDS_SIZE:
+        _HELP_FIELDS.popitem(last=False)
+
+
+async def clear_help_fields() -> None:
+    """Removes all rendered help fields"""
+    _HELP_FIELDS.clear()
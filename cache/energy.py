@@ -0,0 +1,133 @@
+# energy.py
+"""Contains the energy states of users. Used by the energy functions in resources.functions.
+
+Energy regenerates linearly, so the energy of a user at any time follows from energy_max, energy_full_time and the
+time it takes to regenerate 1 energy. That regen time depends on the donor tier, the energy regeneration upgrade and
+the live events. It is cached per user. States are rebuilt if the donor tier or the event multiplier changed, upgrade
+changes have to be reported with invalidate_energy_state.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from database import upgrades, users
+from resources import exceptions, settings, strings
+
+
+@dataclass()
+class EnergyState():
+    """Energy of a user. energy_full_time is None if the energy was never tracked."""
+    user_id: int
+    donor_tier: int
+    energy_full_time: Optional[datetime]
+    energy_max: int
+    energy_regen_multiplier_donor: float
+    energy_regen_multiplier_event: float
+    energy_regen_multiplier_upgrade: float
+    energy_regen_time: timedelta
+
+    def get_energy(self, current_time: datetime) -> float:
+        """Returns the energy at a time. The amount is NOT rounded.
+
+        Raises
+        ------
+        exceptions.EnergyFullTimeNoneError if energy_full_time is None.
+        exceptions.EnergyFullTimeOutdatedError if energy_full_time is further away than a full regeneration.
+        """
+        if self.energy_full_time is None:
+            raise exceptions.EnergyFullTimeNoneError
+        if self.energy_full_time <= current_time:
+            return self.energy_max
+        energy_until_max = (
+            (self.energy_full_time - current_time).total_seconds() / self.energy_regen_time.total_seconds()
+        )
+        if energy_until_max > self.energy_max:
+            raise exceptions.EnergyFullTimeOutdatedError
+        return self.energy_max - energy_until_max
+
+    def get_energy_full_time_after_change(self, energy_amount: int, current_time: datetime) -> datetime:
+        """Returns energy_full_time after the energy changed by an amount. The amount can be negative.
+        If the energy is outdated, the user is assumed to have full energy before the change.
+
+        Raises
+        ------
+        exceptions.EnergyFullTimeNoneError if energy_full_time is None.
+        """
+        energy_full_time = self.energy_full_time
+        try:
+            energy_current = int(self.get_energy(current_time))
+        except exceptions.EnergyFullTimeOutdatedError:
+            energy_current = self.energy_max
+            energy_full_time = current_time
+        if energy_current == self.energy_max:
+            energy_full_time = current_time
+        if energy_amount > self.energy_max - energy_current:
+            return current_time
+        energy_amount_time = abs(energy_amount) * self.energy_regen_time
+        if energy_amount < 0: return energy_full_time + energy_amount_time
+        return energy_full_time - energy_amount_time
+
+    def get_time_until_energy(self, energy_amount: int, current_time: datetime) -> timedelta:
+        """Returns the time until the user has an amount of energy. Negative if the user already has more.
+
+        Raises
+        ------
+        exceptions.EnergyFullTimeNoneError if energy_full_time is None.
+        exceptions.EnergyFullTimeOutdatedError if energy_full_time is further away than a full regeneration.
+        """
+        energy_current = int(self.get_energy(current_time))
+        return timedelta(seconds=(energy_amount - energy_current) * self.energy_regen_time.total_seconds())
+
+
+_ENERGY_STATES_SIZE = 5000
+_ENERGY_STATES = OrderedDict() # user_id: EnergyState
+
+
+async def _get_energy_regen_multipliers(user_settings: users.User) -> Tuple[float, float]:
+    """Returns the energy regen multipliers of the donor tier and the energy regeneration upgrade of a user
+
+    Returns
+    -------
+    Tuple[multiplier donor, multiplier upgrade]
+    """
+    try:
+        energy_upgrade: upgrades.Upgrade = await upgrades.get_upgrade(user_settings.user_id, 'energy regeneration')
+        multiplier_upgrade = strings.ENERGY_UPGRADE_LEVEL_MULTIPLIERS[energy_upgrade.level]
+    except exceptions.NoDataFoundError:
+        multiplier_upgrade = 1
+    multiplier_donor = list(strings.DONOR_TIER_ENERGY_MULTIPLIERS.values())[user_settings.donor_tier]
+    return (multiplier_donor, multiplier_upgrade)
+
+
+async def get_energy_state(user_settings: users.User) -> EnergyState:
+    """Returns the energy state of a user. energy_max and energy_full_time are always taken from the user settings."""
+    energy_state = _ENERGY_STATES.get(user_settings.user_id, None)
+    if (energy_state is None or energy_state.donor_tier != user_settings.donor_tier
+        or energy_state.energy_regen_multiplier_event != settings.ENERGY_REGEN_MULTIPLIER_EVENT):
+        multiplier_donor, multiplier_upgrade = await _get_energy_regen_multipliers(user_settings)
+        energy_regen = 5 / (multiplier_donor * multiplier_upgrade * settings.ENERGY_REGEN_MULTIPLIER_EVENT)
+        energy_state = EnergyState(
+            user_id = user_settings.user_id,
+            donor_tier = user_settings.donor_tier,
+            energy_full_time = user_settings.energy_full_time,
+            energy_max = user_settings.energy_max,
+            energy_regen_multiplier_donor = multiplier_donor,
+            energy_regen_multiplier_event = settings.ENERGY_REGEN_MULTIPLIER_EVENT,
+            energy_regen_multiplier_upgrade = multiplier_upgrade,
+            energy_regen_time = timedelta(minutes=energy_regen),
+        )
+        _ENERGY_STATES[user_settings.user_id] = energy_state
+    else:
+        energy_state.energy_full_time = user_settings.energy_full_time
+        energy_state.energy_max = user_settings.energy_max
+    _ENERGY_STATES.move_to_end(user_settings.user_id)
+    if len(_ENERGY_STATES) > _ENERGY_STATES_SIZE:
+        _ENERGY_STATES.popitem(last=False)
+    return energy_state
+
+
+async def invalidate_energy_state(user_id: int) -> None:
+    """Removes the energy state of a user, e.g. after the upgrades changed"""
+    _ENERGY_STATES.pop(user_id, None)
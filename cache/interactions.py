@@ -0,0 +1,49 @@
+# interactions.py
+"""Contains the interaction owner cache and access to it. Cache is populated by cogs.detection and
+functions.get_interaction.
+
+Game messages often reply to other messages. To find out who used the command, the referenced message has to be
+fetched if it isn't in the py-cord message cache. The owner of every message we see is cached here, so every
+message is fetched at most once.
+"""
+
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+import discord
+
+
+_INTERACTION_CACHE_SIZE = 5000
+_INTERACTION_CACHE = OrderedDict()
+
+
+class InteractionOwner(NamedTuple):
+    """User and command of the interaction of a message. Both are None if the message has no interaction."""
+    user_id: Optional[int]
+    command_name: Optional[str]
+
+
+async def store_interaction(message: discord.Message) -> InteractionOwner:
+    """Adds the interaction owner of a message to the cache. Also stores messages without an interaction, so they are
+    not fetched again either."""
+    if message.interaction is not None:
+        interaction_owner = InteractionOwner(message.interaction.user.id, message.interaction.name)
+    else:
+        interaction_owner = InteractionOwner(None, None)
+    _INTERACTION_CACHE[message.id] = interaction_owner
+    _INTERACTION_CACHE.move_to_end(message.id)
+    if len(_INTERACTION_CACHE) > _INTERACTION_CACHE_SIZE:
+        _INTERACTION_CACHE.popitem(last=False)
+    return interaction_owner
+
+
+async def get_interaction_owner(message_id: int) -> Optional[InteractionOwner]:
+    """Returns the cached interaction owner of a message.
+
+    Returns
+    -------
+    InteractionOwner. None if the message isn't cached.
+    """
+    interaction_owner = _INTERACTION_CACHE.get(message_id, None)
+    if interaction_owner is not None: _INTERACTION_CACHE.move_to_end(message_id)
+    return interaction_owner
@@ -0,0 +1,119 @@
+# members.py
+"""Contains the guild member name index and the registered user ids. The index is maintained by cogs.cache.
+
+The index maps the encoded member names of every guild to the ids of the members with that name, so looking up a
+member by name doesn't have to walk and encode all members of a guild. Guilds are indexed on first use or on startup.
+"""
+
+from typing import Dict, Set, Tuple
+
+import discord
+
+from database import users
+from resources import functions
+
+
+_MEMBER_INDEX: Dict[int, Dict[str, Set[int]]] = {}
+_MEMBER_NAMES: Dict[int, Dict[int, str]] = {}
+_REGISTERED_USER_IDS: Set[int] = set()
+_registered_user_ids_loaded = False
+
+
+# Member index
+async def index_guild(guild: discord.Guild) -> int:
+    """Builds the name index of a guild from its member list. Bots are not indexed.
+
+    Returns
+    -------
+    Amount of members indexed: int
+    """
+    name_index = {}
+    member_names = {}
+    for member in guild.members:
+        if member.bot: continue
+        encoded_name = await functions.encode_text(member.name)
+        name_index.setdefault(encoded_name, set()).add(member.id)
+        member_names[member.id] = encoded_name
+    _MEMBER_INDEX[guild.id] = name_index
+    _MEMBER_NAMES[guild.id] = member_names
+    return len(member_names)
+
+
+async def remove_guild(guild_id: int) -> None:
+    """Removes the name index of a guild"""
+    _MEMBER_INDEX.pop(guild_id, None)
+    _MEMBER_NAMES.pop(guild_id, None)
+
+
+async def add_member(member: discord.Member) -> None:
+    """Adds a member to the name index of its guild. Does nothing if the guild isn't indexed yet."""
+    if member.bot or member.guild.id not in _MEMBER_INDEX: return
+    await remove_member(member.guild.id, member.id)
+    encoded_name = await functions.encode_text(member.name)
+    _MEMBER_INDEX[member.guild.id].setdefault(encoded_name, set()).add(member.id)
+    _MEMBER_NAMES[member.guild.id][member.id] = encoded_name
+
+
+async def remove_member(guild_id: int, member_id: int) -> None:
+    """Removes a member from the name index of a guild"""
+    member_names = _MEMBER_NAMES.get(guild_id, None)
+    if member_names is None: return
+    encoded_name = member_names.pop(member_id, None)
+    if encoded_name is None: return
+    name_index = _MEMBER_INDEX[guild_id]
+    member_ids = name_index.get(encoded_name, set())
+    member_ids.discard(member_id)
+    if not member_ids: name_index.pop(encoded_name, None)
+
+
+async def rename_user(user_id: int, name: str) -> None:
+    """Updates the name of a user in the name index of all guilds the user is indexed in"""
+    encoded_name = await functions.encode_text(name)
+    for guild_id, member_names in _MEMBER_NAMES.items():
+        if member_names.get(user_id, encoded_name) == encoded_name: continue
+        await remove_member(guild_id, user_id)
+        _MEMBER_INDEX[guild_id].setdefault(encoded_name, set()).add(user_id)
+        member_names[user_id] = encoded_name
+
+
+async def get_member_ids_by_name(guild: discord.Guild, user_name: str) -> Tuple[int, ...]:
+    """Returns the ids of all guild members with the given name. Indexes the guild if it isn't indexed yet.
+
+    Returns
+    -------
+    Tuple with the member ids. Empty if no member has that name.
+    """
+    if guild.id not in _MEMBER_INDEX: await index_guild(guild)
+    encoded_name = await functions.encode_text(user_name)
+    return tuple(_MEMBER_INDEX[guild.id].get(encoded_name, ()))
+
+
+# Registered users
+async def load_registered_user_ids() -> int:
+    """Loads the ids of all users that are registered in the database.
+
+    Returns
+    -------
+    Amount of registered users: int
+    """
+    global _registered_user_ids_loaded
+    _REGISTERED_USER_IDS.clear()
+    _REGISTERED_USER_IDS.update(await users.get_all_user_ids())
+    _registered_user_ids_loaded = True
+    return len(_REGISTERED_USER_IDS)
+
+
+async def add_registered_user(user_id: int) -> None:
+    """Marks a user as registered"""
+    _REGISTERED_USER_IDS.add(user_id)
+
+
+async def remove_registered_user(user_id: int) -> None:
+    """Marks a user as not registered"""
+    _REGISTERED_USER_IDS.discard(user_id)
+
+
+async def is_registered_user(user_id: int) -> bool:
+    """Checks if a user is registered in the database. Loads the registered users on first use."""
+    if not _registered_user_ids_loaded: await load_registered_user_ids()
+    return user_id in _REGISTERED_USER_IDS
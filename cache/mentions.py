@@ -0,0 +1,40 @@
+# mentions.py
+"""Contains the slash command mentions of the bot.
+
+Slash mentions need the id of the main command, which is only known after the commands were synced. The ids are read
+from bot.application_commands once and have to be rebuilt with update_command_mentions after a sync or a reload.
+"""
+
+from typing import Dict
+
+import discord
+
+from cache import embeds
+
+
+_COMMAND_IDS: Dict[str, int] = {} # main command name: command id
+_COMMAND_MENTIONS: Dict[str, str] = {} # command name: slash mention
+
+
+async def update_command_mentions(bot: discord.Bot) -> None:
+    """Reads the ids of all synced application commands and removes all cached mentions and the embed fields that
+    contain them"""
+    _COMMAND_IDS.clear()
+    _COMMAND_MENTIONS.clear()
+    await embeds.clear_help_fields()
+    for command in bot.application_commands:
+        if command.id is not None: _COMMAND_IDS.setdefault(command.name, command.id)
+
+
+async def get_command_mention(bot: discord.Bot, command_name: str) -> str:
+    """Returns the slash mention of a command. If the command isn't synced, returns /command.
+    Note that slash mentions only work with GLOBAL commands."""
+    command_mention = _COMMAND_MENTIONS.get(command_name, None)
+    if command_mention is not None: return command_mention
+    if not _COMMAND_IDS: await update_command_mentions(bot)
+    main_command = command_name.lower().split(' ')[0]
+    command_id = _COMMAND_IDS.get(main_command, None)
+    if command_id is None: return f'`/{command_name}`'
+    command_mention = f'</{command_name}:{command_id}>'
+    _COMMAND_MENTIONS[command_name] = command_mention
+    return command_mention
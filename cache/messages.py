@@ -3,9 +3,12 @@
 
 import asyncio
 from argparse import ArgumentError
-from datetime import timedelta
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import json
+import os
 import re
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 import discord
 from discord import utils
@@ -16,6 +19,22 @@ from resources import functions, logs, settings
 _MESSAGE_CACHE = {}
 
 
+@dataclass()
+class RestoredMessage():
+    """Lightweight stand-in for messages restored from the cache file after a restart.
+    Only contains the attributes the message cache is used for."""
+    author: Union[discord.Member, discord.User]
+    channel: discord.abc.Messageable
+    content: str
+    created_at: datetime
+    id: int
+    mentions: List[Union[discord.Member, discord.User]]
+
+    @property
+    def guild(self) -> Optional[discord.Guild]:
+        return getattr(self.channel, 'guild', None)
+
+
 async def find_message(channel_id: int, regex: Union[str, re.Pattern] = None,
                       user: Optional[discord.User] = None, user_name: Optional[str] = None) -> discord.Message:
     """Looks through the last 50 messages in the channel history. If a message that matches regex is found, it returns
@@ -106,4 +125,91 @@ async def delete_old_messages(timespan: timedelta) -> int:
     if message_count > 0:
         for key in list(_MESSAGE_CACHE.keys()):
             if not _MESSAGE_CACHE[key]: del _MESSAGE_CACHE[key]
-    return message_count
\ No newline at end of file
+    return message_count
+
+
+async def save_messages_to_file() -> int:
+    """Writes a compact snapshot of the message cache to settings.MESSAGE_CACHE_FILE.
+    Only messages within settings.MESSAGE_CACHE_TIMESPAN are written.
+    Note: This coroutine never awaits anything, so it can be run with functions.await_coroutine after the event loop
+    is closed.
+
+    Returns
+    -------
+    Amount of messages written: int
+    """
+    min_created_at = utils.utcnow() - timedelta(minutes=settings.MESSAGE_CACHE_TIMESPAN)
+    snapshot = {}
+    message_count = 0
+    for channel_id, channel_messages in _MESSAGE_CACHE.items():
+        channel_snapshot = []
+        for message in channel_messages:
+            if message.created_at < min_created_at: continue
+            channel_snapshot.append(
+                (
+                    message.id,
+                    message.author.id,
+                    message.content,
+                    message.created_at.timestamp(),
+                    [mentioned_user.id for mentioned_user in message.mentions],
+                )
+            )
+        if channel_snapshot:
+            snapshot[str(channel_id)] = channel_snapshot
+            message_count += len(channel_snapshot)
+    try:
+        with open(settings.MESSAGE_CACHE_FILE, 'w', encoding='utf-8') as cache_file:
+            json.dump(snapshot, cache_file, separators=(',', ':'))
+    except OSError as error:
+        logs.logger.error(f'Error writing message cache file: {error}')
+        return 0
+    return message_count
+
+
+async def load_messages_from_file(bot: discord.Bot) -> int:
+    """Loads the snapshot written by save_messages_to_file into the message cache and deletes the file afterwards.
+    Messages older than settings.MESSAGE_CACHE_TIMESPAN and messages whose channel or author can't be found in the
+    bot cache are skipped.
+
+    Returns
+    -------
+    Amount of messages loaded: int
+    """
+    if not os.path.isfile(settings.MESSAGE_CACHE_FILE): return 0
+    try:
+        with open(settings.MESSAGE_CACHE_FILE, 'r', encoding='utf-8') as cache_file:
+            snapshot = json.load(cache_file)
+    except (OSError, ValueError) as error:
+        logs.logger.error(f'Error reading message cache file: {error}')
+        snapshot = {}
+    try:
+        os.remove(settings.MESSAGE_CACHE_FILE)
+    except OSError:
+        pass
+    min_created_at = utils.utcnow() - timedelta(minutes=settings.MESSAGE_CACHE_TIMESPAN)
+    message_count = 0
+    for channel_id, channel_snapshot in snapshot.items():
+        channel = bot.get_channel(int(channel_id))
+        if channel is None: continue
+        guild = getattr(channel, 'guild', None)
+        def get_cached_user(user_id: int) -> Optional[Union[discord.Member, discord.User]]:
+            user = guild.get_member(user_id) if guild is not None else None
+            return user if user is not None else bot.get_user(user_id)
+        channel_messages = []
+        for message_id, author_id, content, created_at, mention_ids in channel_snapshot:
+            created_at = datetime.fromtimestamp(created_at, tz=min_created_at.tzinfo)
+            if created_at < min_created_at: continue
+            author = get_cached_user(author_id)
+            if author is None: continue
+            mentions = [get_cached_user(user_id) for user_id in mention_ids]
+            channel_messages.append(
+                RestoredMessage(author=author, channel=channel, content=content, created_at=created_at,
+                                id=message_id, mentions=[user for user in mentions if user is not None])
+            )
+        if not channel_messages: continue
+        existing_messages = _MESSAGE_CACHE.get(channel.id, [])
+        existing_ids = [message.id for message in existing_messages]
+        channel_messages = [message for message in channel_messages if message.id not in existing_ids]
+        _MESSAGE_CACHE[channel.id] = (existing_messages + channel_messages)[:50]
+        message_count += len(channel_messages)
+    return message_count
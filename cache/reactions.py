@@ -0,0 +1,51 @@
+# reactions.py
+"""Contains the ids of messages the logo reaction was added to. Used by functions.add_logo_reaction.
+
+A message and its edits can be processed several times and message.reactions is often stale, so this is checked
+before any API call is made. Entries expire after REACTION_TTL.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict
+
+from discord import utils
+
+
+REACTION_TTL = timedelta(minutes=15)
+
+_REACTED_MESSAGES: Dict[int, datetime] = {}
+
+
+async def add_reacted_message(message_id: int) -> None:
+    """Marks a message as reacted to"""
+    _REACTED_MESSAGES[message_id] = utils.utcnow() + REACTION_TTL
+
+
+async def remove_reacted_message(message_id: int) -> None:
+    """Removes the reacted mark of a message, e.g. if adding the reaction failed"""
+    _REACTED_MESSAGES.pop(message_id, None)
+
+
+async def check_reacted_message(message_id: int) -> bool:
+    """Checks if a message was reacted to within REACTION_TTL"""
+    expires_at = _REACTED_MESSAGES.get(message_id, None)
+    if expires_at is None: return False
+    if expires_at < utils.utcnow():
+        del _REACTED_MESSAGES[message_id]
+        return False
+    return True
+
+
+async def delete_expired_reacted_messages() -> int:
+    """Deletes all entries older than REACTION_TTL.
+
+    Returns
+    -------
+    Amount of entries deleted: int
+    """
+    current_time = utils.utcnow()
+    expired_message_ids = [message_id for message_id, expires_at in _REACTED_MESSAGES.items()
+                           if expires_at < current_time]
+    for message_id in expired_message_ids:
+        del _REACTED_MESSAGES[message_id]
+    return len(expired_message_ids)
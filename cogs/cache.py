@@ -4,14 +4,72 @@
 import discord
 from discord.ext import commands
 
-from cache import messages
-from resources import settings
+from cache import edits, members, mentions, messages
+from content import main
+from database import cooldowns, users
+from resources import logs, settings
 
 
 class CacheCog(commands.Cog):
     """Cog that contains the cache commands"""
     def __init__(self, bot):
         self.bot = bot
+        self.cache_file_loaded = False
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        """Restores the message cache snapshot from the last shutdown and builds the member name index.
+        Also rebuilds the slash command mentions, as the commands are synced on every connect, and pre-renders the
+        static embeds."""
+        await mentions.update_command_mentions(self.bot)
+        await main.get_help_fields(self.bot, settings.DEFAULT_PREFIX)
+        if self.cache_file_loaded: return
+        self.cache_file_loaded = True
+        await cooldowns.get_all_cooldowns()
+        await users.get_user_count()
+        message_count = await messages.load_messages_from_file(self.bot)
+        if message_count > 0:
+            logs.logger.info(f'Restored {message_count} messages from the message cache file.')
+        await members.load_registered_user_ids()
+        member_count = 0
+        for guild in self.bot.guilds:
+            member_count += await members.index_guild(guild)
+        logs.logger.info(f'Indexed {member_count} members in {len(self.bot.guilds)} guilds.')
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        """Runs when the bot joins a guild"""
+        await members.index_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        """Runs when the bot leaves a guild"""
+        await members.remove_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        """Runs when a member joins a guild"""
+        await members.add_member(member)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, member_before: discord.Member, member_after: discord.Member) -> None:
+        """Runs when a member is updated. Only name changes are relevant for the index."""
+        if member_before.name != member_after.name: await members.add_member(member_after)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member) -> None:
+        """Runs when a member leaves a guild"""
+        await members.remove_member(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, user_before: discord.User, user_after: discord.User) -> None:
+        """Runs when a user changes their user name. Updates the name in all guilds."""
+        if user_before.name != user_after.name: await members.rename_user(user_after.id, user_after.name)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
+        """Runs when a message is edited. Hands the edit to the helper subscribed to the message, if any."""
+        await edits.dispatch_edit(payload)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
@@ -2,30 +2,40 @@
 """Collects and parses IDLE FARM messages"""
 
 import re
-from typing import Dict, Union
+from typing import Union
 
 import discord
 from discord.ext import commands
 
-from database import clans, guilds, users
-from processing import activities, boosts, buy, claim, clan, daily, donate, events, halloween, inventory, open, payday
-from processing import profile, raid, request, shop, teamraid, upgrades, use, vote, workers, xmas
+from cache import interactions
+from database import clans, users
+from processing import activities, boosts, buy, claim, clan, daily, detection, donate, events, halloween, inventory
+from processing import open, parsing, payday, profile, raid, request, router, seasons, shop, teamraid, upgrades, use
+from processing import vote, workers, xmas
 from resources import exceptions, functions, regex, settings
 
 
+PROCESSORS = (
+    activities, boosts, buy, claim, clan, daily, donate, events, halloween, inventory, open, payday, profile, raid,
+    request, shop, teamraid, upgrades, use, vote, workers, xmas,
+)
+
+
 class DetectionCog(commands.Cog):
     """Cog that contains the detection events"""
     def __init__(self, bot):
         self.bot = bot
+        router.clear_routes()
+        for processor in PROCESSORS:
+            if processor in seasons.SEASONAL_PROCESSORS and not seasons.is_processor_live(processor): continue
+            router.register_processor(processor)
 
     @commands.Cog.listener()
     async def on_message_edit(self, message_before: discord.Message, message_after: discord.Message) -> None:
         """Runs when a message is edited in a channel."""
         if message_after.author.id not in [settings.GAME_ID, settings.TESTY_ID]: return
-        embed_data_before = await parse_embed(message_before)
-        embed_data = await parse_embed(message_after)
-        if (message_before.content == message_after.content and embed_data_before == embed_data
-            and message_before.components == message_after.components): return
+        if not await parsing.check_new_version(message_before, message_after): return
+        embed_data = await parsing.parse_embed(message_after)
         if await check_edited_message_never_allowed(message_before, message_after, embed_data): return
         if await check_edited_message_always_allowed(message_before, message_after, embed_data):
             await self.on_message(message_after)
@@ -39,36 +49,36 @@ class DetectionCog(commands.Cog):
     async def on_message(self, message: discord.Message) -> None:
         """Runs when a message is sent in a channel."""
         if message.author.id not in [settings.GAME_ID, settings.TESTY_ID]: return
+        await interactions.store_interaction(message)
         user_settings = clan_settings = None
-        embed_data = await parse_embed(message)
-        embed_data['embed_user'] = None
-        embed_data['embed_user_settings'] = None
+        embed_data = await parsing.parse_embed(message)
+        routes = await router.get_routes(embed_data)
+        if not routes: return
+        context = detection.DetectionContext(message.guild.id)
         interaction_user = await functions.get_interaction_user(message)
-        user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data['author']['icon_url'])
+        user_id_match = re.search(regex.USER_ID_FROM_ICON_URL, embed_data.author.icon_url)
         if user_id_match:
-            embed_data['embed_user'] = message.guild.get_member(int(user_id_match.group(1)))
+            context.embed_user = message.guild.get_member(int(user_id_match.group(1)))
         if interaction_user is not None:
             try:
-                user_settings: users.User = await users.get_user(interaction_user.id)
+                user_settings: users.User = await context.get_user(interaction_user.id)
             except exceptions.FirstTimeUserError:
                 return
             if user_settings is not None:
                 if not user_settings.bot_enabled: return
             try:
-                clan_settings: clans.Clan = await clans.get_clan_by_member_id(interaction_user.id)
+                clan_settings: clans.Clan = await context.get_clan_by_member_id(interaction_user.id)
             except exceptions.NoDataFoundError:
                 pass
-        if embed_data['embed_user'] is not None:
-            if interaction_user is not None and embed_data['embed_user'] == interaction_user:
-                embed_user_settings = user_settings
+        if context.embed_user is not None:
+            if interaction_user is not None and context.embed_user == interaction_user:
+                context.embed_user_settings = user_settings
             else:
                 try:
-                    embed_user_settings: users.User = await users.get_user(embed_data['embed_user'].id)
+                    context.embed_user_settings = await context.get_user(context.embed_user.id)
                 except exceptions.FirstTimeUserError:
-                    embed_user_settings = None
-            embed_data['embed_user_settings'] = embed_user_settings
-        guild_settings = await guilds.get_guild(message.guild.id)
-        return_values = []
+                    pass
+        processors = []
         helper_context_enabled = getattr(user_settings, 'helper_context_enabled', True)
         helper_profile_enabled = getattr(user_settings, 'helper_profile_enabled', True)
         helper_raid_enabled = getattr(user_settings, 'helper_raid_enabled', True)
@@ -82,108 +92,122 @@ class DetectionCog(commands.Cog):
         helper_teamraid_enabled = getattr(clan_settings, 'helper_teamraid_enabled', False)
 
         # Raids
-        if tracking_enabled or helper_context_enabled or helper_raid_enabled or reminder_energy_enabled:
-            add_reaction = await raid.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-            return_values.append(add_reaction)
+        if 'raid' in routes and (tracking_enabled or helper_context_enabled or helper_raid_enabled
+                                 or reminder_energy_enabled):
+            processors.append(('raid', raid.process_message, (self.bot, message, embed_data, interaction_user,
+                                                              user_settings, context)))
 
         # Claim Reminder
-        add_reaction = await claim.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-        return_values.append(add_reaction)
+        if 'claim' in routes:
+            processors.append(('claim', claim.process_message, (self.bot, message, embed_data, interaction_user,
+                                                                user_settings, context)))
 
         # Daily Reminder
-        if reminder_daily_enabled:
-            add_reaction = await daily.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-            return_values.append(add_reaction)
+        if 'daily' in routes and reminder_daily_enabled:
+            processors.append(('daily', daily.process_message, (self.bot, message, embed_data, interaction_user,
+                                                                user_settings, context)))
             
         # Shop Reminder
-        if reminder_shop_enabled:
-            add_reaction = await shop.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-            return_values.append(add_reaction)
+        if 'shop' in routes and reminder_shop_enabled:
+            processors.append(('shop', shop.process_message, (self.bot, message, embed_data, interaction_user,
+                                                              user_settings, context)))
 
         # Use items
-        add_reaction = await use.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-        return_values.append(add_reaction)
+        if 'use' in routes:
+            processors.append(('use', use.process_message, (self.bot, message, embed_data, interaction_user,
+                                                            user_settings, context)))
         
         # Payday
-        if helper_upgrades_enabled:
-            add_reaction = await payday.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-            return_values.append(add_reaction)
+        if 'payday' in routes and helper_upgrades_enabled:
+            processors.append(('payday', payday.process_message, (self.bot, message, embed_data, interaction_user,
+                                                                  user_settings, context)))
         
         # Buy items frop the shop
-        if helper_context_enabled:
-            add_reaction = await buy.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-            return_values.append(add_reaction)
+        if 'buy' in routes and helper_context_enabled:
+            processors.append(('buy', buy.process_message, (self.bot, message, embed_data, interaction_user,
+                                                            user_settings, context)))
 
         # Event pings
-        if any([guild_settings.event_energy.enabled, guild_settings.event_hire.enabled,
-                guild_settings.event_lucky.enabled, guild_settings.event_packing.enabled]):
-            add_reaction = await events.process_message(self.bot, message, embed_data, guild_settings)
-            return_values.append(add_reaction)
+        if 'events' in routes:
+            guild_settings = await context.get_guild()
+            if any([guild_settings.event_energy.enabled, guild_settings.event_hire.enabled,
+                    guild_settings.event_lucky.enabled, guild_settings.event_packing.enabled]):
+                processors.append(('events', events.process_message, (self.bot, message, embed_data, guild_settings,
+                                                                      context)))
             
         # Track upgrades
-        if helper_upgrades_enabled:
-            add_reaction = await upgrades.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-            return_values.append(add_reaction)
+        if 'upgrades' in routes and helper_upgrades_enabled:
+            processors.append(('upgrades', upgrades.process_message, (self.bot, message, embed_data, interaction_user,
+                                                                      user_settings, context)))
 
         # Open    
-        if helper_raid_enabled or helper_teamraid_enabled:
-            add_reaction = await open.process_message(self.bot, message, embed_data, interaction_user, user_settings,
-                                                      clan_settings)
-            return_values.append(add_reaction)
+        if 'open' in routes and (helper_raid_enabled or helper_teamraid_enabled):
+            processors.append(('open', open.process_message, (self.bot, message, embed_data, interaction_user,
+                                                              user_settings, clan_settings, context)))
 
         # Request tracking
-        if helper_raid_enabled or helper_teamraid_enabled:
-            add_reaction = await request.process_message(self.bot, message, embed_data, interaction_user, user_settings,
-                                                         clan_settings)
-            return_values.append(add_reaction)
+        if 'request' in routes and (helper_raid_enabled or helper_teamraid_enabled):
+            processors.append(('request', request.process_message, (self.bot, message, embed_data, interaction_user,
+                                                                    user_settings, clan_settings, context)))
 
         # Vote
-        if reminder_vote_enabled:
-            add_reaction = await vote.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-            return_values.append(add_reaction)
+        if 'vote' in routes and reminder_vote_enabled:
+            processors.append(('vote', vote.process_message, (self.bot, message, embed_data, interaction_user,
+                                                              user_settings, context)))
             
         # Worker tracking
-        add_reaction = await workers.process_message(self.bot, message, embed_data, interaction_user, user_settings,
-                                                        clan_settings)
-        return_values.append(add_reaction)
+        if 'workers' in routes:
+            processors.append(('workers', workers.process_message, (self.bot, message, embed_data, interaction_user,
+                                                                    user_settings, clan_settings, context)))
 
         # Clan reminders & updates
-        add_reaction = await clan.process_message(self.bot, message, embed_data, interaction_user, user_settings,
-                                                  clan_settings)
-        return_values.append(add_reaction)
-        add_reaction = await teamraid.process_message(self.bot, message, embed_data, interaction_user, user_settings,
-                                                      clan_settings)
-        return_values.append(add_reaction)
+        if 'clan' in routes:
+            processors.append(('clan', clan.process_message, (self.bot, message, embed_data, interaction_user,
+                                                              user_settings, clan_settings, context)))
+        if 'teamraid' in routes:
+            processors.append(('teamraid', teamraid.process_message, (self.bot, message, embed_data, interaction_user,
+                                                                      user_settings, clan_settings, context)))
 
         # Update donor tier
-        add_reaction = await donate.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-        return_values.append(add_reaction)
+        if 'donate' in routes:
+            processors.append(('donate', donate.process_message, (self.bot, message, embed_data, interaction_user,
+                                                                  user_settings, context)))
 
          # Energy Helper
-        add_reaction = await profile.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-        return_values.append(add_reaction)
+        if 'profile' in routes:
+            processors.append(('profile', profile.process_message, (self.bot, message, embed_data, interaction_user,
+                                                                    user_settings, context)))
         
          # Boost reminders
-        add_reaction = await boosts.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-        return_values.append(add_reaction)
+        if 'boosts' in routes:
+            processors.append(('boosts', boosts.process_message, (self.bot, message, embed_data, interaction_user,
+                                                                  user_settings, context)))
         
          # Halloween
-        add_reaction = await halloween.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-        return_values.append(add_reaction)
+        if 'halloween' in routes:
+            processors.append(('halloween', halloween.process_message, (self.bot, message, embed_data, interaction_user,
+                                                                        user_settings, context)))
         
          # Christmas
-        add_reaction = await xmas.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-        return_values.append(add_reaction)
+        if 'xmas' in routes:
+            processors.append(('xmas', xmas.process_message, (self.bot, message, embed_data, interaction_user,
+                                                              user_settings, context)))
 
         # Activity list
-        add_reaction = await activities.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-        return_values.append(add_reaction)
+        if 'activities' in routes:
+            processors.append(('activities', activities.process_message, (self.bot, message, embed_data,
+                                                                          interaction_user, user_settings, context)))
         
         # Inventory
-        add_reaction = await inventory.process_message(self.bot, message, embed_data, interaction_user, user_settings)
-        return_values.append(add_reaction)
+        if 'inventory' in routes:
+            processors.append(('inventory', inventory.process_message, (self.bot, message, embed_data, interaction_user,
+                                                                        user_settings, context)))
 
-        if any(return_values): await functions.add_logo_reaction(message)
+        return_values = await router.run_processors(processors)
+        if any(return_value is True for return_value in return_values):
+            await functions.add_logo_reaction(message)
+        for return_value in return_values:
+            if isinstance(return_value, Exception): raise return_value
 
 # Initialization
 def setup(bot):
@@ -191,72 +215,6 @@ def setup(bot):
 
 
 # Functions
-async def parse_embed(message: discord.Message) -> Dict[str, str]:
-    """Parses all data from an embed into a dictionary.
-    All keys are guaranteed to exist and have an empty string as value if not set in the embed.
-    """
-    embed_data = {
-        'author': {'icon_url': '', 'name': ''},
-        'description': '',
-        'field0': {'name': '', 'value': ''},
-        'field1': {'name': '', 'value': ''},
-        'field2': {'name': '', 'value': ''},
-        'field3': {'name': '', 'value': ''},
-        'field4': {'name': '', 'value': ''},
-        'field5': {'name': '', 'value': ''},
-        'footer': {'icon_url': '', 'text': ''},
-        'title': '',
-    }
-    if message.embeds:
-        embed = message.embeds[0]
-        if embed.author is not None:
-            if embed.author.icon_url is not None:
-                embed_data['author']['icon_url'] = embed.author.icon_url
-            if embed.author.name is not None:
-                embed_data['author']['name'] = embed.author.name
-        if embed.description is not None:
-            embed_data['description'] = embed.description
-        if embed.fields:
-            try:
-                embed_data['field0']['name'] = embed.fields[0].name
-                embed_data['field0']['value'] = embed.fields[0].value
-            except IndexError:
-                pass
-            try:
-                embed_data['field1']['name'] = embed.fields[1].name
-                embed_data['field1']['value'] = embed.fields[1].value
-            except IndexError:
-                pass
-            try:
-                embed_data['field2']['name'] = embed.fields[2].name
-                embed_data['field2']['value'] = embed.fields[2].value
-            except IndexError:
-                pass
-            try:
-                embed_data['field3']['name'] = embed.fields[3].name
-                embed_data['field3']['value'] = embed.fields[3].value
-            except IndexError:
-                pass
-            try:
-                embed_data['field4']['name'] = embed.fields[4].name
-                embed_data['field4']['value'] = embed.fields[4].value
-            except IndexError:
-                pass
-            try:
-                embed_data['field5']['name'] = embed.fields[5].name
-                embed_data['field5']['value'] = embed.fields[5].value
-            except IndexError:
-                pass
-        if embed.footer is not None:
-            if embed.footer.icon_url is not None:
-                embed_data['footer']['icon_url'] = embed.footer.icon_url
-            if embed.footer.text is not None:
-                embed_data['footer']['text'] = embed.footer.text
-        if embed.title is not None:
-            embed_data['title'] = embed.title
-    return embed_data
-
-
 async def check_message_for_active_components(message: discord.Message) -> Union[bool, None]:
     """Checks if the message has any active components.
 
@@ -276,7 +234,7 @@ async def check_message_for_active_components(message: discord.Message) -> Union
 
 
 async def check_edited_message_always_allowed(message_before: discord.Message,
-                                             message_after: discord.Message, embed_data: Dict) -> Union[bool, None]:
+                                             message_after: discord.Message, embed_data: parsing.EmbedData) -> Union[bool, None]:
     """Check if the edited message should be allowed to process regardless of its components.
 
     Returns
@@ -287,14 +245,14 @@ async def check_edited_message_always_allowed(message_before: discord.Message,
     search_strings =  [
         '— worker roll', #All languages
     ]
-    if any(search_string in embed_data['author']['name'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.author.name_lower for search_string in search_strings):
         if message_before.embeds[0].footer is not None:
-            if message_before.embeds[0].footer.text != embed_data['footer']['text']: return True
+            if message_before.embeds[0].footer.text != embed_data.footer.text: return True
     return False
 
 
 async def check_edited_message_never_allowed(message_before: discord.Message,
-                                             message_after: discord.Message, embed_data: Dict) -> Union[bool, None]:
+                                             message_after: discord.Message, embed_data: parsing.EmbedData) -> Union[bool, None]:
     """Check if the edited message should never be allowed to process.
 
     Returns
@@ -306,14 +264,14 @@ async def check_edited_message_never_allowed(message_before: discord.Message,
     search_strings =  [
         '— raid', #All languages
     ]
-    if any(search_string in embed_data['author']['name'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.author.name_lower for search_string in search_strings):
         return True
     """
     search_strings =  [
         '— worker roll', #All languages
     ]
-    if (any(search_string in embed_data['author']['name'].lower() for search_string in search_strings)
-           and '(+' in embed_data['field0']['value']):
+    if (any(search_string in embed_data.author.name_lower for search_string in search_strings)
+           and '(+' in embed_data.field(0).value):
         return True
     """
     return False
\ No newline at end of file
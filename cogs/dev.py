@@ -8,6 +8,7 @@ from typing import List
 import discord
 from discord.commands import SlashCommandGroup, Option
 from discord.ext import commands
+from discord import utils
 
 from database import cooldowns
 from resources import emojis, exceptions, functions, logs, settings, views
@@ -65,6 +66,8 @@ class DevCog(commands.Cog):
                             name_found = True
             if not name_found:
                 actions.append(f'- No loaded cog or module with the name \'{module}\' found.')
+        from cache import mentions
+        await mentions.update_command_mentions(self.bot)
 
         message = ''
         for action in actions:
@@ -167,7 +170,8 @@ class DevCog(commands.Cog):
         if ctx.author.id not in settings.DEV_IDS:
             await ctx.respond(MSG_NOT_DEV, ephemeral=True)
             return
-        from cache import messages
+        from cache import edits, interactions, mentions, messages, reactions
+        from database import upgrades
         cache_size = sys.getsizeof(messages._MESSAGE_CACHE)
         channel_count = len(messages._MESSAGE_CACHE)
         message_count = 0
@@ -180,8 +184,170 @@ class DevCog(commands.Cog):
             f'Cache size: {cache_size / 1024:,.2f} KB\n'
             f'Channel count: {channel_count:,}\n'
             f'Message count: {message_count:,}\n'
+            f'Edit subscriptions: {len(edits._SUBSCRIPTIONS):,}\n'
+            f'Cached interaction owners: {len(interactions._INTERACTION_CACHE):,}\n'
+            f'Reacted messages: {len(reactions._REACTED_MESSAGES):,}\n'
+            f'Users with cached upgrades: {len(upgrades._UPGRADES_CACHE):,}\n'
+            f'Cached command mentions: {len(mentions._COMMAND_MENTIONS):,}\n'
         )
 
+    @dev.command(name='detection-stats')
+    async def detection_stats(self, ctx: discord.ApplicationContext):
+        """Shows how many messages were dispatched to each detection route"""
+        if ctx.author.id not in settings.DEV_IDS:
+            await ctx.respond(MSG_NOT_DEV, ephemeral=True)
+            return
+        from processing import router
+        description = ''
+        route_counters = sorted(router.route_counters.items(), key=lambda route: route[1], reverse=True)
+        for route_name, count in route_counters:
+            description = f'{description}\n- `{route_name}`: {count:,}'
+            timeout_count = router.timeout_counters.get(route_name, 0)
+            if timeout_count > 0: description = f'{description} ({timeout_count:,} timed out)'
+        if not description: description = '_No messages routed yet._'
+        embed = discord.Embed(
+            color = settings.EMBED_COLOR,
+            title = 'Detection routes',
+            description = description.strip(),
+        )
+        await ctx.respond(embed=embed)
+
+    @dev.command(name='regex-benchmark')
+    async def regex_benchmark(
+        self,
+        ctx: discord.ApplicationContext,
+        rounds: Option(int, 'How often every pattern runs against every message', min_value=1, max_value=100,
+                       default=10),
+    ) -> None:
+        """Times all compiled patterns against the recently parsed game messages"""
+        if ctx.author.id not in settings.DEV_IDS:
+            await ctx.respond(MSG_NOT_DEV, ephemeral=True)
+            return
+        import re
+        from time import perf_counter
+        from processing import parsing
+        from resources import regex
+        strings = []
+        for embed_data in list(parsing._EMBED_DATA_CACHE.values()):
+            message_parts = [embed_data.author.name, embed_data.content, embed_data.description, embed_data.footer.text,
+                             embed_data.title]
+            for field in embed_data.fields:
+                message_parts += [field.name, field.value]
+            for message_part in message_parts:
+                if message_part: strings += [message_part, message_part.lower()]
+        if not strings:
+            await ctx.respond('No parsed messages cached yet.', ephemeral=True)
+            return
+        patterns = {}
+        for name, value in vars(regex).items():
+            if isinstance(value, re.Pattern):
+                patterns[name] = (value,)
+            elif isinstance(value, tuple) and value and all(isinstance(item, re.Pattern) for item in value):
+                patterns[name] = value
+        timings = {}
+        for name, compiled_patterns in patterns.items():
+            start_time = perf_counter()
+            for _ in range(rounds):
+                for string in strings:
+                    for pattern in compiled_patterns:
+                        pattern.search(string)
+            timings[name] = (perf_counter() - start_time) / (rounds * len(strings)) * 1_000_000
+        description = ''
+        for name, timing in sorted(timings.items(), key=lambda timing: timing[1], reverse=True):
+            if len(description) > 4000:
+                description = f'{description}\n- ... and more'
+                break
+            description = f'{description}\n- `{name}`: {timing:,.2f} µs'
+        embed = discord.Embed(
+            color = settings.EMBED_COLOR,
+            title = 'Regex benchmark',
+            description = description.strip(),
+        )
+        embed.set_footer(text=f'Average time per search. {len(strings):,} message parts, {rounds:,} rounds.')
+        await ctx.respond(embed=embed)
+
+    @dev.command(name='event-calendar')
+    async def event_calendar(
+        self,
+        ctx: discord.ApplicationContext,
+        event: Option(str, 'Event to change. Shows the calendar if not set.', choices=['christmas', 'halloween'],
+                      default=None),
+        start: Option(str, 'Start time in UTC (YYYY-MM-DD HH:MM). Leave empty to unschedule the event.',
+                      default=None),
+        end: Option(str, 'End time in UTC (YYYY-MM-DD HH:MM). Leave empty to unschedule the event.', default=None),
+        energy_regen_multiplier: Option(float, 'Energy regen multiplier while the event is live', min_value=1,
+                                        default=1.0),
+    ) -> None:
+        """Shows or changes the seasonal event calendar"""
+        if ctx.author.id not in settings.DEV_IDS:
+            await ctx.respond(MSG_NOT_DEV, ephemeral=True)
+            return
+        from datetime import datetime, timezone
+        from processing import seasons
+        if event is not None:
+            try:
+                start_time = (datetime.strptime(start, '%Y-%m-%d %H:%M').replace(tzinfo=timezone.utc)
+                              if start is not None else None)
+                end_time = (datetime.strptime(end, '%Y-%m-%d %H:%M').replace(tzinfo=timezone.utc)
+                            if end is not None else None)
+            except ValueError:
+                await ctx.respond('Times have to be in the format `YYYY-MM-DD HH:MM`.', ephemeral=True)
+                return
+            if (start_time is None) != (end_time is None):
+                await ctx.respond('Please set both start and end time or neither.', ephemeral=True)
+                return
+            try:
+                await seasons.update_event(event, start_time, end_time, energy_regen_multiplier)
+            except ValueError as error:
+                await ctx.respond(str(error), ephemeral=True)
+                return
+        description = ''
+        for seasonal_event in await seasons.get_events():
+            if seasonal_event.start_time is None:
+                schedule = '_Not scheduled_'
+            else:
+                schedule = (
+                    f'{utils.format_dt(seasonal_event.start_time)} - {utils.format_dt(seasonal_event.end_time)}'
+                )
+            status = ' (**live**)' if seasonal_event.is_live() else ''
+            description = (
+                f'{description}\n{emojis.BP} **{seasonal_event.name.capitalize()}**{status}: {schedule}, '
+                f'energy regen `x{seasonal_event.energy_regen_multiplier:g}`'
+            )
+        if not await seasons.is_calendar_configured():
+            description = (
+                f'{description}\n\n_The calendar is not configured yet. All seasonal helpers are active and the '
+                f'energy regen multiplier is `x{settings.ENERGY_REGEN_MULTIPLIER_EVENT_FALLBACK:g}`._'
+            )
+        embed = discord.Embed(
+            color = settings.EMBED_COLOR,
+            title = 'Event calendar',
+            description = description.strip(),
+        )
+        embed.set_footer(text=f'Current energy regen multiplier: x{settings.ENERGY_REGEN_MULTIPLIER_EVENT:g}')
+        await ctx.respond(embed=embed)
+
+    @dev.command(name='raid-solver-stats')
+    async def raid_solver_stats(self, ctx: discord.ApplicationContext):
+        """Shows the statistics of the raid solution cache"""
+        if ctx.author.id not in settings.DEV_IDS:
+            await ctx.respond(MSG_NOT_DEV, ephemeral=True)
+            return
+        from processing import solver
+        lookups = solver.cache_hits + solver.cache_misses
+        hit_rate = solver.cache_hits / lookups * 100 if lookups > 0 else 0
+        embed = discord.Embed(
+            color = settings.EMBED_COLOR,
+            title = 'Raid solver',
+            description = (
+                f'{emojis.BP} Cached solutions: {len(solver._SOLUTION_CACHE):,} / {solver._SOLUTION_CACHE_SIZE:,}\n'
+                f'{emojis.BP} Cache hits: {solver.cache_hits:,}\n'
+                f'{emojis.BP} Cache misses: {solver.cache_misses:,}\n'
+                f'{emojis.BP} Hit rate: {hit_rate:,.1f}%'
+            ),
+        )
+        await ctx.respond(embed=embed)
+
     @dev.command(name='server-list')
     async def server_list(self, ctx: discord.ApplicationContext):
         """Lists the servers the bot is in by name"""
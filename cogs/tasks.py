@@ -10,8 +10,9 @@ import discord
 from discord import utils
 from discord.ext import commands, tasks
 
-from cache import messages
+from cache import edits, messages, reactions
 from database import clans, errors, reminders, tracking, users
+from processing import seasons
 from resources import exceptions, functions, logs, settings
 
 
@@ -142,6 +143,8 @@ class TasksCog(commands.Cog):
         self.consolidate_tracking_log.start()
         self.delete_old_messages_from_cache.start()
         self.reset_guild_seal_contributions.start()
+        await seasons.load_events()
+        self.apply_event_calendar.start()
 
     # Tasks
     @tasks.loop(seconds=0.5)
@@ -218,10 +221,17 @@ class TasksCog(commands.Cog):
 
     @tasks.loop(minutes=10)
     async def delete_old_messages_from_cache(self) -> None:
-        """Task that deletes messages from the message cache that are older than 10 minutes"""
+        """Task that deletes messages from the message cache that are older than 10 minutes, expired edit
+        subscriptions and expired reacted messages"""
         deleted_messages_count = await messages.delete_old_messages(timedelta(minutes=10))
         if settings.DEBUG_MODE:
             logs.logger.debug(f'Deleted {deleted_messages_count} messages from message cache.')
+        deleted_subscriptions_count = await edits.delete_expired_subscriptions()
+        if settings.DEBUG_MODE:
+            logs.logger.debug(f'Deleted {deleted_subscriptions_count} expired edit subscriptions.')
+        deleted_reactions_count = await reactions.delete_expired_reacted_messages()
+        if settings.DEBUG_MODE:
+            logs.logger.debug(f'Deleted {deleted_reactions_count} expired reacted messages.')
 
     @tasks.loop(seconds=60)
     async def reset_guild_seal_contributions(self) -> None:
@@ -244,6 +254,11 @@ class TasksCog(commands.Cog):
                     await clans.update_clan_member(clan_member.user_id, guild_seals_contributed=0)
                     await asyncio.sleep(0.01)
 
+    @tasks.loop(seconds=60)
+    async def apply_event_calendar(self) -> None:
+        """Task that starts and ends seasonal events"""
+        await seasons.apply_events()
+
 # Initialization
 def setup(bot):
     bot.add_cog(TasksCog(bot))
\ No newline at end of file
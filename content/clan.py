@@ -1,13 +1,13 @@
 # clan.py
 """Contains clan commands"""
 
-from typing import Optional, Tuple, Union
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
 
 import discord
 from discord.ext import commands
 
 from database import clans, users, upgrades, workers
-from resources import emojis, exceptions, settings, strings, views
+from resources import emojis, exceptions, settings, strings, views, workerstats
 
 
 # --- Commands ---
@@ -26,8 +26,9 @@ async def command_clan_members(bot: discord.Bot, ctx: Union[discord.ApplicationC
         else:
             await ctx.respond(msg_error)
         return
-    view = views.ClanMembersView(ctx, clan_settings, 0, embeds_clan_members)
-    embeds = await embeds_clan_members(clan_settings)
+    clan_members_data = await get_clan_members_data(clan_settings)
+    view = views.ClanMembersView(ctx, clan_settings, 0, embeds_clan_members, clan_members_data=clan_members_data)
+    embeds = await embeds_clan_members(clan_settings, clan_members_data=clan_members_data)
     image = None
     if len(embeds) > 1:
         image = discord.File(settings.IMG_EMBED_WIDTH_LINE, filename='embed_width_line.png')
@@ -40,52 +41,71 @@ async def command_clan_members(bot: discord.Bot, ctx: Union[discord.ApplicationC
     
 
 # --- Embeds ---
-async def embeds_clan_members(clan_settings: clans.Clan, current_view: Optional[int] = 0,
-                              sort_key: Optional[str] = None) -> Tuple[discord.Embed]:
-    """Clan members list embed"""
-    embeds = []
+class ClanMembersData(NamedTuple):
+    """Computed rows of the clan members report. Sorting and switching views only reorders these."""
+    members: Dict[int, Dict[str, Any]]
+    members_disabled: List[clans.ClanMember]
+    members_no_upgrades: List[clans.ClanMember]
+    members_not_registered: List[clans.ClanMember]
+    guild_seals_total: int
+
+
+async def get_clan_members_data(clan_settings: clans.Clan) -> ClanMembersData:
+    """Reads users, upgrades and workers of all clan members in batched queries and computes the report rows"""
     members = {}
     members_disabled = []
     members_no_upgrades = []
     members_not_registered = []
     guild_seals_total = 0
+    member_ids = [clan_member.user_id for clan_member in clan_settings.members]
+    members_settings = await users.get_users(member_ids)
+    await upgrades.load_upgrades(member_ids)
+    members_workers = await workers.get_users_workers(member_ids)
     for clan_member in clan_settings.members:
         guild_seals_total += clan_member.guild_seals_contributed
+        member_settings = members_settings.get(clan_member.user_id, None)
+        member_workers = members_workers.get(clan_member.user_id, ())
+        if member_settings is None:
+            members_not_registered.append(clan_member)
+            continue
+        if not member_settings.bot_enabled:
+            members_disabled.append(clan_member)
+            continue
         try:
-            member_settings: users.User = await users.get_user(clan_member.user_id)
-            if not member_settings.bot_enabled:
-                members_disabled.append(clan_member)
-                continue
-            try:
-                teamfarm_life_upgrade = await upgrades.get_upgrade(clan_member.user_id, 'teamfarm life')
-                teamfarm_life_level = teamfarm_life_upgrade.level
-            except exceptions.NoDataFoundError:
-                members_no_upgrades.append(clan_member)
-                continue
-            member_workers = await workers.get_user_workers(clan_member.user_id)
-            worker_levels = {member_worker.worker_name: member_worker.worker_level for member_worker in member_workers}
-            workers_power = {}
-            for worker_name, worker_level in worker_levels.items():
-                worker_power = (
-                    ((strings.WORKER_STATS[worker_name]['speed'] + strings.WORKER_STATS[worker_name]['strength']
-                        + strings.WORKER_STATS[worker_name]['intelligence']))
-                    * (1 + (strings.WORKER_STATS[worker_name]['tier']) / 2.5) * (1 + worker_level / 1.25)
-                )
-                workers_power[worker_name] = worker_power
-            workers_by_power = dict(sorted(workers_power.items(), key=lambda x:x[1], reverse=True))
-            top_3_count = 1
-            top_3_power = 0
-            for worker_name, worker_power in workers_by_power.items():
-                if 1 <= top_3_count <= 3: top_3_power += worker_power
-                top_3_count += 1
-            members[clan_member.user_id] = {
-                'top_3_power': top_3_power,
-                'guild_seals_inventory': member_settings.inventory.guild_seal,
-                'guild_seals_contributed': clan_member.guild_seals_contributed,
-                'teamfarm_life': teamfarm_life_level
-            }
-        except (exceptions.FirstTimeUserError, exceptions.NoDataFoundError):
+            teamfarm_life_upgrade = await upgrades.get_upgrade(clan_member.user_id, 'teamfarm life')
+            teamfarm_life_level = teamfarm_life_upgrade.level
+        except exceptions.NoDataFoundError:
+            members_no_upgrades.append(clan_member)
+            continue
+        if not member_workers:
             members_not_registered.append(clan_member)
+            continue
+        workers_power = []
+        for member_worker in member_workers:
+            workers_power.append(
+                await workerstats.get_worker_power(member_worker.worker_name, member_worker.worker_level)
+            )
+        top_3_power = sum(sorted(workers_power, reverse=True)[:3])
+        members[clan_member.user_id] = {
+            'top_3_power': top_3_power,
+            'guild_seals_inventory': member_settings.inventory.guild_seal,
+            'guild_seals_contributed': clan_member.guild_seals_contributed,
+            'teamfarm_life': teamfarm_life_level
+        }
+    return ClanMembersData(members, members_disabled, members_no_upgrades, members_not_registered, guild_seals_total)
+
+
+async def embeds_clan_members(clan_settings: clans.Clan, current_view: Optional[int] = 0,
+                              sort_key: Optional[str] = None,
+                              clan_members_data: Optional[ClanMembersData] = None) -> Tuple[discord.Embed]:
+    """Clan members list embed. If clan_members_data is None, it is read from the database."""
+    if clan_members_data is None: clan_members_data = await get_clan_members_data(clan_settings)
+    embeds = []
+    members = clan_members_data.members
+    members_disabled = clan_members_data.members_disabled
+    members_no_upgrades = clan_members_data.members_no_upgrades
+    members_not_registered = clan_members_data.members_not_registered
+    guild_seals_total = clan_members_data.guild_seals_total
     field_no = 1
     fields_members = {field_no: ''}
     if current_view == 0:
@@ -126,9 +146,9 @@ async def embeds_clan_members(clan_settings: clans.Clan, current_view: Optional[
     )
     if members:
         members = dict(sorted(members.items(), key=lambda x:x[1][sort_key], reverse=True))
-        for member_id, member_data in members.items():
+        for member_index, (member_id, member_data) in enumerate(members.items()):
             index = (
-                f'{list(members.keys()).index(member_id) + 1}.'.rjust(3,'0')
+                f'{member_index + 1}.'.rjust(3,'0')
             )
             if current_view == 0:
                 member_power_str = f' {round(member_data["top_3_power"],2):,g}'.rjust(8)
@@ -5,12 +5,13 @@ from datetime import datetime
 from humanfriendly import format_timespan
 import psutil
 import sys
-from typing import List, Union
+from typing import List, Tuple, Union
 
 import discord
 from discord import utils
 from discord.ext import commands
 
+from cache import embeds
 from database import cooldowns, guilds, users
 from database import settings as settings_db
 from resources import emojis, functions, settings, strings
@@ -87,10 +88,11 @@ async def embed_event_reductions(bot: discord.Bot, all_cooldowns: List[cooldowns
     return embed
 
 
-async def embed_help(bot: discord.Bot, ctx: discord.ApplicationContext) -> discord.Embed:
-    """Main menu embed"""
-    guild_settings: guilds.Guild = await guilds.get_guild(ctx.guild.id)
-    prefix = guild_settings.prefix
+async def get_help_fields(bot: discord.Bot, prefix: str) -> Tuple[Tuple[str, str], ...]:
+    """Returns the fields of the help embed for a prefix. The fields are rendered once per prefix and then cached
+    until the command mentions are rebuilt."""
+    help_fields = await embeds.get_help_fields(prefix)
+    if help_fields is not None: return help_fields
     commands_reminders = (
         f'{emojis.BP} {await functions.get_bot_slash_command(bot, "reminders list")} : Check your commands and reminders\n'
         f'{emojis.DETAIL} _Aliases: `{prefix}list`, `{prefix}cd`_\n'
@@ -132,6 +134,22 @@ async def embed_help(bot: discord.Bot, ctx: discord.ApplicationContext) -> disco
         f'{emojis.BP} {await functions.get_bot_slash_command(bot, "event-reductions")} : Check active event reductions\n'
         f'{emojis.BP} {await functions.get_bot_slash_command(bot, "purge data")} : Purge your user data\n'
     )
+    help_fields = (
+        ('Reminders', commands_reminders),
+        ('User settings', commands_settings),
+        ('Guild settings', guild_settings),
+        ('Server settings', server_settings),
+        ('Tracking', commands_tracking),
+        ('Miscellaneous', commands_misc),
+    )
+    await embeds.store_help_fields(prefix, help_fields)
+    return help_fields
+
+
+async def embed_help(bot: discord.Bot, ctx: discord.ApplicationContext) -> discord.Embed:
+    """Main menu embed"""
+    guild_settings: guilds.Guild = await guilds.get_guild(ctx.guild.id)
+    help_fields = await get_help_fields(bot, guild_settings.prefix)
     img_logo = discord.File(settings.IMG_LOGO, filename='logo.png')
     image_url = 'attachment://logo.png'
     embed = discord.Embed(
@@ -139,12 +157,8 @@ async def embed_help(bot: discord.Bot, ctx: discord.ApplicationContext) -> disco
         title = 'Yeehaw! I\'m Molly!',
         description = '_Let\'s manage your farms together!_',
     )
-    embed.add_field(name='Reminders', value=commands_reminders, inline=False)
-    embed.add_field(name='User settings', value=commands_settings, inline=False)
-    embed.add_field(name='Guild settings', value=guild_settings, inline=False)
-    embed.add_field(name='Server settings', value=server_settings, inline=False)
-    embed.add_field(name='Tracking', value=commands_tracking, inline=False)
-    embed.add_field(name='Miscellaneous', value=commands_misc, inline=False)
+    for field_name, field_value in help_fields:
+        embed.add_field(name=field_name, value=field_value, inline=False)
     embed.set_thumbnail(url=image_url)
     return (img_logo, embed)
 
@@ -29,10 +29,10 @@ async def command_list(
         else:
             await functions.reply_or_respond(ctx, 'This user is not registered with me.', True)
         return
-    try:
-        custom_reminders = list(await reminders.get_active_user_reminders(user.id, 'custom'))
-    except exceptions.NoDataFoundError:
-        custom_reminders = []
+    user_timeline: reminders.UserTimeline = await reminders.get_user_timeline(user.id)
+    custom_reminders = [
+        reminder for reminder in user_timeline.user_reminders if reminder.activity.startswith('custom')
+    ]
     embed = await embed_reminders_list(bot, user, user_settings, custom_reminders)
     view = views.RemindersListView(bot, ctx, user, user_settings, custom_reminders, embed_reminders_list)
     if isinstance(ctx, discord.ApplicationContext):
@@ -47,18 +47,13 @@ async def command_list(
 async def embed_reminders_list(bot: discord.Bot, user: discord.User, user_settings: users.User,
                                custom_reminders: List[reminders.Reminder]) -> discord.Embed:
     """Embed with active reminders"""
-    try:
-        user_reminders = list(await reminders.get_active_user_reminders(user.id))
-    except exceptions.NoDataFoundError:
-        user_reminders = []
-    try:
-        clan_settings: clans.Clan = await clans.get_clan_by_member_id(user.id)
-    except exceptions.NoDataFoundError:
-        clan_settings = None
-    clan_reminder = None
-    if clan_settings is not None:
+    user_timeline: reminders.UserTimeline = await reminders.get_user_timeline(user.id)
+    user_reminders = list(user_timeline.user_reminders)
+    clan_settings = clan_reminder = None
+    if user_timeline.clan_name is not None:
         try:
-            clan_reminder = await reminders.get_clan_reminder(clan_settings.clan_name)
+            clan_settings: clans.Clan = await clans.get_clan_by_clan_name(user_timeline.clan_name)
+            clan_reminder = user_timeline.clan_reminder
         except exceptions.NoDataFoundError:
             pass
     clan_reminder_enabled = getattr(clan_settings, 'reminder_enabled', False)
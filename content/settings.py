@@ -9,7 +9,8 @@ from typing import List, Optional
 import discord
 from discord import utils
 
-from database import clans, guilds, reminders, tracking, users
+from cache import energy, members
+from database import clans, guilds, reminders, tracking, upgrades, users
 from resources import emojis, exceptions, functions, settings, strings, views
 
 
@@ -28,6 +29,7 @@ async def command_on(bot: discord.Bot, ctx: discord.ApplicationContext) -> None:
             return
     except exceptions.FirstTimeUserError:
         user_settings = await users.insert_user(ctx.author.id)
+        await members.add_registered_user(ctx.author.id)
         first_time_user = True
     if not user_settings.bot_enabled: await user_settings.update(bot_enabled=True)
     if not user_settings.bot_enabled:
@@ -183,13 +185,15 @@ async def command_purge_data(bot: discord.Bot, ctx: discord.ApplicationContext)
                 interaction, content='Purging user settings...',
                 view=None
             )
-            cur.execute('DELETE FROM users WHERE user_id=?', (ctx.author.id,))
+            await users.delete_user(ctx.author.id)
+            await members.remove_registered_user(ctx.author.id)
             await asyncio.sleep(1)
             await functions.edit_interaction(
                 interaction, content='Purging reminders...',
                 view=None
             )
             cur.execute('DELETE FROM user_reminders WHERE user_id=?', (ctx.author.id,))
+            await reminders.invalidate_user_timelines(user_id=ctx.author.id)
             await asyncio.sleep(1)
             await functions.edit_interaction(
                 interaction, content='Purging worker data...',
@@ -201,7 +205,8 @@ async def command_purge_data(bot: discord.Bot, ctx: discord.ApplicationContext)
                 interaction, content='Purging upgrade data...',
                 view=None
             )
-            cur.execute('DELETE FROM user_upgrades WHERE user_id=?', (ctx.author.id,))
+            await upgrades.delete_upgrades(ctx.author.id)
+            await energy.invalidate_energy_state(ctx.author.id)
             await asyncio.sleep(1)
             await functions.edit_interaction(
                 interaction, content='Purging tracking data... (this can take a while)',
@@ -7,7 +7,7 @@ from dataclasses import dataclass
 import sqlite3
 from typing import Dict, NamedTuple, Optional, Tuple
 
-from database import errors
+from database import errors, reminders
 from resources import exceptions, settings, strings
 
 
@@ -336,6 +336,7 @@ async def _delete_clan(clan_settings: Clan) -> None:
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
+    await reminders.invalidate_user_timelines()
 
     
 async def delete_clan_member(user_id: int) -> None:
@@ -357,6 +358,7 @@ async def delete_clan_member(user_id: int) -> None:
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
+    await reminders.invalidate_user_timelines()
 
 
 async def _update_clan(clan_settings: Clan, **kwargs) -> None:
@@ -428,6 +430,7 @@ async def _update_clan(clan_settings: Clan, **kwargs) -> None:
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
+    if 'clan_name' in kwargs: await reminders.invalidate_user_timelines()
 
 
 async def insert_clan(clan_name: str, leader_id: int, members: Dict[int, int]) -> Clan:
@@ -481,6 +484,7 @@ async def insert_clan(clan_name: str, leader_id: int, members: Dict[int, int]) -
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
+    await reminders.invalidate_user_timelines()
     clan = await get_clan_by_clan_name(clan_name)
     return clan
 
@@ -504,6 +508,7 @@ async def insert_clan_member(clan_name: str, user_id: int, guild_seals_contribut
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
+    await reminders.invalidate_user_timelines()
 
 
 async def update_clan_member(user_id: int, clan_name: Optional[str] = None,
@@ -540,4 +545,5 @@ async def update_clan_member(user_id: int, clan_name: Optional[str] = None,
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
-        raise
\ No newline at end of file
+        raise
+    if clan_name != clan_member['clan_name']: await reminders.invalidate_user_timelines()
@@ -1,16 +1,23 @@
 # cooldowns.py
-"""Provides access to the table "cooldowns" in the database"""
+"""Provides access to the table "cooldowns" in the database.
 
+Cooldowns are read for every reminder, so all cooldowns are cached after they were read once. The cache is cleared
+whenever a cooldown is updated. Don't change the table from anywhere else.
+"""
 
-from dataclasses import dataclass
+
+from dataclasses import dataclass, replace
 from math import ceil
 import sqlite3
-from typing import Tuple
+from typing import Dict, Tuple
 
 from database import errors
 from resources import exceptions, settings, strings
 
 
+_COOLDOWNS_CACHE: Dict[str, 'Cooldown'] = {} # activity: Cooldown, sorted by activity
+
+
 # Containers
 @dataclass()
 class Cooldown():
@@ -100,6 +107,13 @@ async def get_cooldown(activity: str) -> Cooldown:
     exceptions.NoDataFoundError if no cooldown was found.
     Also logs all errors to the database.
     """
+    if not _COOLDOWNS_CACHE:
+        try:
+            await get_all_cooldowns()
+        except exceptions.NoDataFoundError:
+            pass
+    cooldown = _COOLDOWNS_CACHE.get(activity, None)
+    if cooldown is not None: return replace(cooldown)
     table = 'cooldowns'
     function_name = 'get_cooldown'
     sql = f'SELECT * FROM {table} WHERE activity=?'
@@ -123,7 +137,7 @@ async def get_cooldown(activity: str) -> Cooldown:
 
 
 async def get_all_cooldowns() -> Tuple[Cooldown]:
-    """Gets the cooldown settings for all activities.
+    """Gets the cooldown settings for all activities. Reads the database only if the cooldowns aren't cached.
 
     Returns
     -------
@@ -136,6 +150,7 @@ async def get_all_cooldowns() -> Tuple[Cooldown]:
     LookupError if something goes wrong reading the dict.
     Also logs all errors to the database.
     """
+    if _COOLDOWNS_CACHE: return tuple(replace(cooldown) for cooldown in _COOLDOWNS_CACHE.values())
     table = f'cooldowns'
     function_name = 'get_all_cooldowns'
     sql = f'SELECT * FROM {table} ORDER BY activity ASC'
@@ -158,6 +173,9 @@ async def get_all_cooldowns() -> Tuple[Cooldown]:
     for record in records:
         cooldown = await _dict_to_cooldown(dict(record))
         cooldowns.append(cooldown)
+    _COOLDOWNS_CACHE.clear()
+    for cooldown in cooldowns:
+        _COOLDOWNS_CACHE[cooldown.activity] = replace(cooldown)
 
     return tuple(cooldowns)
 
@@ -201,4 +219,5 @@ async def _update_cooldown(activity: str, **kwargs) -> None:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
-        raise
\ No newline at end of file
+        raise
+    _COOLDOWNS_CACHE.clear()
@@ -1,10 +1,16 @@
 # reminders.py
-"""Provides access to the tables "user_reminders" and "clan_reminders" in the database"""
+"""Provides access to the tables "user_reminders" and "clan_reminders" in the database.
 
-from dataclasses import dataclass
+The timeline of a user (all active user reminders and the reminder of their clan) is cached after it was read once.
+All reminder writes in this module invalidate it. Writes to these tables or to "clan_members" from anywhere else have
+to call invalidate_user_timelines.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 import sqlite3
-from typing import Optional, Tuple
+from typing import NamedTuple, Optional, Tuple
 
 from discord import utils
 from discord.ext import tasks
@@ -17,6 +23,9 @@ from resources import exceptions, settings, strings
 scheduled_for_tasks = {}
 scheduled_for_deletion = {}
 
+_USER_TIMELINES_SIZE = 1000
+_USER_TIMELINES = OrderedDict() # user_id: UserTimeline
+
 
 # Containers
 @dataclass()
@@ -95,6 +104,13 @@ class Reminder():
         await self.refresh()
 
 
+class UserTimeline(NamedTuple):
+    """Object that summarizes all active reminders of a user"""
+    user_reminders: Tuple[Reminder] # Sorted by end time
+    clan_name: Optional[str] # None if the user is not in a clan
+    clan_reminder: Optional[Reminder] # None if the clan has no active reminder
+
+
 # Tasks
 @tasks.loop(seconds=10.0)
 async def schedule_reminders():
@@ -250,6 +266,90 @@ async def get_clan_reminder(clan_name: str) -> Reminder:
     return reminder
 
 
+async def get_user_timeline(user_id: int) -> UserTimeline:
+    """Gets all active user reminders of a user and the active reminder of their clan in one query.
+    The timeline is cached until a reminder of the user or their clan changes. The returned reminders are copies.
+
+    Returns
+    -------
+    UserTimeline
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    LookupError if something goes wrong reading the dict.
+    Also logs all errors to the database.
+    """
+    current_time = utils.utcnow().replace(microsecond=0)
+    user_timeline = _USER_TIMELINES.get(user_id, None)
+    if user_timeline is None:
+        table = 'user_reminders'
+        function_name = 'get_user_timeline'
+        sql = (
+            f'SELECT user_id, activity, channel_id, NULL AS clan_name, custom_id, end_time, message, triggered '
+            f'FROM {table} WHERE user_id=? AND end_time>? '
+            f'UNION ALL '
+            f'SELECT NULL, \'clan\', NULL, clan_members.clan_name, NULL, clan_reminders.end_time, '
+            f'clan_reminders.message, clan_reminders.triggered FROM clan_members '
+            f'LEFT JOIN clan_reminders ON clan_reminders.clan_name = clan_members.clan_name '
+            f'AND clan_reminders.end_time>? '
+            f'WHERE clan_members.user_id=? '
+            f'ORDER BY end_time'
+        )
+        current_time_str = current_time.isoformat(sep=' ')
+        try:
+            cur = settings.DATABASE.cursor()
+            cur.execute(sql, (user_id, current_time_str, current_time_str, user_id))
+            records = cur.fetchall()
+        except sqlite3.Error as error:
+            await errors.log_error(
+                strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+            )
+            raise
+        user_reminders = []
+        clan_name = clan_reminder = None
+        for record in records:
+            record = dict(record)
+            if record['activity'] == 'clan':
+                clan_name = record['clan_name']
+                if record['end_time'] is not None: clan_reminder = await _dict_to_reminder(record)
+            else:
+                user_reminders.append(await _dict_to_reminder(record))
+        user_timeline = UserTimeline(tuple(user_reminders), clan_name, clan_reminder)
+        _USER_TIMELINES[user_id] = user_timeline
+        if len(_USER_TIMELINES) > _USER_TIMELINES_SIZE:
+            _USER_TIMELINES.popitem(last=False)
+    _USER_TIMELINES.move_to_end(user_id)
+    clan_reminder = user_timeline.clan_reminder
+    if clan_reminder is not None:
+        clan_reminder = replace(clan_reminder) if clan_reminder.end_time > current_time else None
+    return UserTimeline(
+        tuple(replace(reminder) for reminder in user_timeline.user_reminders if reminder.end_time > current_time),
+        user_timeline.clan_name,
+        clan_reminder,
+    )
+
+
+async def invalidate_user_timelines(user_id: Optional[int] = None, clan_name: Optional[str] = None) -> None:
+    """Removes cached user timelines. If user_id or clan_name is set, only the timelines of that user or of the
+    members of that clan are removed. Otherwise all timelines are removed, e.g. after clan members changed."""
+    if user_id is None and clan_name is None:
+        _USER_TIMELINES.clear()
+        return
+    _USER_TIMELINES.pop(user_id, None)
+    if clan_name is not None:
+        for timeline_user_id, user_timeline in list(_USER_TIMELINES.items()):
+            if user_timeline.clan_name == clan_name: del _USER_TIMELINES[timeline_user_id]
+
+
+async def _invalidate_reminder_timelines(reminder: Reminder) -> None:
+    """Removes the cached timelines that contain a reminder"""
+    if reminder.activity == 'clan':
+        await invalidate_user_timelines(clan_name=reminder.clan_name)
+    else:
+        await invalidate_user_timelines(user_id=reminder.user_id)
+
+
 async def get_active_user_reminders(user_id: Optional[int] = None, activity: Optional[str] = None,
                                end_time: Optional[datetime] = None) -> Tuple[Reminder]:
     """Gets all active reminders for all users or - if the argument user_id is set - for one user.
@@ -533,6 +633,7 @@ async def _delete_reminder(reminder: Reminder) -> None:
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
+    await _invalidate_reminder_timelines(reminder)
 
 
 async def _update_reminder(reminder: Reminder, **kwargs) -> None:
@@ -591,6 +692,54 @@ async def _update_reminder(reminder: Reminder, **kwargs) -> None:
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
+    await _invalidate_reminder_timelines(reminder)
+    if 'clan_name' in kwargs: await invalidate_user_timelines(clan_name=kwargs['clan_name'])
+    if triggered: scheduled_for_tasks[reminder.task_name] = reminder
+
+
+async def update_user_reminder_end_time(reminder: Reminder, end_time: datetime, sql_statement: str,
+                                       sql_parameters: tuple, table_statement: str) -> None:
+    """Updates the end time of a user reminder and runs another statement in the same transaction, e.g. the update of
+    the values the end time was calculated from. Nothing is written if one of them fails.
+    The reminder is updated in memory instead of being read again. If it ends in 15 seconds or less, it is scheduled
+    for task creation, as in _update_reminder.
+
+    Arguments
+    ---------
+    reminder: Reminder, has to be a user reminder
+    end_time: datetime UTC aware
+    sql_statement: str, the other statement
+    sql_parameters: tuple, the parameters of the other statement
+    table_statement: str, the table of the other statement, used for error logging
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    Also logs all errors to the database.
+    """
+    table = 'user_reminders'
+    function_name = 'update_user_reminder_end_time'
+    time_left = end_time - utils.utcnow().replace(microsecond=0)
+    triggered = False if time_left.total_seconds() > 15 else True
+    sql_reminder = f'UPDATE {table} SET end_time = ?, triggered = ? WHERE activity = ? AND user_id = ?'
+    sql = sql_statement
+    try:
+        cur = settings.DATABASE.cursor()
+        cur.execute('BEGIN')
+        cur.execute(sql_statement, sql_parameters)
+        sql = sql_reminder
+        cur.execute(sql_reminder, (end_time, triggered, reminder.activity, reminder.user_id))
+        cur.execute('COMMIT')
+    except sqlite3.Error as error:
+        if settings.DATABASE.in_transaction: settings.DATABASE.execute('ROLLBACK')
+        if sql == sql_statement: table = table_statement
+        await errors.log_error(
+            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+        )
+        raise
+    reminder.end_time = end_time
+    reminder.triggered = triggered
+    await _invalidate_reminder_timelines(reminder)
     if triggered: scheduled_for_tasks[reminder.task_name] = reminder
 
 
@@ -672,6 +821,7 @@ async def insert_user_reminder(user_id: int, activity: str, time_left: timedelta
                 strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
             )
             raise
+        await invalidate_user_timelines(user_id=user_id)
         reminder = await get_user_reminder(user_id, activity, custom_id)
 
     # Create background task if necessary
@@ -723,6 +873,7 @@ async def insert_clan_reminder(clan_name: str, time_left: timedelta, message: st
                 strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
             )
             raise
+        await invalidate_user_timelines(clan_name=clan_name)
         reminder = await get_clan_reminder(clan_name)
     # Create background task if necessary
     if triggered:
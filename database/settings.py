@@ -1,17 +1,24 @@
 # settings.py
-"""Provides access to the table "settings" in the database"""
+"""Provides access to the table "settings" in the database.
+
+The settings are cached after they were read once. Don't change the table from anywhere else.
+"""
 
 
 from argparse import ArgumentError
 import sqlite3
+from typing import Dict, Optional
 
 from database import errors
 from resources import exceptions, settings, strings
 
 
+_SETTINGS: Optional[Dict[str, str]] = None # name: value
+
+
 # Read Data
 async def get_settings() -> dict:
-    """Returns all setting from table "settings".
+    """Returns all setting from table "settings". The returned dict is a copy of the cached settings.
 
     Returns:
        dict with all settings.
@@ -20,6 +27,8 @@ async def get_settings() -> dict:
         sqlite3.Error if something goes wrong.
         NoDataFound if no data was found.
     """
+    global _SETTINGS
+    if _SETTINGS is not None: return dict(_SETTINGS)
     table = 'settings'
     function_name = 'get_settings'
     sql = f'SELECT * FROM {table}'
@@ -37,8 +46,9 @@ async def get_settings() -> dict:
             strings.INTERNAL_ERROR_NO_DATA_FOUND.format(table=table, function=function_name, sql=sql)
         )
         raise exceptions.NoDataFoundError('No settings not found in database.')
+    _SETTINGS = dict(records)
 
-    return dict(records)
+    return dict(_SETTINGS)
 
 
 # Write Data
@@ -79,4 +89,5 @@ async def update_setting(name: str, value: str) -> None:
         await errors.log_error(
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
-        raise
\ No newline at end of file
+        raise
+    if _SETTINGS is not None: _SETTINGS[name] = value
@@ -1,14 +1,23 @@
 # upgrades.py
-"""Provides access to the table "user_upgrades" in the database"""
+"""Provides access to the table "user_upgrades" in the database.
 
-from dataclasses import dataclass
+Upgrades are needed for every energy calculation, so the upgrades of a user are cached after they were read once.
+All writes in this module update the cache as well. Don't change the table from anywhere else.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 import sqlite3
-from typing import Tuple
+from typing import Dict, Iterable, Tuple
 
 from database import errors
 from resources import exceptions, settings, strings
 
 
+_UPGRADES_CACHE_SIZE = 5000
+_UPGRADES_CACHE = OrderedDict() # user_id: Dict[name: Upgrade]
+
+
 # Containers
 @dataclass()
 class Upgrade():
@@ -80,7 +89,68 @@ async def _dict_to_upgrade(record: dict) -> Upgrade:
     return reminder
 
 
+async def _cache_user_upgrades(user_id: int, user_upgrades: Dict[str, Upgrade]) -> None:
+    """Adds the upgrades of a user to the cache. Also caches users without upgrades."""
+    _UPGRADES_CACHE[user_id] = user_upgrades
+    _UPGRADES_CACHE.move_to_end(user_id)
+    if len(_UPGRADES_CACHE) > _UPGRADES_CACHE_SIZE:
+        _UPGRADES_CACHE.popitem(last=False)
+
+
+async def _get_cached_user_upgrades(user_id: int) -> Dict[str, Upgrade]:
+    """Returns the cached upgrades of a user. Reads them from the database if they aren't cached yet.
+
+    Returns
+    -------
+    Dict[name: Upgrade]. Empty if the user has no upgrades.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    LookupError if something goes wrong reading the dict.
+    Also logs all errors to the database.
+    """
+    user_upgrades = _UPGRADES_CACHE.get(user_id, None)
+    if user_upgrades is not None:
+        _UPGRADES_CACHE.move_to_end(user_id)
+        return user_upgrades
+    await load_upgrades((user_id,))
+    return _UPGRADES_CACHE[user_id]
+
+
 # Read Data
+async def load_upgrades(user_ids: Iterable[int]) -> None:
+    """Reads the upgrades of all users that aren't cached yet in one query and caches them.
+    Use this before reading the upgrades of several users, e.g. of all clan members.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    LookupError if something goes wrong reading the dict.
+    Also logs all errors to the database.
+    """
+    table = 'user_upgrades'
+    function_name = 'load_upgrades'
+    user_ids = [user_id for user_id in set(user_ids) if user_id not in _UPGRADES_CACHE]
+    if not user_ids: return
+    sql = f'SELECT * FROM {table} WHERE user_id IN ({",".join("?" * len(user_ids))})'
+    try:
+        cur = settings.DATABASE.cursor()
+        cur.execute(sql, user_ids)
+        records = cur.fetchall()
+    except sqlite3.Error as error:
+        await errors.log_error(
+            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+        )
+        raise
+    users_upgrades = {user_id: {} for user_id in user_ids}
+    for record in records:
+        upgrade = await _dict_to_upgrade(dict(record))
+        users_upgrades[upgrade.user_id][upgrade.name] = upgrade
+    for user_id, user_upgrades in users_upgrades.items():
+        await _cache_user_upgrades(user_id, user_upgrades)
+
+
 async def get_upgrade(user_id: int, name: str) -> Upgrade:
     """Gets an upgrade for a user id and an upgrade name.
 
@@ -100,24 +170,13 @@ async def get_upgrade(user_id: int, name: str) -> Upgrade:
     LookupError if something goes wrong reading the dict.
     Also logs all errors to the database.
     """
-    table = 'user_upgrades'
-    function_name = 'get_upgrade'
-    sql = f'SELECT * FROM {table} WHERE user_id=? AND name=?'
-    try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (user_id, name))
-        record = cur.fetchone()
-    except sqlite3.Error as error:
-        await errors.log_error(
-            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
-        )
-        raise
-    if not record:
+    user_upgrades = await _get_cached_user_upgrades(user_id)
+    upgrade = user_upgrades.get(name, None)
+    if upgrade is None:
         raise exceptions.NoDataFoundError(
             f'No upgrade data found in database for user "{user_id}" and name "{name}".'
         )
-    upgrade = await _dict_to_upgrade(dict(record))
-    return upgrade
+    return replace(upgrade)
 
 
 async def get_all_upgrades(user_id: int) -> Tuple[Upgrade]:
@@ -138,26 +197,12 @@ async def get_all_upgrades(user_id: int) -> Tuple[Upgrade]:
     LookupError if something goes wrong reading the dict.
     Also logs all errors to the database.
     """
-    table = 'user_upgrades'
-    function_name = 'get_active_upgrades'
-    sql = f'SELECT * FROM {table} WHERE user_id=? ORDER BY sort_index ASC'
-    try:
-        cur = settings.DATABASE.cursor()
-        cur.execute(sql, (user_id,))
-        records = cur.fetchall()
-    except sqlite3.Error as error:
-        await errors.log_error(
-            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
-        )
-        raise
-    if not records:
+    user_upgrades = await _get_cached_user_upgrades(user_id)
+    if not user_upgrades:
         error_message = f'No upgrades found for user {user_id} in database.'
         raise exceptions.NoDataFoundError(error_message)
-    upgrades = []
-    for record in records:
-        upgrade = await _dict_to_upgrade(dict(record))
-        upgrades.append(upgrade)
-    return tuple(upgrades)
+    upgrades = sorted(user_upgrades.values(), key=lambda upgrade: upgrade.sort_index)
+    return tuple(replace(upgrade) for upgrade in upgrades)
 
 
 # Write Data
@@ -186,6 +231,7 @@ async def _update_upgrade(upgrade: Upgrade, **kwargs) -> None:
             strings.INTERNAL_ERROR_NO_ARGUMENTS.format(table=table, function=function_name)
         )
         raise exceptions.NoArgumentsError('You need to specify at least one keyword argument.')
+    updated_columns = dict(kwargs)
     try:
         cur = settings.DATABASE.cursor()
         sql = f'UPDATE {table} SET'
@@ -201,6 +247,11 @@ async def _update_upgrade(upgrade: Upgrade, **kwargs) -> None:
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
+    # user_id and name are overwritten by the where clause above, so they never change
+    cached_upgrade = _UPGRADES_CACHE.get(upgrade.user_id, {}).get(upgrade.name, None)
+    if cached_upgrade is not None:
+        for column, value in updated_columns.items():
+            if column not in ('user_id', 'name'): setattr(cached_upgrade, column, value)
 
 
 async def insert_upgrade(user_id: int, name: str, level: int, sort_index: int) -> Upgrade:
@@ -242,6 +293,76 @@ async def insert_upgrade(user_id: int, name: str, level: int, sort_index: int) -
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
+    user_upgrades = _UPGRADES_CACHE.get(user_id, None)
+    if user_upgrades is not None: user_upgrades[name] = Upgrade(level, name, sort_index, user_id)
     upgrade = await get_upgrade(user_id, name)
 
-    return upgrade
\ No newline at end of file
+    return upgrade
+
+
+async def upsert_upgrades(user_id: int, user_upgrades: Dict[str, Tuple[int, int]]) -> Tuple[Upgrade]:
+    """Applies an upgrades snapshot, e.g. from the upgrades overview. Upgrades that don't exist yet are inserted, all
+    others are updated. All upgrades are written in one transaction.
+
+    Arguments
+    ---------
+    user_id: int
+    user_upgrades: Dict[name: (level, sort_index)]
+
+    Returns
+    -------
+    Tuple[Upgrade] with all upgrades of the user, sorted by sort_index.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database. Nothing is written in that case.
+    LookupError if something goes wrong reading the dict.
+    Also logs all errors to the database.
+    """
+    function_name = 'upsert_upgrades'
+    table = 'user_upgrades'
+    sql = (
+        f'INSERT INTO {table} (user_id, level, name, sort_index) VALUES (?, ?, ?, ?) '
+        f'ON CONFLICT (user_id, name) DO UPDATE SET level = excluded.level, sort_index = excluded.sort_index'
+    )
+    cached_upgrades = await _get_cached_user_upgrades(user_id)
+    if user_upgrades:
+        try:
+            cur = settings.DATABASE.cursor()
+            cur.execute('BEGIN')
+            cur.executemany(
+                sql,
+                [(user_id, level, name, sort_index) for name, (level, sort_index) in user_upgrades.items()]
+            )
+            cur.execute('COMMIT')
+        except sqlite3.Error as error:
+            if settings.DATABASE.in_transaction: settings.DATABASE.execute('ROLLBACK')
+            await errors.log_error(
+                strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+            )
+            raise
+        for name, (level, sort_index) in user_upgrades.items():
+            cached_upgrades[name] = Upgrade(level, name, sort_index, user_id)
+    return await get_all_upgrades(user_id)
+
+
+async def delete_upgrades(user_id: int) -> None:
+    """Deletes all upgrades of a user.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    Also logs all errors to the database.
+    """
+    table = 'user_upgrades'
+    function_name = 'delete_upgrades'
+    sql = f'DELETE FROM {table} WHERE user_id=?'
+    try:
+        cur = settings.DATABASE.cursor()
+        cur.execute(sql, (user_id,))
+    except sqlite3.Error as error:
+        await errors.log_error(
+            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+        )
+        raise
+    _UPGRADES_CACHE.pop(user_id, None)
\ No newline at end of file
@@ -4,12 +4,15 @@
 from dataclasses import dataclass
 from datetime import datetime
 import sqlite3
-from typing import NamedTuple, Tuple
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
 
-from database import errors
+from database import errors, reminders
 from resources import exceptions, settings, strings
 
 
+_USER_COUNT: Optional[int] = None # Counted once, then maintained by insert_user and delete_user
+
+
 # Containers
 class UserReminder(NamedTuple):
     """Object that summarizes all user settings for a specific alert"""
@@ -287,6 +290,69 @@ async def get_all_users() -> Tuple[User]:
     return tuple(users)
 
 
+async def get_users(user_ids: Iterable[int]) -> Dict[int, User]:
+    """Gets the user settings of several users in one query.
+
+    Returns
+    -------
+    Dict[user_id: User]. Users that are not registered are missing.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    LookupError if something goes wrong reading the dict.
+    Also logs all errors to the database.
+    """
+    table = 'users'
+    function_name = 'get_users'
+    user_ids = list(set(user_ids))
+    if not user_ids: return {}
+    sql = f'SELECT * FROM {table} WHERE user_id IN ({",".join("?" * len(user_ids))})'
+    try:
+        cur = settings.DATABASE.cursor()
+        cur.execute(sql, user_ids)
+        records = cur.fetchall()
+    except sqlite3.Error as error:
+        await errors.log_error(
+            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+        )
+        raise
+    users = {}
+    for record in records:
+        user = await _dict_to_user(dict(record))
+        users[user.user_id] = user
+
+    return users
+
+
+async def get_all_user_ids() -> Tuple[int]:
+    """Gets the user ids of all users.
+
+    Returns
+    -------
+    Tuple with the user ids. Empty if there are no users.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    Also logs all errors to the database.
+    """
+    table = 'users'
+    function_name = 'get_all_user_ids'
+    sql = f'SELECT user_id FROM {table}'
+    try:
+        cur = settings.DATABASE.cursor()
+        cur.execute(sql)
+        records = cur.fetchall()
+    except sqlite3.Error as error:
+        await errors.log_error(
+            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+        )
+        raise
+
+    return tuple(record['user_id'] for record in records)
+
+
 async def get_user_count() -> int:
     """Gets the amount of users in the table "users".
 
@@ -298,6 +364,8 @@ async def get_user_count() -> int:
     ------
     sqlite3.Error if something happened within the database. Also logs this error to the log file.
     """
+    global _USER_COUNT
+    if _USER_COUNT is not None: return _USER_COUNT
     table = 'users'
     function_name = 'get_user_count'
     sql = f'SELECT COUNT(user_id) FROM {table}'
@@ -311,6 +379,7 @@ async def get_user_count() -> int:
         )
         raise
     (user_count,) = record
+    _USER_COUNT = user_count
 
     return user_count
 
@@ -395,6 +464,46 @@ async def _update_user(user: User, **kwargs) -> None:
         raise
 
 
+async def update_energy(user: User, energy_full_time: datetime, energy_max: Optional[int] = None,
+                        energy_reminder: Optional[reminders.Reminder] = None,
+                        reminder_end_time: Optional[datetime] = None) -> None:
+    """Updates the energy of a user. If an energy reminder is passed, its end time is written in the same transaction
+    by reminders.update_user_reminder_end_time.
+    The user and the reminder objects are updated in memory instead of being read again.
+
+    Arguments
+    ---------
+    user: User
+    energy_full_time: datetime UTC aware
+    energy_max: int. Stays the same if None.
+    energy_reminder: The energy reminder of the user. Not updated if None.
+    reminder_end_time: datetime UTC aware, the new end time of the energy reminder
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database. Nothing is written in that case.
+    Also logs all errors to the database.
+    """
+    table = 'users'
+    function_name = 'update_energy'
+    if energy_max is None: energy_max = user.energy_max
+    sql = f'UPDATE {table} SET energy_full_time = ?, energy_max = ? WHERE user_id = ?'
+    sql_parameters = (energy_full_time, energy_max, user.user_id)
+    if energy_reminder is not None and reminder_end_time is not None:
+        await reminders.update_user_reminder_end_time(energy_reminder, reminder_end_time, sql, sql_parameters, table)
+    else:
+        try:
+            cur = settings.DATABASE.cursor()
+            cur.execute(sql, sql_parameters)
+        except sqlite3.Error as error:
+            await errors.log_error(
+                strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+            )
+            raise
+    user.energy_full_time = energy_full_time
+    user.energy_max = energy_max
+
+
 async def insert_user(user_id: int) -> User:
     """Inserts a record in the table "users".
 
@@ -426,6 +535,31 @@ async def insert_user(user_id: int) -> User:
             strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
         )
         raise
+    global _USER_COUNT
+    if _USER_COUNT is not None: _USER_COUNT += 1
     user = await get_user(user_id)
 
-    return user
\ No newline at end of file
+    return user
+
+
+async def delete_user(user_id: int) -> None:
+    """Deletes the record of a user from the table "users".
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    Also logs all errors to the database.
+    """
+    table = 'users'
+    function_name = 'delete_user'
+    sql = f'DELETE FROM {table} WHERE user_id=?'
+    try:
+        cur = settings.DATABASE.cursor()
+        cur.execute(sql, (user_id,))
+    except sqlite3.Error as error:
+        await errors.log_error(
+            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+        )
+        raise
+    global _USER_COUNT
+    if _USER_COUNT is not None: _USER_COUNT -= cur.rowcount
@@ -4,7 +4,7 @@
 from argparse import ArgumentError
 from dataclasses import dataclass
 import sqlite3
-from typing import Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
 from database import errors
 from resources import exceptions, settings, strings
@@ -218,6 +218,44 @@ async def get_user_workers(user_id: int) -> Tuple[UserWorker]:
     return tuple(user_workers)
 
 
+async def get_users_workers(user_ids: Iterable[int]) -> Dict[int, Tuple[UserWorker]]:
+    """Gets all workers of several users in one query.
+
+    Arguments
+    ---------
+    user_ids: Iterable[int]
+
+    Returns
+    -------
+    Dict[user_id: Tuple[UserWorker]]. Users without workers have an empty tuple.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    LookupError if something goes wrong reading the dict.
+    Also logs all errors to the database.
+    """
+    table = 'user_workers'
+    function_name = 'get_users_workers'
+    user_ids = list(set(user_ids))
+    if not user_ids: return {}
+    sql = f'SELECT * FROM {table} WHERE user_id IN ({",".join("?" * len(user_ids))})'
+    try:
+        cur = settings.DATABASE.cursor()
+        cur.execute(sql, user_ids)
+        records = cur.fetchall()
+    except sqlite3.Error as error:
+        await errors.log_error(
+            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+        )
+        raise
+    users_workers = {user_id: [] for user_id in user_ids}
+    for record in records:
+        user_worker = await _dict_to_user_worker(dict(record))
+        users_workers[user_worker.user_id].append(user_worker)
+    return {user_id: tuple(user_workers) for user_id, user_workers in users_workers.items()}
+
+
 async def get_worker_level(level: Optional[int] = None, workers_required: Optional[int] = None) -> WorkerLevel:
     """Gets worker level data for a worker level.
 
@@ -466,4 +504,131 @@ async def insert_worker_level(level: int, workers_required: int) -> WorkerLevel:
         raise
     worker_level = await get_worker_level(level)
 
-    return worker_level
\ No newline at end of file
+    return worker_level
+
+
+async def _upsert_user_workers(user_id: int, user_workers: Dict[str, Tuple[int, int]]) -> None:
+    """Inserts or updates several user worker records in one transaction. Use upsert_user_workers() or
+    add_user_workers() to trigger this function.
+
+    Arguments
+    ---------
+    user_id: int
+    user_workers: Dict[worker_name: (worker_level, worker_amount)]
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database. Nothing is written in that case.
+    Also logs all errors to the database.
+    """
+    function_name = '_upsert_user_workers'
+    table = 'user_workers'
+    sql = (
+        f'INSERT INTO {table} (user_id, worker_name, worker_level, worker_amount) VALUES (?, ?, ?, ?) '
+        f'ON CONFLICT (user_id, worker_name) DO UPDATE SET worker_level = excluded.worker_level, '
+        f'worker_amount = excluded.worker_amount'
+    )
+    if not user_workers: return
+    try:
+        cur = settings.DATABASE.cursor()
+        cur.execute('BEGIN')
+        cur.executemany(
+            sql,
+            [(user_id, worker_name, worker_level, worker_amount)
+             for worker_name, (worker_level, worker_amount) in user_workers.items()]
+        )
+        cur.execute('COMMIT')
+    except sqlite3.Error as error:
+        if settings.DATABASE.in_transaction: settings.DATABASE.execute('ROLLBACK')
+        await errors.log_error(
+            strings.INTERNAL_ERROR_SQLITE3.format(error=error, table=table, function=function_name, sql=sql)
+        )
+        raise
+
+
+async def _get_user_workers_by_name(user_id: int) -> Dict[str, UserWorker]:
+    """Returns the roster of a user. Empty if the user has no workers."""
+    try:
+        user_workers = await get_user_workers(user_id)
+    except exceptions.NoDataFoundError:
+        user_workers = ()
+    return {user_worker.worker_name: user_worker for user_worker in user_workers}
+
+
+async def upsert_user_workers(user_id: int, user_workers: Dict[str, Tuple[int, int]]) -> Dict[str, UserWorker]:
+    """Applies a roster snapshot, e.g. from the worker stats. Workers that don't exist yet are inserted, all others are
+    updated. All workers are written in one transaction.
+
+    Arguments
+    ---------
+    user_id: int
+    user_workers: Dict[worker_name: (worker_level, worker_amount)]
+
+    Returns
+    -------
+    Dict[worker_name: UserWorker] with the updated roster of the user. Contains workers that were not in the snapshot.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    LookupError if something goes wrong reading the dict.
+    Also logs all errors to the database.
+    """
+    roster = await _get_user_workers_by_name(user_id)
+    await _upsert_user_workers(user_id, user_workers)
+    for worker_name, (worker_level, worker_amount) in user_workers.items():
+        roster[worker_name] = UserWorker(user_id, worker_amount, worker_level, worker_name)
+    return roster
+
+
+async def add_user_workers(user_id: int, worker_amounts: Dict[str, int],
+                           new_worker_level: int = 0) -> Dict[str, UserWorker]:
+    """Adds or removes worker amounts, e.g. from lootboxes or worker requests, and levels the workers up or down
+    accordingly. All workers are written in one transaction.
+    A worker levels up if its amount exceeds the workers required for the next level.
+
+    Arguments
+    ---------
+    user_id: int
+    worker_amounts: Dict[worker_name: amount], the amount is negative if workers were removed
+    new_worker_level: Level that workers start with if the user doesn't have them yet. Workers the user doesn't have
+    are ignored if their amount is negative.
+
+    Returns
+    -------
+    Dict[worker_name: UserWorker] with the updated roster of the user.
+
+    Raises
+    ------
+    sqlite3.Error if something happened within the database.
+    LookupError if something goes wrong reading the dict.
+    Also logs all errors to the database.
+    """
+    roster = await _get_user_workers_by_name(user_id)
+    try:
+        workers_required = {worker_level.level: worker_level.workers_required
+                            for worker_level in await get_worker_levels()}
+    except exceptions.NoDataFoundError:
+        workers_required = {}
+    updated_workers = {}
+    for worker_name, worker_amount_change in worker_amounts.items():
+        user_worker = roster.get(worker_name, None)
+        if user_worker is not None:
+            worker_level = user_worker.worker_level
+            worker_amount = user_worker.worker_amount + worker_amount_change
+        elif worker_amount_change > 0:
+            worker_level = new_worker_level
+            worker_amount = worker_amount_change
+        else:
+            continue
+        while worker_level + 1 in workers_required and worker_amount > workers_required[worker_level + 1]:
+            worker_amount -= workers_required[worker_level + 1]
+            worker_level += 1
+        while worker_amount < 0 and worker_level in workers_required:
+            worker_amount += workers_required[worker_level]
+            worker_level -= 1
+        updated_workers[worker_name] = (worker_level, worker_amount)
+    await _upsert_user_workers(user_id, updated_workers)
+    for worker_name, (worker_level, worker_amount) in updated_workers.items():
+        roster[worker_name] = UserWorker(user_id, worker_amount, worker_level, worker_name)
+    return roster
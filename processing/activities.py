@@ -3,17 +3,26 @@
 from datetime import timedelta
 import random
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
 from cache import messages
 from database import reminders,  users
+from processing import detection, parsing, router
 from resources import exceptions, functions, regex
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+SIGNATURES = (
+    router.Signature('author', (
+        '— cooldowns', #English
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_REMINDERS,)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Processes the message for all activity list related actions.
 
     Returns
@@ -22,12 +31,13 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await update_reminders_from_activities_list(message, embed_data, user, user_settings))
+    return_values.append(await update_reminders_from_activities_list(message, embed_data, user, user_settings, context))
     return any(return_values)
 
 
-async def update_reminders_from_activities_list(message: discord.Message, embed_data: Dict, interaction_user: Optional[discord.User],
-                                                user_settings: Optional[users.User]) -> bool:
+async def update_reminders_from_activities_list(message: discord.Message, embed_data: parsing.EmbedData, interaction_user: Optional[discord.User],
+                                                user_settings: Optional[users.User],
+                                                context: detection.DetectionContext) -> bool:
     """Creates reminders or deletes them for all commands in the activities list
 
     Returns
@@ -39,24 +49,24 @@ async def update_reminders_from_activities_list(message: discord.Message, embed_
     search_strings = [
         '— cooldowns',
     ]
-    if any(search_string in embed_data['author']['name'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.author.name_lower for search_string in search_strings):
         if interaction_user is None:
             user_command_message = (
                 await messages.find_message(message.channel.id, regex.COMMAND_ACTIVITIES)
             )
             interaction_user = user_command_message.author
-        if embed_data['embed_user'] is not None and embed_data['embed_user'] != interaction_user: return add_reaction
-        if interaction_user.name not in embed_data['author']['name']: return
+        if context.embed_user is not None and context.embed_user != interaction_user: return add_reaction
+        if interaction_user.name not in embed_data.author.name: return
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(interaction_user.id)
+                user_settings: users.User = await context.get_user(interaction_user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
         cooldowns = []
         ready_commands = []
         if user_settings.reminder_daily.enabled:
-            timestring_match = re.search(r"daily`\*\* \(\*\*(.+?)\*\*", embed_data['field0']['value'].lower())
+            timestring_match = re.search(regex.ACTIVITIES_TIMESTRING_DAILY, embed_data.field(0).value_lower)
             if timestring_match:
                 user_command = await functions.get_game_command(user_settings, 'daily')
                 reminder_message = user_settings.reminder_daily.message.replace('{command}', user_command)
@@ -64,7 +74,7 @@ async def update_reminders_from_activities_list(message: discord.Message, embed_
             else:
                 ready_commands.append('daily')
         if user_settings.reminder_vote.enabled:
-            timestring_match = re.search(r"vote`\*\* \(\*\*(.+?)\*\*", embed_data['field0']['value'].lower())
+            timestring_match = re.search(regex.ACTIVITIES_TIMESTRING_VOTE, embed_data.field(0).value_lower)
             if timestring_match:
                 user_command = await functions.get_game_command(user_settings, 'vote')
                 reminder_message = user_settings.reminder_vote.message.replace('{command}', user_command)
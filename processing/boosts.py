@@ -2,18 +2,27 @@
 
 from datetime import timedelta
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 
 from cache import messages
 from database import clans, reminders, upgrades, users
+from processing import detection, parsing, router
 from resources import emojis, exceptions, functions, regex, settings, strings, views
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+SIGNATURES = (
+    router.Signature('description', (
+        'these are your active boosts', #English
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_REMINDERS,)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Processes the message for all boost related actions.
 
     Returns
@@ -22,13 +31,14 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await create_reminders_from_boosts(bot, message, embed_data, user, user_settings))
+    return_values.append(await create_reminders_from_boosts(bot, message, embed_data, user, user_settings, context))
     return any(return_values)
 
 
-async def create_reminders_from_boosts(bot: discord.Bot, message: discord.Message, embed_data: Dict,
+async def create_reminders_from_boosts(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData,
                                        user: Optional[discord.User],
-                                       user_settings: Optional[users.User]) -> bool:
+                                       user_settings: Optional[users.User],
+                                       context: detection.DetectionContext) -> bool:
     """• Update idluck count in the database
     • Show profile timers helper
 
@@ -41,7 +51,7 @@ async def create_reminders_from_boosts(bot: discord.Bot, message: discord.Messag
     search_strings = [
         'these are your active boosts', #English
     ]
-    if any(search_string in embed_data['description'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.description_lower for search_string in search_strings):
         if user is None:
             user_command_message = (
                 await messages.find_message(message.channel.id, regex.COMMAND_BOOSTS)
@@ -50,13 +60,13 @@ async def create_reminders_from_boosts(bot: discord.Bot, message: discord.Messag
             user = user_command_message.author
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.reminder_boosts.enabled: return add_reaction
-        boost_fields = embed_data['field0']['value']
-        if len(message.embeds[0].fields) > 1 and embed_data['field1']['name'] == '':
-            boost_fields = f'{boost_fields}\n{embed_data["field1"]["value"]}'
+        boost_fields = embed_data.field(0).value
+        if len(message.embeds[0].fields) > 1 and embed_data.field(1).name == '':
+            boost_fields = f'{boost_fields}\n{embed_data.field(1).value}'
         all_boosts = list(strings.ACTIVITIES_BOOSTS[:])
         for line in boost_fields.lower().split('\n'):
             if 'none' in boost_fields.lower():
@@ -68,7 +78,7 @@ async def create_reminders_from_boosts(bot: discord.Bot, message: discord.Messag
                 except exceptions.NoDataFoundError:
                     pass
                 break
-            active_item_match = re.search(r' \*\*(.+?)\*\*: (.+?)$', line)
+            active_item_match = re.search(regex.BOOSTS_ACTIVE_ITEM, line)
             active_item_activity = active_item_match.group(1).replace(' ','-')
             if active_item_activity in all_boosts: all_boosts.remove(active_item_activity)
             active_item_emoji = emojis.BOOSTS_EMOJIS.get(active_item_activity, '')
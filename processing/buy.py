@@ -1,16 +1,24 @@
 # buy.py
 
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
 from database import users
-from resources import exceptions, strings
+from processing import detection, parsing, router
+from resources import exceptions, regex, strings
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+SIGNATURES = (
+    router.Signature('content', (
+        'successfully bought', #English
+    )),
+)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Processes the message for all /shop buy related actions.
 
     Returns
@@ -19,12 +27,13 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await call_context_helper(message, embed_data, user, user_settings))
+    return_values.append(await call_context_helper(message, embed_data, user, user_settings, context))
     return any(return_values)
 
 
-async def call_context_helper(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                                              user_settings: Optional[users.User]) -> bool:
+async def call_context_helper(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                                              user_settings: Optional[users.User],
+                              context: detection.DetectionContext) -> bool:
     """Call the context helper when buying an item
 
     Returns
@@ -36,16 +45,16 @@ async def call_context_helper(message: discord.Message, embed_data: Dict, user:
     search_strings = [
         'successfully bought', #English
     ]
-    if (any(search_string in message.content.lower() for search_string in search_strings)
-        and 'idlecoin' in message.content.lower()):
+    if (any(search_string in embed_data.content_lower for search_string in search_strings)
+        and 'idlecoin' in embed_data.content_lower):
         if user is None: user = message.mentions[0]
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.helper_context_enabled: return add_reaction
-        item_name_match = re.search(r'\s`(.+?)`\s', message.content.lower())
+        item_name_match = re.search(regex.BUY_ITEM_NAME, embed_data.content_lower)
         items_commands = {
             'energy glass': f"➜ {strings.SLASH_COMMANDS['use']}\n",
             'energy drink': f"➜ {strings.SLASH_COMMANDS['use']}\n",
@@ -2,18 +2,28 @@
 
 from datetime import timedelta
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 
 from cache import messages
 from database import users
+from processing import detection, parsing, router
 from resources import exceptions, functions, regex, settings, strings, views
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User] = None,
-                          user_settings: Optional[users.User] = None) -> bool:
+SIGNATURES = (
+    router.Signature('author', (
+        '— claim', #English
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_USER, router.SIDE_EFFECT_ENERGY)
+TIMEOUT = None # Waits for user interaction
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Processes the message for all daily related actions.
 
     Returns
@@ -22,12 +32,12 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await process_claim_message(bot, message, embed_data, user, user_settings))
+    return_values.append(await process_claim_message(bot, message, embed_data, user, user_settings, context))
     return any(return_values)
 
 
-async def process_claim_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                                user_settings: Optional[users.User]) -> bool:
+async def process_claim_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                                user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Tracks last claim time, updates energy loss and creates a claim reminder if the user so desires
 
     Returns
@@ -39,13 +49,13 @@ async def process_claim_message(bot: discord.Bot, message: discord.Message, embe
     search_strings = [
         '— claim', #English
     ]
-    if any(search_string in embed_data['author']['name'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.author.name_lower for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if context.embed_user is not None:
+                user = context.embed_user
+                user_settings = context.embed_user_settings
             else:
-                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data['author']['name'])
+                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data.author.name)
                 user_name = user_name_match.group(1)
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_CLAIM, user_name=user_name)
@@ -53,14 +63,14 @@ async def process_claim_message(bot: discord.Bot, message: discord.Message, embe
                 user = user_command_message.author
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
         claim_fields = ''
         for field in message.embeds[0].fields:
             claim_fields = f'{claim_fields}\n{field.value}'.strip()
-            guild_seal_count_match = re.search(r"\+([0-9,]+) <:guildseal", claim_fields.lower())
+            guild_seal_count_match = re.search(regex.CLAIM_GUILD_SEALS, claim_fields.lower())
             if guild_seal_count_match:
                 guild_seal_count = int(guild_seal_count_match.group(1).replace(',',''))
                 guild_seal_count = user_settings.inventory.guild_seal + guild_seal_count
@@ -76,6 +86,7 @@ async def process_claim_message(bot: discord.Bot, message: discord.Message, embe
                                                                     cmd_profile=strings.SLASH_COMMANDS["profile"]))
         except exceptions.EnergyFullTimeNoneError:
             pass
+        await router.release_side_effects()
         if user_settings.reminder_claim.enabled:
             view = views.SetClaimReminderTimeView(bot, message, user, user_settings)
             embed = discord.Embed(
@@ -3,7 +3,7 @@
 from datetime import timedelta
 import random
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
@@ -11,11 +11,27 @@ import pendulum
 
 from cache import messages
 from database import clans, errors, reminders, users
+from processing import detection, parsing, router
 from resources import exceptions, functions, logs, regex, strings
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User] = None,
-                          user_settings: Optional[users.User] = None, clan_settings: Optional[clans.Clan] = None) -> bool:
+SIGNATURES = (
+    router.Signature('footer', (
+        'your guild was raided', #English
+        'owner:', #English
+    )),
+    router.Signature('content', (
+        'successfully contributed to **', #English
+        '** joined **', #English
+        'successfully kicked from **', #English
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_CLAN, router.SIDE_EFFECT_USER)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], clan_settings: Optional[clans.Clan],
+                          context: detection.DetectionContext) -> bool:
     """Processes the message for all clan related actions.
 
     Returns
@@ -25,13 +41,13 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     """
     return_values = []
     return_values.append(await create_clan_reminder(message, embed_data, clan_settings))
-    return_values.append(await update_clan(bot, message, embed_data, user, user_settings))
-    return_values.append(await update_guild_seals_from_contribution(bot, message, embed_data, user, user_settings))
+    return_values.append(await update_clan(bot, message, embed_data, user, user_settings, context))
+    return_values.append(await update_guild_seals_from_contribution(bot, message, embed_data, user, user_settings, context))
     return_values.append(await add_joined_member_to_clan(message, embed_data, user, user_settings))
     return any(return_values)
 
 
-async def create_clan_reminder(message: discord.Message, embed_data: Dict, clan_settings: Optional[clans.Clan]) -> bool:
+async def create_clan_reminder(message: discord.Message, embed_data: parsing.EmbedData, clan_settings: Optional[clans.Clan]) -> bool:
     """Creates clan reminder from clan overview
 
     Returns
@@ -43,13 +59,13 @@ async def create_clan_reminder(message: discord.Message, embed_data: Dict, clan_
     search_strings = [
         'your guild was raided', #English
     ]
-    if any(search_string in embed_data['footer']['text'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.footer.text_lower for search_string in search_strings):
         if clan_settings is None:
             try:
-                clan_settings: clans.Clan = await clans.get_clan_by_clan_name(embed_data['field0']['name'])
+                clan_settings: clans.Clan = await clans.get_clan_by_clan_name(embed_data.field(0).name)
             except exceptions.NoDataFoundError:
                 return add_reaction
-        player_count_match = re.search(r'players\*\*: (\d+)\/', embed_data['field0']['value'].lower())
+        player_count_match = re.search(regex.CLAN_PLAYER_COUNT, embed_data.field(0).value_lower)
         player_count = int(player_count_match.group(1))
         if len(clan_settings.members) != player_count:
             await message.reply(
@@ -57,7 +73,7 @@ async def create_clan_reminder(message: discord.Message, embed_data: Dict, clan_
                 f'Please use {strings.SLASH_COMMANDS["guild list"]} to update it.'
             )
         if not clan_settings.reminder_enabled: return add_reaction
-        if '✅' in embed_data['field0']['value']: return add_reaction
+        if '✅' in embed_data.field(0).value: return add_reaction
         clan_command = strings.SLASH_COMMANDS['teamraid']
         current_time = utils.utcnow()
         midnight_today = utils.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -72,8 +88,8 @@ async def create_clan_reminder(message: discord.Message, embed_data: Dict, clan_
     return add_reaction
 
 
-async def update_clan(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                      user_settings: Optional[users.User]) -> bool:
+async def update_clan(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                      user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Updates the guild from /guild list
 
     Returns
@@ -88,12 +104,12 @@ async def update_clan(bot: discord.Bot, message: discord.Message, embed_data: Di
     search_strings_footer = [
         'owner:', #English
     ]
-    if (any(search_string in embed_data['field0']['name'].lower() for search_string in search_strings_field_name)
-        and any(search_string in embed_data['footer']['text'].lower() for search_string in search_strings_footer)):
+    if (any(search_string in embed_data.field(0).name_lower for search_string in search_strings_field_name)
+        and any(search_string in embed_data.footer.text_lower for search_string in search_strings_footer)):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if context.embed_user is not None:
+                user = context.embed_user
+                user_settings = context.embed_user_settings
             else:
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_CLAN_LIST)
@@ -101,13 +117,13 @@ async def update_clan(bot: discord.Bot, message: discord.Message, embed_data: Di
                 user = user_command_message.author
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
-        clan_name_match = re.search(r'^\*\*(.+?)\*\* members', embed_data['field0']['name'])
+        clan_name_match = re.search(regex.CLAN_NAME_FROM_MEMBERS, embed_data.field(0).name)
         clan_name = clan_name_match.group(1)
-        leader_match = re.search(r'Owner: (.+?)$', embed_data['footer']['text'])
+        leader_match = re.search(regex.CLAN_OWNER_NAME, embed_data.footer.text)
         leader_id_or_name = leader_match.group(1)
         try:
             leader_id = int(leader_id_or_name)
@@ -119,22 +135,15 @@ async def update_clan(bot: discord.Bot, message: discord.Message, embed_data: Di
                 await errors.log_error(f'Error while trying to find leader id. Found no guild member with name "{leader_id_or_name}".',
                                        message)
         clan_members_found = {}
-        clan_members = (
-            f"{embed_data['field0']['value']}\n"
-            f"{embed_data['field1']['value']}\n"
-            f"{embed_data['field2']['value']}\n"
-            f"{embed_data['field3']['value']}\n"
-            f"{embed_data['field4']['value']}\n"
-            f"{embed_data['field5']['value']}"
-        ).strip()
+        clan_members = '\n'.join(field.value for field in embed_data.fields).strip()
         for line in clan_members.split('\n'):
-            member_data_match = re.search(r'^\*\*(.+?)\*\* - (\d+?) <', line)
+            member_data_match = re.search(regex.CLAN_MEMBER_NAME_SEALS, line)
             if member_data_match:
                 user_name, guild_seals_contributed = member_data_match.groups()
                 guild_members = await functions.get_guild_member_by_name(message.guild, user_name, False)
                 clan_members_found[guild_members[0].id] = guild_seals_contributed
             else:
-                member_data_match = re.search(r'^ID: \*\*(\d+?)\*\* - (\d+?) <', line)
+                member_data_match = re.search(regex.CLAN_MEMBER_ID_SEALS, line)
                 user_id, guild_seals_contributed = member_data_match.groups()
                 clan_members_found[user_id] = guild_seals_contributed
         try:
@@ -209,8 +218,9 @@ async def update_clan(bot: discord.Bot, message: discord.Message, embed_data: Di
     return add_reaction
 
 
-async def update_guild_seals_from_contribution(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                                               user_settings: Optional[users.User]) -> bool:
+async def update_guild_seals_from_contribution(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                                               user_settings: Optional[users.User],
+                                               context: detection.DetectionContext) -> bool:
     """Update guild seals when contributing them
 
     Returns
@@ -223,19 +233,19 @@ async def update_guild_seals_from_contribution(bot: discord.Bot, message: discor
         'successfully contributed to **', #English
     ]
 
-    if any(search_string in message.content.lower() for search_string in search_strings):
+    if any(search_string in embed_data.content_lower for search_string in search_strings):
         user = message.mentions[0]
         try:
-            clan_settings = await clans.get_clan_by_member_id(user.id)
+            clan_settings = await context.get_clan_by_member_id(user.id)
         except exceptions.NoDataFoundError:
             clan_settings = None
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 pass
         if user_settings is None and clan_settings is None: return add_reaction
-        guild_seals_match = re.search(r', ([0-9,]+) <', message.content.lower())
+        guild_seals_match = re.search(regex.CLAN_CONTRIBUTED_SEALS, embed_data.content_lower)
         guild_seals_count = int(guild_seals_match.group(1).replace(',',''))
         if clan_settings is not None:
             guild_seals_total_old = 0
@@ -277,7 +287,7 @@ async def update_guild_seals_from_contribution(bot: discord.Bot, message: discor
     return add_reaction
 
 
-async def add_joined_member_to_clan(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
+async def add_joined_member_to_clan(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
                                     user_settings: Optional[users.User]) -> bool:
     """
     Sends a reminder when a member joins a registered clan
@@ -294,8 +304,8 @@ async def add_joined_member_to_clan(message: discord.Message, embed_data: Dict,
         'successfully kicked from **', #English
     ]
 
-    if any(search_string in message.content.lower() for search_string in search_strings):
-        clan_name_match = re.search(r' \*\*(.+?)\*\*$', message.content)
+    if any(search_string in embed_data.content_lower for search_string in search_strings):
+        clan_name_match = re.search(regex.CLAN_NAME_FROM_MESSAGE_END, message.content)
         try:
             clan_settings = await clans.get_clan_by_clan_name(clan_name_match.group(1))
         except exceptions.NoDataFoundError:
@@ -3,18 +3,27 @@
 from datetime import timedelta
 import random
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 
 from cache import messages
 from database import reminders, users
+from processing import detection, parsing, router
 from resources import exceptions, functions, regex
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+SIGNATURES = (
+    router.Signature('author', (
+        '— daily reward', #All languages
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_REMINDERS,)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Processes the message for all daily related actions.
 
     Returns
@@ -23,12 +32,12 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await create_reminder(message, embed_data, user, user_settings))
+    return_values.append(await create_reminder(message, embed_data, user, user_settings, context))
     return any(return_values)
 
 
-async def create_reminder(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+async def create_reminder(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Create a reminder on /daily
 
     Returns
@@ -40,13 +49,13 @@ async def create_reminder(message: discord.Message, embed_data: Dict, user: Opti
     search_strings = [
         '— daily reward', #All languages
     ]
-    if any(search_string in embed_data['author']['name'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.author.name_lower for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if context.embed_user is not None:
+                user = context.embed_user
+                user_settings = context.embed_user_settings
             else:
-                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data['author']['name'])
+                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data.author.name)
                 user_name = user_name_match.group(1)
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_DAILY, user_name=user_name)
@@ -54,7 +63,7 @@ async def create_reminder(message: discord.Message, embed_data: Dict, user: Opti
                 user = user_command_message.author
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.reminder_daily.enabled: return add_reaction
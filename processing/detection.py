@@ -0,0 +1,69 @@
+# detection.py
+"""Contains the detection context that is shared by all processors while processing one message"""
+
+from typing import Dict, Optional, Union
+
+import discord
+
+from database import clans, guilds, users
+from resources import exceptions
+
+
+class DetectionContext():
+    """Loads user, clan and guild settings on first access and keeps them for the rest of the processing run.
+    A new context is created for every processed message, so settings are never older than the message itself.
+
+    The getters behave exactly like the database functions they wrap, including the exceptions they raise.
+
+    embed_user is the user the embed belongs to (taken from the author icon), embed_user_settings their settings. Both
+    are set by the detection cog before the processors run and are None if unknown.
+    """
+    __slots__ = ('embed_user', 'embed_user_settings', 'guild_id', '_clans', '_guild', '_users')
+
+    def __init__(self, guild_id: Optional[int]) -> None:
+        self.embed_user: Optional[discord.Member] = None
+        self.embed_user_settings: Optional[users.User] = None
+        self.guild_id = guild_id
+        self._clans: Dict[int, Union[clans.Clan, exceptions.NoDataFoundError]] = {}
+        self._guild: Optional[guilds.Guild] = None
+        self._users: Dict[int, Union[users.User, exceptions.FirstTimeUserError]] = {}
+
+    async def get_user(self, user_id: int) -> users.User:
+        """Returns the settings of a user.
+
+        Raises
+        ------
+        exceptions.FirstTimeUserError if the user doesn't exist.
+        """
+        user_settings = self._users.get(user_id, None)
+        if user_settings is None:
+            try:
+                user_settings = await users.get_user(user_id)
+            except exceptions.FirstTimeUserError as error:
+                user_settings = error
+            self._users[user_id] = user_settings
+        if isinstance(user_settings, exceptions.FirstTimeUserError): raise user_settings
+        return user_settings
+
+    async def get_clan_by_member_id(self, user_id: int) -> clans.Clan:
+        """Returns the clan settings of the clan a user is a member of.
+
+        Raises
+        ------
+        exceptions.NoDataFoundError if the user is not in a clan.
+        """
+        clan_settings = self._clans.get(user_id, None)
+        if clan_settings is None:
+            try:
+                clan_settings = await clans.get_clan_by_member_id(user_id)
+            except exceptions.NoDataFoundError as error:
+                clan_settings = error
+            self._clans[user_id] = clan_settings
+        if isinstance(clan_settings, exceptions.NoDataFoundError): raise clan_settings
+        return clan_settings
+
+    async def get_guild(self) -> guilds.Guild:
+        """Returns the settings of the guild the message was sent in."""
+        if self._guild is None:
+            self._guild = await guilds.get_guild(self.guild_id)
+        return self._guild
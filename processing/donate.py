@@ -1,17 +1,26 @@
 # donate.py
 
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
 from cache import messages
 from database import users
+from processing import detection, parsing, router
 from resources import exceptions, regex, strings
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+SIGNATURES = (
+    router.Signature('description', (
+        'if you want to support', #English
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_USER, router.SIDE_EFFECT_ENERGY)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Processes the message for all donate related actions.
 
     Returns
@@ -20,12 +29,13 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await update_donor_tier(message, embed_data, user, user_settings))
+    return_values.append(await update_donor_tier(message, embed_data, user, user_settings, context))
     return any(return_values)
 
 
-async def update_donor_tier(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                                                user_settings: Optional[users.User]) -> bool:
+async def update_donor_tier(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                                                user_settings: Optional[users.User],
+                            context: detection.DetectionContext) -> bool:
     """Update donor tier in the database
 
     Returns
@@ -37,7 +47,7 @@ async def update_donor_tier(message: discord.Message, embed_data: Dict, user: Op
     search_strings = [
         'if you want to support', #English
     ]
-    if any(search_string in embed_data['description'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.description_lower for search_string in search_strings):
         if user is None:
             user_command_message = (
                 await messages.find_message(message.channel.id, regex.COMMAND_DONATE)
@@ -46,14 +56,14 @@ async def update_donor_tier(message: discord.Message, embed_data: Dict, user: Op
             user = user_command_message.author
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
-        if embed_data['field0']['name'] == '':
+        if embed_data.field(0).name == '':
             donor_tier = 0
         else:
-            donor_tier_match = re.search(r'\| (.+?) donator', embed_data['field0']['name'].lower())
+            donor_tier_match = re.search(regex.DONOR_TIER, embed_data.field(0).name_lower)
             donor_tier = list(strings.DONOR_TIER_ENERGY_MULTIPLIERS.keys()).index(donor_tier_match.group(1).lower())
         await user_settings.update(donor_tier=donor_tier)
         if user_settings.reactions_enabled: add_reaction = True
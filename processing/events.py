@@ -1,13 +1,24 @@
 # events.py
 
-from typing import Dict
 
 import discord
 
 from database import guilds
+from processing import detection, parsing, router
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, guild_settings: guilds.Guild) -> bool:
+SIGNATURES = (
+    router.Signature('field0_name', (
+        'say ohmmm', #English
+        'fired from its farm', #English
+        'lucky reward!', #English
+        'quatrillion of items', #English
+    )),
+)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, guild_settings: guilds.Guild,
+                          context: detection.DetectionContext) -> bool:
     """Processes the message for all event related actions.
 
     Returns
@@ -20,7 +31,7 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     return any(return_values)
 
 
-async def send_event_ping(message: discord.Message, embed_data: Dict, guild_settings: guilds.Guild) -> bool:
+async def send_event_ping(message: discord.Message, embed_data: parsing.EmbedData, guild_settings: guilds.Guild) -> bool:
     """Sends an event ping
 
     Returns
@@ -41,10 +52,10 @@ async def send_event_ping(message: discord.Message, embed_data: Dict, guild_sett
         'a lucky reward will be given to one of the players who joins!', #English
         'help to make boxes and get packing xp!', #English
     )
-    if (any(search_string in embed_data['field0']['name'].lower() for search_string in search_strings_name.keys())
-        and any(search_string in embed_data['field0']['value'].lower()for search_string in search_strings_value)):
+    if (any(search_string in embed_data.field(0).name_lower for search_string in search_strings_name.keys())
+        and any(search_string in embed_data.field(0).value_lower for search_string in search_strings_value)):
         for string, event_name in search_strings_name.items():
-            if string in embed_data['field0']['name'].lower():
+            if string in embed_data.field(0).name_lower:
                 event = event_name
                 break
         event_settings = getattr(guild_settings, f'event_{event}', None)
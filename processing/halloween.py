@@ -2,17 +2,27 @@
 
 from datetime import timedelta
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
 from cache import messages
 from database import reminders, users
+from processing import detection, parsing, router
 from resources import emojis, exceptions, functions, regex, settings, strings
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+SIGNATURES = (
+    router.Signature('content', (
+        '** spooked **', #English
+        '**candy apple** to **', #English
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_ENERGY, router.SIDE_EFFECT_REMINDERS)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Processes the message for all halloween related actions.
 
     Returns
@@ -21,12 +31,13 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await process_trickortreat(message, embed_data, user, user_settings))
+    return_values.append(await process_trickortreat(message, embed_data, user, user_settings, context))
     return any(return_values)
 
 
-async def process_trickortreat(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                                              user_settings: Optional[users.User]) -> bool:
+async def process_trickortreat(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                                              user_settings: Optional[users.User],
+                               context: detection.DetectionContext) -> bool:
     """Create boost reminders and update energy for trickortreat
 
     Returns
@@ -40,13 +51,9 @@ async def process_trickortreat(message: discord.Message, embed_data: Dict, user:
         '**candy apple** to **', #English
     ]
 
-    if any(search_string in message.content.lower() for search_string in search_strings):
-        search_patterns = [
-            r'^\*\*(.+?)\*\* spooked \*\*(.+?)\*\*',
-            r'^\*\*(.+?)\*\* gave.+to \*\*(.+?)\*\*'
-        ]
-        user_names_match = await functions.get_match_from_patterns(search_patterns, message.content)
-        event_type = 'trick' if 'spooked' in message.content.lower() else 'treat'
+    if any(search_string in embed_data.content_lower for search_string in search_strings):
+        user_names_match = await functions.get_match_from_patterns(regex.HAL_TRICKORTREAT_USER_NAMES, message.content)
+        event_type = 'trick' if 'spooked' in embed_data.content_lower else 'treat'
         target = target_settings = None
         user_name, target_name = user_names_match.groups()
         if user is None:    
@@ -63,12 +70,12 @@ async def process_trickortreat(message: discord.Message, embed_data: Dict, user:
             if len(target_users) == 1: target = target_users[0]
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 pass
         if target is not None:
             try:
-                target_settings: users.User = await users.get_user(target.id)
+                target_settings: users.User = await context.get_user(target.id)
             except exceptions.FirstTimeUserError:
                 if user_settings is None: return add_reaction
         user_bot_enabled = getattr(user_settings, 'bot_enabled', False)
@@ -83,7 +90,7 @@ async def process_trickortreat(message: discord.Message, embed_data: Dict, user:
             except exceptions.EnergyFullTimeNoneError:
                 pass
             if user_settings.reminder_boosts.enabled and event_type == 'trick':
-                user_boost_name_match = re.search(r'and received the \*\*(.+?)\*\*', message.content.lower())
+                user_boost_name_match = re.search(regex.HAL_BOOST_NAME, embed_data.content_lower)
                 user_boost_name = user_boost_name_match.group(1)
                 time_left = timedelta(hours=6)
                 reminder_message = (
@@ -1,17 +1,27 @@
 # workers.py
 
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
 from cache import messages
 from database import clans,users, workers, workers
+from processing import detection, parsing, router
 from resources import exceptions, regex
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User], clan_settings: Optional[clans.Clan]) -> bool:
+SIGNATURES = (
+    router.Signature('author', (
+        '— lootbox', #All languages
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_WORKERS,)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], clan_settings: Optional[clans.Clan],
+                          context: detection.DetectionContext) -> bool:
     """Processes the message for all worker related commands and events.
 
     Returns
@@ -20,12 +30,13 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await track_workers_from_lootboxes(message, embed_data, user, user_settings, clan_settings))
+    return_values.append(await track_workers_from_lootboxes(message, embed_data, user, user_settings, clan_settings, context))
     return any(return_values)
 
 
-async def track_workers_from_lootboxes(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                                       user_settings: Optional[users.User], clan_settings: Optional[clans.Clan]) -> bool:
+async def track_workers_from_lootboxes(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                                       user_settings: Optional[users.User], clan_settings: Optional[clans.Clan],
+                                       context: detection.DetectionContext) -> bool:
     """Tracks worker hire
 
     Returns
@@ -37,13 +48,13 @@ async def track_workers_from_lootboxes(message: discord.Message, embed_data: Dic
     search_strings = [
         '— lootbox', #All languages
     ]
-    if any(search_string in embed_data['author']['name'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.author.name_lower for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if context.embed_user is not None:
+                user = context.embed_user
+                user_settings = context.embed_user_settings
             else:
-                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data['author']['name'])
+                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data.author.name)
                 user_name = user_name_match.group(1)
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_OPEN, user_name=user_name)
@@ -51,42 +62,22 @@ async def track_workers_from_lootboxes(message: discord.Message, embed_data: Dic
                 user = user_command_message.author
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if clan_settings is None:
             try:
-                clan_settings: clans.Clan = await clans.get_clan_by_member_id(user.id)
+                clan_settings: clans.Clan = await context.get_clan_by_member_id(user.id)
             except exceptions.NoDataFoundError:
                 pass
         if not user_settings.bot_enabled: return add_reaction
-        for line in embed_data['field0']['value'].split('\n'):
-            worker_data_match = re.search(r'^\+([0-9,]+)\s<a:(.+?)worker:', line.lower())
+        worker_amounts = {}
+        for line in embed_data.field(0).value.split('\n'):
+            worker_data_match = re.search(regex.OPEN_WORKER_AMOUNT_NAME, line.lower())
             if worker_data_match:
                 worker_amount = int(worker_data_match.group(1))
                 worker_name = worker_data_match.group(2)
-                try:
-                    user_worker: workers.UserWorker = await workers.get_user_worker(user.id, worker_name)
-                    new_worker_level = user_worker.worker_level
-                    new_worker_amount = user_worker.worker_amount + worker_amount
-                    try:
-                        worker_level: workers.WorkerLevel = await workers.get_worker_level(user_worker.worker_level + 1)
-                        if user_worker.worker_amount + worker_amount > worker_level.workers_required:
-                            new_worker_level = worker_level.level
-                            new_worker_amount = user_worker.worker_amount + worker_amount - worker_level.workers_required
-                    except exceptions.NoDataFoundError:
-                        pass
-                    await user_worker.update(worker_level=new_worker_level, worker_amount=new_worker_amount)
-                except exceptions.NoDataFoundError:
-                    worker_levels = await workers.get_worker_levels()
-                    level = 0
-                    worker_amount_left = worker_amount
-                    for worker_level in worker_levels:
-                        if worker_amount_left > worker_level.workers_required:
-                            level += 1
-                            worker_amount_left -= worker_level.workers_required
-                        else:
-                            break
-                    await workers.insert_user_worker(user.id, worker_name, level, worker_amount_left)
+                worker_amounts[worker_name] = worker_amounts.get(worker_name, 0) + worker_amount
+        await workers.add_user_workers(user.id, worker_amounts)
         if user_settings.reactions_enabled: add_reaction = True
     return add_reaction
\ No newline at end of file
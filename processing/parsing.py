@@ -0,0 +1,202 @@
+# parsing.py
+"""Contains the parsed representation of IDLE FARM messages that is handed to all processors"""
+
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+import discord
+
+
+_EMBED_DATA_CACHE_SIZE = 500
+_EMBED_DATA_CACHE = OrderedDict()
+_FINGERPRINT_CACHE_SIZE = 1000
+_FINGERPRINT_CACHE = OrderedDict()
+
+
+class EmbedAuthor():
+    """Author of an embed. All attributes are empty strings if not set in the embed."""
+    __slots__ = ('icon_url', 'name', '_name_lower')
+
+    def __init__(self, icon_url: Optional[str] = None, name: Optional[str] = None) -> None:
+        self.icon_url = icon_url if icon_url is not None else ''
+        self.name = name if name is not None else ''
+        self._name_lower = None
+
+    @property
+    def name_lower(self) -> str:
+        if self._name_lower is None: self._name_lower = self.name.lower()
+        return self._name_lower
+
+
+class EmbedField():
+    """Field of an embed. All attributes are empty strings if not set in the embed."""
+    __slots__ = ('name', 'value', '_name_lower', '_value_lower')
+
+    def __init__(self, name: Optional[str] = None, value: Optional[str] = None) -> None:
+        self.name = name if name is not None else ''
+        self.value = value if value is not None else ''
+        self._name_lower = self._value_lower = None
+
+    @property
+    def name_lower(self) -> str:
+        if self._name_lower is None: self._name_lower = self.name.lower()
+        return self._name_lower
+
+    @property
+    def value_lower(self) -> str:
+        if self._value_lower is None: self._value_lower = self.value.lower()
+        return self._value_lower
+
+
+class EmbedFooter():
+    """Footer of an embed. All attributes are empty strings if not set in the embed."""
+    __slots__ = ('icon_url', 'text', '_text_lower')
+
+    def __init__(self, icon_url: Optional[str] = None, text: Optional[str] = None) -> None:
+        self.icon_url = icon_url if icon_url is not None else ''
+        self.text = text if text is not None else ''
+        self._text_lower = None
+
+    @property
+    def text_lower(self) -> str:
+        if self._text_lower is None: self._text_lower = self.text.lower()
+        return self._text_lower
+
+
+_EMPTY_FIELD = EmbedField()
+
+
+class EmbedData():
+    """Parsed content and first embed of a message.
+    All text attributes are guaranteed to exist and are empty strings if not set. Lowercase versions are created on
+    first access and then reused.
+    """
+    __slots__ = (
+        'author', 'content', 'description', 'fields', 'footer', 'title',
+        '_content_hash', '_content_lower', '_description_lower', '_title_lower',
+    )
+
+    def __init__(self, content: Optional[str] = None, author: Optional[EmbedAuthor] = None,
+                 description: Optional[str] = None, fields: Optional[List[EmbedField]] = None,
+                 footer: Optional[EmbedFooter] = None, title: Optional[str] = None) -> None:
+        self.author = author if author is not None else EmbedAuthor()
+        self.content = content if content is not None else ''
+        self.description = description if description is not None else ''
+        self.fields = fields if fields is not None else []
+        self.footer = footer if footer is not None else EmbedFooter()
+        self.title = title if title is not None else ''
+        self._content_hash = self._content_lower = self._description_lower = self._title_lower = None
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, EmbedData): return NotImplemented
+        return self.content_hash == other.content_hash and self._get_content() == other._get_content()
+
+    def __hash__(self) -> int:
+        return self.content_hash
+
+    def _get_content(self) -> Tuple:
+        """Returns all parsed strings as a tuple"""
+        return (
+            self.content, self.author.icon_url, self.author.name, self.description,
+            tuple((field.name, field.value) for field in self.fields), self.footer.icon_url, self.footer.text,
+            self.title,
+        )
+
+    def field(self, index: int) -> EmbedField:
+        """Returns the field with the given index. Returns an empty field if the embed doesn't have that field."""
+        try:
+            return self.fields[index]
+        except IndexError:
+            return _EMPTY_FIELD
+
+    @property
+    def content_hash(self) -> int:
+        if self._content_hash is None: self._content_hash = hash(self._get_content())
+        return self._content_hash
+
+    @property
+    def content_lower(self) -> str:
+        if self._content_lower is None: self._content_lower = self.content.lower()
+        return self._content_lower
+
+    @property
+    def description_lower(self) -> str:
+        if self._description_lower is None: self._description_lower = self.description.lower()
+        return self._description_lower
+
+    @property
+    def title_lower(self) -> str:
+        if self._title_lower is None: self._title_lower = self.title.lower()
+        return self._title_lower
+
+
+async def parse_embed(message: discord.Message) -> EmbedData:
+    """Parses the content and the first embed of a message.
+    The result is cached per message id and edit time, so every version of a message is only parsed once.
+    """
+    cache_key = (message.id, message.edited_at, len(message.embeds))
+    embed_data = _EMBED_DATA_CACHE.get(cache_key, None)
+    if embed_data is not None:
+        _EMBED_DATA_CACHE.move_to_end(cache_key)
+        return embed_data
+    embed_data = EmbedData(content=message.content)
+    if message.embeds:
+        embed = message.embeds[0]
+        if embed.author is not None:
+            embed_data.author = EmbedAuthor(embed.author.icon_url, embed.author.name)
+        if embed.description is not None:
+            embed_data.description = embed.description
+        embed_data.fields = [EmbedField(field.name, field.value) for field in embed.fields]
+        if embed.footer is not None:
+            embed_data.footer = EmbedFooter(embed.footer.icon_url, embed.footer.text)
+        if embed.title is not None:
+            embed_data.title = embed.title
+    _EMBED_DATA_CACHE[cache_key] = embed_data
+    if len(_EMBED_DATA_CACHE) > _EMBED_DATA_CACHE_SIZE:
+        _EMBED_DATA_CACHE.popitem(last=False)
+    return embed_data
+
+
+async def get_fingerprint(message: discord.Message) -> int:
+    """Returns a hash of the message content, the first embed and the disabled states of all components.
+    Doesn't parse the embed, so this is a lot cheaper than parse_embed.
+    """
+    embed_fingerprint = None
+    if message.embeds:
+        embed = message.embeds[0]
+        embed_fingerprint = (
+            embed.author.name if embed.author is not None else None,
+            embed.description,
+            tuple((field.name, field.value) for field in embed.fields),
+            embed.footer.text if embed.footer is not None else None,
+            embed.title,
+        )
+    components_fingerprint = tuple(
+        tuple(
+            (getattr(component, 'custom_id', None), getattr(component, 'disabled', None))
+            for component in row.children
+        )
+        for row in message.components
+    )
+    return hash((message.content, embed_fingerprint, components_fingerprint))
+
+
+async def check_new_version(message_before: discord.Message, message_after: discord.Message) -> bool:
+    """Checks if an edited message differs from the last version that was seen of it and remembers the new version.
+    If the message wasn't seen yet, it is compared to message_before instead.
+    This also filters out edit events that are delivered more than once.
+
+    Returns
+    -------
+    True if message_after is a new version of the message, False otherwise.
+    """
+    fingerprint_after = await get_fingerprint(message_after)
+    fingerprint_before = _FINGERPRINT_CACHE.get(message_after.id, None)
+    if fingerprint_before is None:
+        fingerprint_before = await get_fingerprint(message_before)
+    else:
+        _FINGERPRINT_CACHE.move_to_end(message_after.id)
+    _FINGERPRINT_CACHE[message_after.id] = fingerprint_after
+    if len(_FINGERPRINT_CACHE) > _FINGERPRINT_CACHE_SIZE:
+        _FINGERPRINT_CACHE.popitem(last=False)
+    return fingerprint_before != fingerprint_after
@@ -2,13 +2,14 @@
 
 from datetime import timedelta
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 
 from cache import messages
 from database import reminders, upgrades, users
+from processing import detection, parsing, router
 from resources import emojis, exceptions, functions, regex, settings
 
 
@@ -41,8 +42,19 @@ UPGRADES_BONUSES = {
 }
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+SIGNATURES = (
+    router.Signature('author', (
+        '— payday', #All languages
+    )),
+    router.Signature('description', (
+        'it\'s payday!', #English
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_USER, router.SIDE_EFFECT_REMINDERS)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Processes the message for all /shop buy related actions.
 
     Returns
@@ -51,13 +63,13 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await call_upgrades_helper(message, embed_data, user, user_settings))
-    return_values.append(await update_idlucks(message, embed_data, user, user_settings))
+    return_values.append(await call_upgrades_helper(message, embed_data, user, user_settings, context))
+    return_values.append(await update_idlucks(message, embed_data, user, user_settings, context))
     return any(return_values)
 
 
-async def call_upgrades_helper(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                              user_settings: Optional[users.User]) -> bool:
+async def call_upgrades_helper(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                              user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Call the context helper when preparing for payday
 
     Returns
@@ -69,13 +81,13 @@ async def call_upgrades_helper(message: discord.Message, embed_data: Dict, user:
     search_strings = [
         '— payday', #All languages
     ]
-    if any(search_string in embed_data['author']['name'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.author.name_lower for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if context.embed_user is not None:
+                user = context.embed_user
+                user_settings = context.embed_user_settings
             else:
-                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data['author']['name'])
+                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data.author.name)
                 user_name = user_name_match.group(1)
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_PAYDAY, user_name=user_name)
@@ -83,11 +95,11 @@ async def call_upgrades_helper(message: discord.Message, embed_data: Dict, user:
                 user = user_command_message.author
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.helper_upgrades_enabled: return add_reaction
-        idlucks_match = re.search(r'^• ([0-9,]+?) <', embed_data['field1']['value'].lower())
+        idlucks_match = re.search(regex.PAYDAY_IDLUCKS_PREVIEW, embed_data.field(1).value_lower)
         idlucks = int(re.sub(r'\D','', idlucks_match.group(1)))
         idlucks_after_payday = user_settings.idlucks + idlucks
         description = (
@@ -126,8 +138,8 @@ async def call_upgrades_helper(message: discord.Message, embed_data: Dict, user:
     return add_reaction
 
 
-async def update_idlucks(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                              user_settings: Optional[users.User]) -> bool:
+async def update_idlucks(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                              user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Update the idluck amount after paydaying. Also resets claim time if a claim reminder is active.
 
     Returns
@@ -139,18 +151,18 @@ async def update_idlucks(message: discord.Message, embed_data: Dict, user: Optio
     search_strings = [
         'it\'s payday!', #English
     ]
-    if any(search_string in embed_data['description'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.description_lower for search_string in search_strings):
         if user is None:
             user_command_message = (
                 await messages.find_message(message.channel.id, regex.COMMAND_PAYDAY)
             )
             user = user_command_message.author
         try:
-            user_settings: users.User = await users.get_user(user.id)
+            user_settings: users.User = await context.get_user(user.id)
         except exceptions.FirstTimeUserError:
             return add_reaction
         if not user_settings.bot_enabled: return add_reaction
-        idlucks_match = re.search(r'got ([0-9,]+?) <', embed_data['description'].lower())
+        idlucks_match = re.search(regex.PAYDAY_IDLUCKS_RECEIVED, embed_data.description_lower)
         idlucks = int(re.sub(r'\D','', idlucks_match.group(1)))
         await user_settings.update(idlucks=idlucks)
         try:
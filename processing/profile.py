@@ -2,18 +2,28 @@
 
 from datetime import timedelta
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 
-from cache import messages
-from database import clans, reminders, upgrades, users
+from cache import energy, messages
+from database import clans, reminders, users
+from processing import detection, parsing, router
 from resources import emojis, exceptions, functions, regex, settings, strings, views
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+SIGNATURES = (
+    router.Signature('author', (
+        '— profile', #English
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_USER, router.SIDE_EFFECT_ENERGY)
+TIMEOUT = None # Waits for user interaction
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Processes the message for all profile related actions.
 
     Returns
@@ -22,13 +32,14 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await call_profile_timers_and_update_idlucks(bot, message, embed_data, user, user_settings))
+    return_values.append(await call_profile_timers_and_update_idlucks(bot, message, embed_data, user, user_settings, context))
     return any(return_values)
 
 
-async def call_profile_timers_and_update_idlucks(bot: discord.Bot, message: discord.Message, embed_data: Dict,
+async def call_profile_timers_and_update_idlucks(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData,
                                                  interaction_user: Optional[discord.User],
-                                                 user_settings: Optional[users.User]) -> bool:
+                                                 user_settings: Optional[users.User],
+                                                 context: detection.DetectionContext) -> bool:
     """• Update idluck count in the database
     • Show profile timers helper
 
@@ -41,43 +52,38 @@ async def call_profile_timers_and_update_idlucks(bot: discord.Bot, message: disc
     search_strings = [
         '— profile', #English
     ]
-    if any(search_string in embed_data['author']['name'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.author.name_lower for search_string in search_strings):
         if interaction_user is None:
             user_command_message = (
                 await messages.find_message(message.channel.id, regex.COMMAND_PROFILE)
             )
             if user_command_message is None: return add_reaction
             interaction_user = user_command_message.author
-        if embed_data['embed_user'] is not None and embed_data['embed_user'] != interaction_user: return add_reaction
+        if context.embed_user is not None and context.embed_user != interaction_user: return add_reaction
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(interaction_user.id)
+                user_settings: users.User = await context.get_user(interaction_user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
         if user_settings.helper_upgrades_enabled:
-            idlucks_match = re.search(r'idlucks\*\*: ([0-9,]+?)\n', embed_data['field3']['value'].lower())
+            idlucks_match = re.search(regex.PROFILE_IDLUCKS, embed_data.field(3).value_lower)
             idlucks = int(re.sub('\D','', idlucks_match.group(1)))
             await user_settings.update(idlucks=idlucks)
-        energy_match = re.search(r'1084593332312887396> ([0-9,]+)/([0-9,]+)\n', embed_data['field0']['value'])
+        energy_match = re.search(regex.PROFILE_ENERGY, embed_data.field(0).value)
         energy_current = int(re.sub('\D','',energy_match.group(1)))
         energy_max = int(re.sub('\D','',energy_match.group(2)))
-        try:
-            energy_upgrade: upgrades.Upgrade = await upgrades.get_upgrade(user_settings.user_id, 'energy regeneration')
-            multiplier_upgrade = strings.ENERGY_UPGRADE_LEVEL_MULTIPLIERS[energy_upgrade.level]
-        except exceptions.NoDataFoundError:
-            multiplier_upgrade = 1
-        multiplier_donor = list(strings.DONOR_TIER_ENERGY_MULTIPLIERS.values())[user_settings.donor_tier]
-        energy_regen = 5 / (multiplier_donor * multiplier_upgrade * settings.ENERGY_REGEN_MULTIPLIER_EVENT)
+        energy_state: energy.EnergyState = await energy.get_energy_state(user_settings)
+        energy_regen_time = energy_state.energy_regen_time
+        energy_regen = energy_regen_time.total_seconds() / 60
         minutes_until_max = (int(energy_max) - int(energy_current)) * energy_regen
         current_time = utils.utcnow()
         level_full_time = current_time + timedelta(minutes=minutes_until_max)
-        energy_regen_time = timedelta(minutes=energy_regen)
-        await user_settings.update(energy_max=energy_max, energy_full_time=level_full_time)
         try:
-            await functions.recalculate_energy_reminder(user_settings, energy_regen_time)
+            await functions.update_user_energy(user_settings, level_full_time, energy_max)
         except exceptions.EnergyFullTimeOutdatedError:
             pass
+        await router.release_side_effects()
         if user_settings.reactions_enabled and not user_settings.helper_profile_enabled:
             add_reaction = True
         
@@ -100,15 +106,14 @@ async def call_profile_timers_and_update_idlucks(bot: discord.Bot, message: disc
                 energy_level = f'{emojis.WARNING} **FULL!**'
             else:
                 energy_level = f'{energy_level}\n{emojis.COOLDOWN} **Full** ({user_settings.energy_max}) {utils.format_dt(level_full_time, "R")}'
-            try:
-                energy_reminder: reminders.Reminder = await reminders.get_user_reminder(interaction_user.id, 'energy')
-                if energy_reminder.end_time > current_time:
-                    energy_level = (
-                        f'{energy_level}\n'
-                        f'{emojis.COOLDOWN} **Reminder** ({energy_reminder.activity[7:]}) {utils.format_dt(energy_reminder.end_time, "R")}'
-                    )
-            except exceptions.NoDataFoundError:
-                pass
+            user_timeline: reminders.UserTimeline = await reminders.get_user_timeline(interaction_user.id)
+            active_reminders = {reminder.activity.split('-')[0]: reminder for reminder in user_timeline.user_reminders}
+            energy_reminder = active_reminders.get('energy', None)
+            if energy_reminder is not None and energy_reminder.end_time > current_time:
+                energy_level = (
+                    f'{energy_level}\n'
+                    f'{emojis.COOLDOWN} **Reminder** ({energy_reminder.activity[7:]}) {utils.format_dt(energy_reminder.end_time, "R")}'
+                )
             
             last_claim_time_timestamp = 'Never'
             time_produced_timespan = 'None'
@@ -139,15 +144,12 @@ async def call_profile_timers_and_update_idlucks(bot: discord.Bot, message: disc
                 f'{emojis.BP} **Last claim**: {last_claim_time_timestamp}\n'
                 f'{emojis.BP} **Production time**: {time_produced_timespan}'
             )
-            try:
-                claim_reminder: reminders.Reminder = await reminders.get_user_reminder(interaction_user.id, 'claim')
-                if claim_reminder.end_time > current_time:
-                    field_production = (
-                        f'{field_production}\n'
-                        f'{emojis.COOLDOWN} **Reminder** {utils.format_dt(claim_reminder.end_time, "R")}'
-                    )
-            except exceptions.NoDataFoundError:
-                pass
+            claim_reminder = active_reminders.get('claim', None)
+            if claim_reminder is not None and claim_reminder.end_time > current_time:
+                field_production = (
+                    f'{field_production}\n'
+                    f'{emojis.COOLDOWN} **Reminder** {utils.format_dt(claim_reminder.end_time, "R")}'
+                )
             embed.add_field(
                 name = 'Production',
                 value = field_production,
@@ -161,7 +163,7 @@ async def call_profile_timers_and_update_idlucks(bot: discord.Bot, message: disc
                     ready_activities.append('daily')
                 clan_settings = None
                 try:
-                    clan_settings: clans.Clan = await clans.get_clan_by_member_id(interaction_user.id)
+                    clan_settings: clans.Clan = await context.get_clan_by_member_id(interaction_user.id)
                 except exceptions.NoDataFoundError:
                     pass
                 if clan_settings is not None:
@@ -169,19 +171,10 @@ async def call_profile_timers_and_update_idlucks(bot: discord.Bot, message: disc
                         ready_activities.append('teamraid')
                 if user_settings.reminder_vote.enabled:
                     ready_activities.append('vote')
-                try:
-                    active_reminders = await reminders.get_active_user_reminders(interaction_user.id)
-                    for reminder in active_reminders:
-                        if reminder.activity in ready_activities:
-                            ready_activities.remove(reminder.activity)
-                except exceptions.NoDataFoundError:
-                    pass
-                clan_reminder = None
-                if clan_settings is not None:
-                    try:
-                        clan_reminder = await reminders.get_clan_reminder(clan_settings.clan_name)
-                    except exceptions.NoDataFoundError:
-                        pass
+                for activity in active_reminders:
+                    if activity in ready_activities:
+                        ready_activities.remove(activity)
+                clan_reminder = user_timeline.clan_reminder if clan_settings is not None else None
                 if clan_reminder is not None and 'teamraid' in ready_activities:
                     ready_activities.remove('teamraid')
                 if ready_activities:
@@ -196,8 +189,8 @@ async def call_profile_timers_and_update_idlucks(bot: discord.Bot, message: disc
                         value = field_ready_commands.strip(),
                         inline = False
                     )
-            percentage_donor = round((multiplier_donor - 1) * 100)
-            percentage_upgrade = round((multiplier_upgrade - 1) * 100)
+            percentage_donor = round((energy_state.energy_regen_multiplier_donor - 1) * 100)
+            percentage_upgrade = round((energy_state.energy_regen_multiplier_upgrade - 1) * 100)
             percentage_event = round((settings.ENERGY_REGEN_MULTIPLIER_EVENT - 1) * 100)
             if energy_regen_time.microseconds > 0:
                 energy_regen_time = energy_regen_time + timedelta(microseconds=1_000_000 - energy_regen_time.microseconds)
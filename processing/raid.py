@@ -1,20 +1,34 @@
 # raid.py
 
-import copy
-import itertools
 import re
 from typing import Dict, Optional, Tuple
 
 import discord
 from discord import utils
 
-from cache import messages
+from cache import edits, messages
 from database import users, tracking, workers
-from resources import emojis, exceptions, functions, logs, regex, settings, strings
+from processing import detection, parsing, router, solver
+from resources import emojis, exceptions, functions, logs, regex, settings, strings, workerstats
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+SIGNATURES = (
+    router.Signature('content', (
+        'you need at least', #English
+    )),
+    router.Signature('field0_name', (
+        'raidpoints', #All languages
+    )),
+    router.Signature('description', (
+        'estimated raid worth', #English
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_ENERGY,)
+TIMEOUT = None # Waits for user interaction
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Processes the message for all raid related actions.
 
     Returns
@@ -23,14 +37,15 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await call_context_helper_on_empty_energy(message, embed_data, user, user_settings))
-    return_values.append(await call_raid_helper(bot, message, embed_data, user, user_settings))
-    return_values.append(await track_raid(message, embed_data, user, user_settings))
+    return_values.append(await call_context_helper_on_empty_energy(message, embed_data, user, user_settings, context))
+    return_values.append(await track_raid(message, embed_data, user, user_settings, context))
+    return_values.append(await call_raid_helper(bot, message, embed_data, user, user_settings, context))
     return any(return_values)
 
 
-async def call_context_helper_on_empty_energy(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                                              user_settings: Optional[users.User]) -> bool:
+async def call_context_helper_on_empty_energy(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                                              user_settings: Optional[users.User],
+                                              context: detection.DetectionContext) -> bool:
     """Call the context helper when a raid can't be started because not enough energy
 
     Returns
@@ -45,13 +60,13 @@ async def call_context_helper_on_empty_energy(message: discord.Message, embed_da
     search_strings_2 = [
         'to start a raid!', #English
     ]
-    if (any(search_string in message.content.lower() for search_string in search_strings_1)
-        and any(search_string in message.content.lower() for search_string in search_strings_2)):
+    if (any(search_string in embed_data.content_lower for search_string in search_strings_1)
+        and any(search_string in embed_data.content_lower for search_string in search_strings_2)):
         if user is None:
             user = message.mentions[0]
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.helper_context_enabled: return add_reaction
@@ -62,8 +77,8 @@ async def call_context_helper_on_empty_energy(message: discord.Message, embed_da
     return add_reaction
 
 
-async def call_raid_helper(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                           user_settings: Optional[users.User]) -> bool:
+async def call_raid_helper(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                           user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Calls the raid helper
 
     Returns
@@ -88,104 +103,56 @@ async def call_raid_helper(bot: discord.Bot, message: discord.Message, embed_dat
             if 'none' in line.lower():
                  empty_farms_found += 1
             else:
-                enemy_data_match = re.search(r'<a:(.+?)worker.+lv(\d+) \|.+`(\d+)/(\d+)`', line.lower())
+                enemy_data_match = re.search(regex.RAID_ENEMY_FARM, line.lower())
                 enemy_name = enemy_data_match.group(1)
                 enemy_level = int(re.sub('\D','',enemy_data_match.group(2)))
                 enemy_hp_current = int(enemy_data_match.group(3))
                 enemy_hp_max = int(enemy_data_match.group(4))
-                enemy_power = (
-                    (strings.WORKER_STATS[enemy_name]['speed'] + strings.WORKER_STATS[enemy_name]['strength']
-                     + strings.WORKER_STATS[enemy_name]['intelligence'])
-                    * (1 + (strings.WORKER_STATS[enemy_name]['tier']) / 2.5)
-                    * (1 + enemy_level / 1.25) * (enemy_hp_max / 100) / enemy_hp_max * enemy_hp_current
-                )
+                enemy_power = await workerstats.get_enemy_power(enemy_name, enemy_level, enemy_hp_current,
+                                                                enemy_hp_max)
                 if (enemy_power - 0.5).is_integer():
                     logs.logger.info(f'Worker {enemy_name} at level {enemy_level} has a power of {enemy_power}')
                 #enemy_power = int(Decimal(enemy_power).quantize(Decimal(1), rounding=ROUND_HALF_UP))
                 enemies_power[enemy_name] = (enemy_power, enemy_hp_current)
         return (empty_farms_found, enemies_power)
 
-    async def calculate_best_solution(workers_power: Dict[str, int], enemies_power: Dict[str, int], empty_farms_found: int) -> Tuple[int, Dict[str, int]]:
-            """Calculates the best solution for a raid and returns a dictionary with the worker names and their power.
-            The calculation returns the first solution that kills all enemies as there is no point in checking other
-            solutions after that.
+    async def calculate_best_solution(workers_power: Dict[str, int], enemies_power: Dict[str, int],
+                                      empty_farms_found: int) -> Tuple[int, int, Dict[str, int]]:
+        """Calculates the best solution for a raid and returns a dictionary with the worker names and their power.
+        If there are empty farms and workers left, the weakest remaining worker is added to fill the empty farm.
 
-            Arguments
-            ---------
-            workers_power: Dict[worker_name: worker_power]
-            enemies_power: Dict[enemy_name: enemy_power_remaining]
-            empty_farms_found: int
-
-            Returns
-            -------
-            Tuple with the amount of killed enemies (int) and the solution (Dict[worker_name: worker_power])
+        Arguments
+        ---------
+        workers_power: Dict[worker_name: worker_power]
+        enemies_power: Dict[enemy_name: enemy_power_remaining]
+        empty_farms_found: int
 
-            """
-            remaining_workers = copy.deepcopy(workers_power)
-            used_workers = {}
-            possible_solutions = []
-            killed_enemies = 0
-            hp_left = 100
-            possible_solutions = list(itertools.permutations(list(remaining_workers.keys())))
-            """
-            for permutation in permutations:
-                possible_solutions.append(list(used_workers.keys()) + list(permutation))
-            """
-            best_solution = []
-            for possible_solution in reversed(possible_solutions):
-                enemies_powers_copy = copy.deepcopy(enemies_power)
-                used_workers = {}
-                for worker_name in possible_solution:
-                    killed_enemies = 0
-                    for enemy_name, enemy_power_hp in enemies_powers_copy.items():
-                        enemy_power, enemy_hp = enemy_power_hp
-                        if enemy_hp == 0: continue
-                        worker_power = workers_power[worker_name]
-                        worker_damage = round(85 * worker_power / enemies_power[enemy_name][0])
-                        hp_remaining = enemy_hp - worker_damage
-                        used_workers[worker_name] = worker_power
-                        if hp_remaining < 0: hp_remaining = 0
-                        power_remaining = enemies_power[enemy_name][0] / 100 * hp_remaining
-                        enemies_powers_copy[enemy_name] = (power_remaining, hp_remaining)
-                        break
-                    for enemy_name, enemy_power_hp in enemies_powers_copy.items():
-                        enemy_power, enemy_hp = enemy_power_hp
-                        if enemy_hp == 0:
-                            killed_enemies += 1
-                            hp_left = 100
-                        elif enemy_hp < enemies_power[enemy_name][1]:
-                            hp_left = enemy_hp
-                    if killed_enemies >= len(enemies_powers_copy.keys()): break
-                if best_solution:
-                    if killed_enemies > best_solution[0]:
-                        best_solution = [killed_enemies, hp_left, possible_solution, used_workers]
-                    if killed_enemies == best_solution[0]:
-                        if hp_left < best_solution[1]:
-                            best_solution = [killed_enemies, hp_left, possible_solution, used_workers]
-                        elif len(used_workers.keys()) < len(best_solution[3].keys()):
-                            best_solution = [killed_enemies, hp_left, possible_solution, used_workers]
-                else:
-                    best_solution = [killed_enemies, hp_left, possible_solution, used_workers]
-            killed_enemies, hp_left, _, used_workers = best_solution
-            if empty_farms_found and len(used_workers) < len(workers_power):
-                    for worker_name, worker_power in workers_power.items():
-                        if worker_name not in used_workers:
-                            used_workers[worker_name] = worker_power
-                            break
-            return (killed_enemies, hp_left, used_workers)
+        Returns
+        -------
+        Tuple with the amount of killed enemies (int), the HP left of the next enemy (int) and the solution
+        (Dict[worker_name: worker_power])
+        """
+        killed_enemies, hp_left, worker_names = await solver.solve_raid(workers_power, enemies_power)
+        used_workers = {worker_name: workers_power[worker_name] for worker_name in worker_names}
+        if empty_farms_found and len(used_workers) < len(workers_power):
+            for worker_name, worker_power in workers_power.items():
+                if worker_name not in used_workers:
+                    used_workers[worker_name] = worker_power
+                    break
+        return (killed_enemies, hp_left, used_workers)
 
     add_reaction = False
     search_strings = [
         'farms will be raided in order', #English
     ]
-    if (any(search_string in embed_data['footer']['text'].lower() for search_string in search_strings)
-        and 'raidpoints' in embed_data['field0']['name']):
+    if (any(search_string in embed_data.footer.text_lower for search_string in search_strings)
+        and 'raidpoints' in embed_data.field(0).name):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if context.embed_user is not None:
+                user = context.embed_user
+                user_settings = context.embed_user_settings
             else:
-                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data['author']['name'])
+                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data.author.name)
                 user_name = user_name_match.group(1)
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_RAID, user_name=user_name)
@@ -193,28 +160,21 @@ async def call_raid_helper(bot: discord.Bot, message: discord.Message, embed_dat
                 user = user_command_message.author
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
         if user_settings.reminder_energy.enabled:
             try:
-                energy_match = re.search (r'-(\d+) <', embed_data['description'].lower())
+                energy_match = re.search (r'-(\d+) <', embed_data.description_lower)
                 energy_lost = int(energy_match.group(1))
                 await functions.change_user_energy(user_settings, energy_lost * -1)
                 if user_settings.reactions_enabled: add_reaction = True
             except:
                 pass
+        await router.release_side_effects()
         if not user_settings.helper_raid_enabled: return add_reaction
 
-        def raid_message_check(payload: discord.RawMessageUpdateEvent):
-            try:
-                author_name = payload.data['embeds'][0]['author']['name']
-                components = payload.data['components']
-                return author_name == message.embeds[0].author.name # Temporary workaround for that weird issue
-            except:
-                return False
-        
         embed = discord.Embed(color=settings.EMBED_COLOR)
         msg_error_workers_outdated = (
                 f'Sorry, I can\'t provide any guidance because I don\'t know all of your workers. Please use '
@@ -238,7 +198,7 @@ async def call_raid_helper(bot: discord.Bot, message: discord.Message, embed_dat
         workers_found = []
         for row in message.components:
             for button in row.children:
-                worker_name_match = re.search(r'^(.+?)worker', button.emoji.name.lower())
+                worker_name_match = re.search(regex.WORKER_TYPE_FROM_EMOJI_NAME, button.emoji.name.lower())
                 if worker_name_match.group(1) not in worker_levels_sorted:
                     await message.reply(msg_error_workers_outdated)
                     return add_reaction
@@ -248,18 +208,8 @@ async def call_raid_helper(bot: discord.Bot, message: discord.Message, embed_dat
                 del worker_levels_sorted[worker_name]
         workers_power = {}
         for worker_name, worker_level in worker_levels_sorted.items():
-            worker_power = (
-                ((strings.WORKER_STATS[worker_name]['speed'] + strings.WORKER_STATS[worker_name]['strength']
-                  + strings.WORKER_STATS[worker_name]['intelligence']))
-                * (1 + (strings.WORKER_STATS[worker_name]['tier']) / 2.5) * (1 + worker_level / 1.25)
-            )
-            workers_power[worker_name] = worker_power
+            workers_power[worker_name] = await workerstats.get_worker_power(worker_name, worker_level)
         workers_power = dict(sorted(workers_power.items(), key=lambda x:x[1]))
-        workers_power_copy = copy.deepcopy(workers_power)
-        if len(workers_power) > 6:
-            workers_power = {}
-            for worker_name in list(workers_power_copy.keys())[-6:]:
-                workers_power[worker_name] = workers_power_copy[worker_name]
         field_workers = ''
         if not user_settings.helper_raid_compact_mode_enabled:
             for worker_name, worker_power in workers_power.items():
@@ -314,6 +264,8 @@ async def call_raid_helper(bot: discord.Bot, message: discord.Message, embed_dat
             value = f'{field_solution.strip()}\n_You can kill {killed_enemies}._',
             inline = False
         )
+        edit_subscription = await edits.subscribe(message.id)
+        if edit_subscription is None: return add_reaction
         message_helper = await message.reply(embed=embed)
         logs.logger.info(
             f'--- Raid guide log ---\n'
@@ -326,8 +278,7 @@ async def call_raid_helper(bot: discord.Bot, message: discord.Message, embed_dat
 
         while True:
             try:
-                payload = await bot.wait_for('raw_message_edit', check=raid_message_check,
-                                             timeout=settings.INTERACTION_TIMEOUT)
+                payload = await edit_subscription.wait_for_edit()
             except TimeoutError:
                 embed.remove_field(0)
                 embed.insert_field_at(
@@ -345,7 +296,8 @@ async def call_raid_helper(bot: discord.Bot, message: discord.Message, embed_dat
                 for component in row['components']:
                     disabled = component.get('disabled', False)
                     if disabled:
-                        worker_name_match = re.search(r'^(.+?)worker', component['emoji']['name'].lower())
+                        worker_name_match = re.search(regex.WORKER_TYPE_FROM_EMOJI_NAME,
+                                                      component['emoji']['name'].lower())
                         disabled_workers.append(worker_name_match.group(1))
                     else:
                         active_component = True
@@ -399,10 +351,11 @@ async def call_raid_helper(bot: discord.Bot, message: discord.Message, embed_dat
                 )
             await message_helper.edit(embed=embed)
             if not active_component: break
+        await edits.unsubscribe(edit_subscription)
 
 
-async def track_raid(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                     user_settings: Optional[users.User]) -> bool:
+async def track_raid(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                     user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Tracks raids and updates energy loss
 
     Returns
@@ -418,19 +371,12 @@ async def track_raid(message: discord.Message, embed_data: Dict, user: Optional[
         '🔱',
         ':trident:',
     ]
-    field_values = (
-        f"{embed_data['field0']['value']}\n"
-        f"{embed_data['field1']['value']}\n"
-        f"{embed_data['field2']['value']}\n"
-        f"{embed_data['field3']['value']}\n"
-        f"{embed_data['field4']['value']}\n"
-        f"{embed_data['field5']['value']}"
-    )
-    if (any(search_string in embed_data['description'].lower() for search_string in search_strings)
+    field_values = '\n'.join(field.value for field in embed_data.fields)
+    if (any(search_string in embed_data.description_lower for search_string in search_strings)
         and all(search_string not in field_values.lower() for search_string in search_strings_excluded)):
         user_name_amount_match = None
         for line in field_values.split('\n'):
-            user_name_amount_match = re.search(r'^\*\*(.+?)\*\*: (.+?) <:', line)
+            user_name_amount_match = re.search(regex.RAID_USER_NAME_AMOUNT, line)
             if user_name_amount_match: break
         user_name, amount = user_name_amount_match.groups()
         if user is None:
@@ -440,7 +386,7 @@ async def track_raid(message: discord.Message, embed_data: Dict, user: Optional[
             user = user_command_message.author
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return False
         if not user_settings.tracking_enabled or not user_settings.bot_enabled: return add_reaction
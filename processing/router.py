@@ -0,0 +1,263 @@
+# router.py
+"""Classifies IDLE FARM messages by the signatures the processors declare and decides which processors need to run.
+
+Every processor module can declare a tuple SIGNATURES with the message parts it reacts to. A message is routed to a
+processor if at least one of its signatures matches. The processors still do their own detailed checks, so signatures
+only need to be a cheap superset of what a processor handles.
+Processors that don't declare any signatures are always dispatched (fallback route).
+
+Processors can also declare:
+- SIDE_EFFECTS: Classes of data the processor changes (see SIDE_EFFECT_*). Processors that share a side effect class
+run one after another in pipeline order, all others run concurrently. A processor that waits for user interaction after
+its last write calls release_side_effects before waiting, so the processors after it don't have to wait as well.
+- TIMEOUT: Time in seconds after which the router stops waiting for the processor. None if the processor waits for
+user interaction. Defaults to DEFAULT_PROCESSOR_TIMEOUT. Processors are never cancelled, so a timeout can't interrupt
+a write.
+
+All keywords of all routes are compiled into one regex per message part, so every message part is only scanned once,
+regardless of how many processors are registered.
+"""
+
+import asyncio
+from contextvars import ContextVar
+from functools import partial
+import re
+from types import ModuleType
+from typing import Any, Callable, Coroutine, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from processing import parsing
+from resources import logs
+
+
+MESSAGE_PARTS = (
+    'author',
+    'content',
+    'description',
+    'field0_name',
+    'field0_value',
+    'footer',
+    'title',
+)
+
+ROUTE_UNMATCHED = 'unmatched'
+
+DEFAULT_PROCESSOR_TIMEOUT = 30 # Seconds
+
+SIDE_EFFECT_CLAN = 'clan' # Clan settings, clan members and clan reminders
+SIDE_EFFECT_ENERGY = 'energy' # Energy of a user, the energy reminder and everything the energy regen time depends on
+SIDE_EFFECT_REMINDERS = 'reminders' # User reminders, except the energy reminder
+SIDE_EFFECT_USER = 'user' # User settings, except energy
+SIDE_EFFECT_WORKERS = 'workers' # User workers and worker levels
+
+
+class Signature(NamedTuple):
+    """Matches if any of the keywords is found in the lowercased message part.
+    Message part has to be one of MESSAGE_PARTS."""
+    part: str
+    keywords: Tuple[str, ...]
+
+
+class Route(NamedTuple):
+    """Dispatch settings of a processor"""
+    signatures: Optional[Tuple[Signature, ...]]
+    side_effects: Tuple[str, ...]
+    timeout: Optional[float]
+
+
+_UNREGISTERED_ROUTE = Route(None, (), DEFAULT_PROCESSOR_TIMEOUT) # Routes removed while a message was processed
+_ROUTES: Dict[str, Route] = {}
+_MATCHERS: Dict[str, Tuple[re.Pattern, Dict[str, Set[str]]]] = {}
+route_counters: Dict[str, int] = {}
+timeout_counters: Dict[str, int] = {}
+_side_effects_released: ContextVar[Optional[asyncio.Event]] = ContextVar('side_effects_released', default=None)
+
+
+# Routes
+def register_route(route_name: str, signatures: Optional[Tuple[Signature, ...]], side_effects: Tuple[str, ...] = (),
+                   timeout: Optional[float] = DEFAULT_PROCESSOR_TIMEOUT) -> None:
+    """Registers a processor route. If signatures is None, the route is a fallback route and always matches.
+
+    Raises
+    ------
+    ValueError if a signature uses an unknown message part.
+    """
+    if signatures is not None:
+        for signature in signatures:
+            if signature.part not in MESSAGE_PARTS:
+                raise ValueError(f'Unknown message part "{signature.part}" in signature of route "{route_name}".')
+    _ROUTES[route_name] = Route(signatures, tuple(side_effects), timeout)
+    route_counters.setdefault(route_name, 0)
+    _MATCHERS.clear()
+
+
+def register_processor(processor: ModuleType) -> str:
+    """Registers the route of a processor module with the SIGNATURES, SIDE_EFFECTS and TIMEOUT it declares.
+    The route is named after the module.
+
+    Returns
+    -------
+    The route name: str
+    """
+    route_name = processor.__name__.split('.')[-1]
+    register_route(
+        route_name,
+        getattr(processor, 'SIGNATURES', None),
+        getattr(processor, 'SIDE_EFFECTS', ()),
+        getattr(processor, 'TIMEOUT', DEFAULT_PROCESSOR_TIMEOUT),
+    )
+    return route_name
+
+
+def unregister_route(route_name: str) -> None:
+    """Removes a route. Does nothing if the route isn't registered. Counters are kept."""
+    if _ROUTES.pop(route_name, None) is not None: _MATCHERS.clear()
+
+
+def get_route_names() -> Tuple[str, ...]:
+    """Returns the names of all registered routes"""
+    return tuple(_ROUTES.keys())
+
+
+def clear_routes() -> None:
+    """Removes all registered routes. Counters are kept."""
+    _ROUTES.clear()
+    _MATCHERS.clear()
+
+
+def _compile_matchers() -> None:
+    """Compiles the keywords of all routes into one pattern per message part.
+
+    The pattern is a lookahead alternation, so it reports a match at every position a keyword starts. Keywords are
+    sorted longest first. If a keyword is contained in a longer one, the longer keyword wins at that position, so
+    every keyword also carries the routes of all keywords contained in it. This way no matching route is lost.
+    """
+    _MATCHERS.clear()
+    for message_part in MESSAGE_PARTS:
+        keyword_routes: Dict[str, Set[str]] = {}
+        for route_name, route in _ROUTES.items():
+            if route.signatures is None: continue
+            for signature in route.signatures:
+                if signature.part != message_part: continue
+                for keyword in signature.keywords:
+                    keyword_routes.setdefault(keyword.lower(), set()).add(route_name)
+        if not keyword_routes: continue
+        keywords = sorted(keyword_routes.keys(), key=len, reverse=True)
+        keyword_routes_merged = {}
+        for keyword in keywords:
+            keyword_routes_merged[keyword] = set()
+            for contained_keyword, route_names in keyword_routes.items():
+                if contained_keyword in keyword:
+                    keyword_routes_merged[keyword].update(route_names)
+        pattern = re.compile(f'(?=({"|".join(re.escape(keyword) for keyword in keywords)}))')
+        _MATCHERS[message_part] = (pattern, keyword_routes_merged)
+
+
+# Classification
+async def get_message_parts(embed_data: parsing.EmbedData) -> Dict[str, str]:
+    """Returns all message parts signatures can match against, lowercased."""
+    return {
+        'author': embed_data.author.name_lower,
+        'content': embed_data.content_lower,
+        'description': embed_data.description_lower,
+        'field0_name': embed_data.field(0).name_lower,
+        'field0_value': embed_data.field(0).value_lower,
+        'footer': embed_data.footer.text_lower,
+        'title': embed_data.title_lower,
+    }
+
+
+async def get_routes(embed_data: parsing.EmbedData) -> Set[str]:
+    """Classifies the message once and returns the names of all routes it has to be dispatched to.
+    Also updates the route counters.
+
+    Returns
+    -------
+    Set with the route names. Contains all fallback routes, even if no signature matched.
+    """
+    if not _MATCHERS: _compile_matchers()
+    message_parts = await get_message_parts(embed_data)
+    routes = set()
+    for part_name, (pattern, keyword_routes) in _MATCHERS.items():
+        message_part = message_parts[part_name]
+        if not message_part: continue
+        for match in pattern.finditer(message_part):
+            routes.update(keyword_routes[match.group(1)])
+    if not routes:
+        route_counters[ROUTE_UNMATCHED] = route_counters.get(ROUTE_UNMATCHED, 0) + 1
+    for route_name, route in _ROUTES.items():
+        if route.signatures is None: routes.add(route_name)
+    for route_name in routes:
+        route_counters[route_name] += 1
+    return routes
+
+
+# Dispatching
+async def release_side_effects() -> None:
+    """Lets the processors that share a side effect class with the running processor start.
+    Processors call this after their last write if they go on to wait for user interaction. They must not write
+    anything afterwards. Does nothing if called outside of run_processors.
+    """
+    side_effects_released = _side_effects_released.get()
+    if side_effects_released is not None: side_effects_released.set()
+
+
+def _log_late_processor_error(route_name: str, processor_task: asyncio.Task) -> None:
+    """Logs the exception of a processor that finished after it timed out"""
+    if processor_task.cancelled() or processor_task.exception() is None: return
+    logs.logger.error(f'Processor "{route_name}" failed after it timed out: {processor_task.exception()!r}')
+
+
+async def _run_processor(route_name: str, process_function: Callable[..., Coroutine], arguments: Tuple,
+                         predecessors: List[asyncio.Event], side_effects_released: asyncio.Event,
+                         timeout: Optional[float]) -> Any:
+    """Waits until all predecessors released their side effects, then creates and runs the processor coroutine.
+    The processor is shielded from the timeout of its route. If it times out, it keeps running and keeps its side
+    effects until it releases them or finishes.
+
+    Returns
+    -------
+    The return value of the processor. False if the processor timed out.
+    """
+    for predecessor in predecessors:
+        await predecessor.wait()
+    _side_effects_released.set(side_effects_released)
+    processor_task = asyncio.create_task(process_function(*arguments))
+    processor_task.add_done_callback(lambda task: side_effects_released.set())
+    try:
+        return await asyncio.wait_for(asyncio.shield(processor_task), timeout)
+    except asyncio.TimeoutError:
+        timeout_counters[route_name] = timeout_counters.get(route_name, 0) + 1
+        logs.logger.warning(f'Processor "{route_name}" timed out after {timeout} seconds.')
+        processor_task.add_done_callback(partial(_log_late_processor_error, route_name))
+        return False
+
+
+async def run_processors(processors: List[Tuple[str, Callable[..., Coroutine], Tuple]]) -> List[Any]:
+    """Runs processors concurrently while respecting the side effect classes of their routes.
+    Every processor is passed as (route name, process function, arguments). The coroutines are only created once the
+    processors start. The list has to be in pipeline order.
+
+    Returns
+    -------
+    List with the return values of all processors in the same order. If a processor raised an exception, the exception
+    is returned in its place.
+    """
+    tasks: List[asyncio.Task] = []
+    last_releases_by_side_effect: Dict[str, asyncio.Event] = {}
+    for route_name, process_function, arguments in processors:
+        route = _ROUTES.get(route_name, _UNREGISTERED_ROUTE)
+        predecessors = []
+        for side_effect in route.side_effects:
+            last_release = last_releases_by_side_effect.get(side_effect, None)
+            if last_release is not None and last_release not in predecessors: predecessors.append(last_release)
+        side_effects_released = asyncio.Event()
+        for side_effect in route.side_effects:
+            last_releases_by_side_effect[side_effect] = side_effects_released
+        tasks.append(
+            asyncio.create_task(
+                _run_processor(route_name, process_function, arguments, predecessors, side_effects_released,
+                               route.timeout)
+            )
+        )
+    if not tasks: return []
+    return await asyncio.gather(*tasks, return_exceptions=True)
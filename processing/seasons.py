@@ -0,0 +1,149 @@
+# seasons.py
+"""Contains the seasonal event calendar.
+
+Seasonal processors are only registered in the router while their event is live, so they don't cost anything for the
+rest of the year. The calendar also sets settings.ENERGY_REGEN_MULTIPLIER_EVENT.
+Event dates are stored in the table "settings" and can be changed with /dev event-calendar.
+
+As long as no event was ever configured, all seasonal processors stay registered and the energy regen multiplier
+stays at settings.ENERGY_REGEN_MULTIPLIER_EVENT_FALLBACK, as before the calendar existed.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from types import ModuleType
+from typing import Dict, Optional, Tuple
+
+from discord import utils
+
+from database import settings as settings_db
+from processing import halloween, router, xmas
+from resources import exceptions, settings
+
+
+EVENT_NAMES = (
+    'christmas',
+    'halloween',
+)
+
+SEASONAL_PROCESSORS: Dict[ModuleType, str] = {
+    halloween: 'halloween',
+    xmas: 'christmas',
+}
+
+
+@dataclass()
+class SeasonalEvent():
+    """Object that represents a seasonal event. start_time and end_time are None if the event is not scheduled."""
+    name: str
+    start_time: Optional[datetime]
+    end_time: Optional[datetime]
+    energy_regen_multiplier: float
+
+    def is_live(self, current_time: Optional[datetime] = None) -> bool:
+        """Checks if the event is live at the given time. Defaults to now."""
+        if self.start_time is None or self.end_time is None: return False
+        if current_time is None: current_time = utils.utcnow()
+        return self.start_time <= current_time < self.end_time
+
+
+_EVENTS: Dict[str, SeasonalEvent] = {
+    event_name: SeasonalEvent(event_name, None, None, 1.0) for event_name in EVENT_NAMES
+}
+_calendar_configured = False # True once any event has a record in the table "settings"
+
+
+# Calendar
+async def load_events() -> Tuple[SeasonalEvent, ...]:
+    """Loads the event calendar from the table "settings" and applies it.
+
+    Returns
+    -------
+    Tuple with all events
+    """
+    global _calendar_configured
+    try:
+        all_settings = await settings_db.get_settings()
+    except exceptions.NoDataFoundError:
+        all_settings = {}
+    _calendar_configured = any(f'event_{event_name}_start' in all_settings for event_name in EVENT_NAMES)
+    for event_name in EVENT_NAMES:
+        start_time = all_settings.get(f'event_{event_name}_start', '')
+        end_time = all_settings.get(f'event_{event_name}_end', '')
+        energy_regen_multiplier = all_settings.get(f'event_{event_name}_energy_regen_multiplier', '')
+        _EVENTS[event_name] = SeasonalEvent(
+            event_name,
+            datetime.fromisoformat(start_time) if start_time else None,
+            datetime.fromisoformat(end_time) if end_time else None,
+            float(energy_regen_multiplier) if energy_regen_multiplier else 1.0,
+        )
+    await apply_events()
+    return tuple(_EVENTS.values())
+
+
+async def get_events() -> Tuple[SeasonalEvent, ...]:
+    """Returns all events of the calendar"""
+    return tuple(_EVENTS.values())
+
+
+async def update_event(event_name: str, start_time: Optional[datetime], end_time: Optional[datetime],
+                       energy_regen_multiplier: float) -> SeasonalEvent:
+    """Changes the dates and the energy regen multiplier of an event, stores them in the table "settings" and applies
+    the calendar.
+
+    Returns
+    -------
+    The updated event
+
+    Raises
+    ------
+    ValueError if the event doesn't exist or the end time is not after the start time.
+    sqlite3.Error if something happened within the database.
+    """
+    global _calendar_configured
+    if event_name not in _EVENTS: raise ValueError(f'Unknown event "{event_name}".')
+    if start_time is not None and end_time is not None and end_time <= start_time:
+        raise ValueError('The end time has to be after the start time.')
+    await settings_db.update_setting(f'event_{event_name}_start',
+                                     start_time.isoformat() if start_time is not None else '')
+    await settings_db.update_setting(f'event_{event_name}_end', end_time.isoformat() if end_time is not None else '')
+    await settings_db.update_setting(f'event_{event_name}_energy_regen_multiplier', str(energy_regen_multiplier))
+    _EVENTS[event_name] = SeasonalEvent(event_name, start_time, end_time, energy_regen_multiplier)
+    _calendar_configured = True
+    await apply_events()
+    return _EVENTS[event_name]
+
+
+# Applying
+async def is_calendar_configured() -> bool:
+    """Checks if any event was ever configured. If not, the fallback behaviour is used."""
+    return _calendar_configured
+
+
+def is_processor_live(processor: ModuleType) -> bool:
+    """Checks if the event of a seasonal processor is live. Always True while the calendar isn't configured.
+    Also used while registering routes, so not async."""
+    if not _calendar_configured: return True
+    return _EVENTS[SEASONAL_PROCESSORS[processor]].is_live()
+
+
+async def apply_events() -> None:
+    """Registers the routes of seasonal processors whose event is live and removes all others.
+    Also sets settings.ENERGY_REGEN_MULTIPLIER_EVENT to the multiplier of all live events combined.
+    While the calendar isn't configured, all seasonal processors are registered and the fallback multiplier is used.
+    """
+    current_time = utils.utcnow()
+    route_names = router.get_route_names()
+    for processor, event_name in SEASONAL_PROCESSORS.items():
+        route_name = processor.__name__.split('.')[-1]
+        if not _calendar_configured or _EVENTS[event_name].is_live(current_time):
+            if route_name not in route_names: router.register_processor(processor)
+        else:
+            router.unregister_route(route_name)
+    if not _calendar_configured:
+        settings.ENERGY_REGEN_MULTIPLIER_EVENT = settings.ENERGY_REGEN_MULTIPLIER_EVENT_FALLBACK
+        return
+    energy_regen_multiplier = 1.0
+    for event in _EVENTS.values():
+        if event.is_live(current_time): energy_regen_multiplier *= event.energy_regen_multiplier
+    settings.ENERGY_REGEN_MULTIPLIER_EVENT = energy_regen_multiplier
@@ -3,18 +3,30 @@
 from datetime import timedelta
 import random
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 
 from cache import messages
 from database import reminders, users
+from processing import detection, parsing, router
 from resources import exceptions, functions, regex, strings
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+SIGNATURES = (
+    router.Signature('content', (
+        'maxed the purchases', #All languages
+    )),
+    router.Signature('description', (
+        'buy anything with `idle shop buy [item]`', #All languages
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_REMINDERS,)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Processes the message for all shop related actions.
 
     Returns
@@ -23,13 +35,13 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await create_reminder_from_buying(message, embed_data, user, user_settings))
-    return_values.append(await create_reminder_from_list(message, embed_data, user, user_settings))
+    return_values.append(await create_reminder_from_buying(message, embed_data, user, user_settings, context))
+    return_values.append(await create_reminder_from_list(message, embed_data, user, user_settings, context))
     return any(return_values)
 
 
-async def create_reminder_from_buying(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                                      user_settings: Optional[users.User]) -> bool:
+async def create_reminder_from_buying(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                                      user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Create a reminder when the user tries to buy an item that is out of stock.
     This only works with prefix command because I can't read the slash command option
 
@@ -42,11 +54,11 @@ async def create_reminder_from_buying(message: discord.Message, embed_data: Dict
     search_strings = [
         'maxed the purchases', #All languages
     ]
-    if any(search_string in message.content.lower() for search_string in search_strings):
+    if any(search_string in embed_data.content_lower for search_string in search_strings):
         if user is not None:
             if user_settings is None:
                 try:
-                    user_settings: users.User = await users.get_user(user.id)
+                    user_settings: users.User = await context.get_user(user.id)
                 except exceptions.FirstTimeUserError:
                     return add_reaction
             if not user_settings.reminder_shop.enabled:
@@ -60,13 +72,13 @@ async def create_reminder_from_buying(message: discord.Message, embed_data: Dict
         )
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.reminder_shop.enabled: return add_reaction
-        item_name_match = re.search(r'\bbuy\b\s+\b(.+?)$', user_command_message.content.lower())
+        item_name_match = re.search(regex.SHOP_ITEM_NAME_FROM_COMMAND, user_command_message.content.lower())
         item_name = re.sub(r'\d+', '', item_name_match.group(1))
-        timestring_match = re.search(r'🕓\s\*\*(.+?)\*\*\n', message.content.lower())
+        timestring_match = re.search(regex.SHOP_TIMESTRING, embed_data.content_lower)
         timestring = timestring_match.group(1)
         time_left = await functions.calculate_time_left_from_timestring(message, timestring)
         time_left += timedelta(seconds=random.randint(0, 600))
@@ -84,8 +96,8 @@ async def create_reminder_from_buying(message: discord.Message, embed_data: Dict
     return add_reaction
 
 
-async def create_reminder_from_list(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+async def create_reminder_from_list(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Create a reminder when an item in the shop is out of stock
 
     Returns
@@ -97,7 +109,7 @@ async def create_reminder_from_list(message: discord.Message, embed_data: Dict,
     search_strings = [
         'buy anything with `idle shop buy [item]`', #All languages
     ]
-    if (any(search_string in embed_data['description'].lower() for search_string in search_strings)
+    if (any(search_string in embed_data.description_lower for search_string in search_strings)
         and message.embeds):
         if user is None:
             user_command_message = (
@@ -106,7 +118,7 @@ async def create_reminder_from_list(message: discord.Message, embed_data: Dict,
             user = user_command_message.author
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.reminder_shop.enabled: return add_reaction
@@ -115,8 +127,7 @@ async def create_reminder_from_list(message: discord.Message, embed_data: Dict,
         midnight_today = utils.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
         midnight_tomorrow = midnight_today + timedelta(days=1)
         for field in message.embeds[0].fields:
-            shop_item_data_match = re.search(r'__\*\*(.+?)\*\*__.+`(\d+?)/(\d+?)`.+\*\*(.+?)\*\*', field.value.lower(),
-                                             re.DOTALL)
+            shop_item_data_match = re.search(regex.SHOP_ITEM_DATA, field.value.lower())
             if not shop_item_data_match: continue
             item_name = shop_item_data_match.group(1).strip()
             item_amount_bought = int(shop_item_data_match.group(2))
@@ -0,0 +1,270 @@
+# solver.py
+"""Contains the raid solver used by the raid helper and the teamraid planner used by the teamraid helper.
+
+Workers attack the enemy farms in order. Every worker attacks the first farm that is still alive and deals
+round(85 * worker power / farm power) damage to its HP. Damage that exceeds the HP of a farm is lost.
+Because of that, the order of the workers matters.
+
+The solver searches all worker orders with dynamic programming over the set of remaining workers and the state of the
+farm that is currently attacked. Since the farms are attacked in order, that state is all that is needed to describe
+all farms. With at most 9 raid worker types, there are at most 512 worker sets, so the search is exact and fast.
+
+Enemy farms are drawn from a small pool and raid messages are edited after every attack, so the same raids are solved
+over and over. Solutions are cached by the sorted worker powers and the enemy farms, independent of the user.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+_SOLUTION_CACHE_SIZE = 5000
+_SOLUTION_CACHE = OrderedDict()
+cache_hits = 0
+cache_misses = 0
+
+
+class RaidSolution(NamedTuple):
+    """Best solution of a raid. hp_left is the HP of the next farm if it was attacked but not killed, 100 otherwise."""
+    killed_enemies: int
+    hp_left: int
+    workers: Tuple[str, ...] # In attack order
+
+
+async def solve_raid(workers_power: Dict[str, float], enemies_power: Dict[str, Tuple[float, int]]) -> RaidSolution:
+    """Calculates the best order to use workers in a raid.
+    The best solution kills the most farms, then leaves the least HP on the next farm, then uses the fewest workers.
+    Workers are only used until all farms are killed.
+    If several orders are equally good, the one that uses stronger workers first is returned.
+    Solutions are cached, see module docstring.
+
+    Arguments
+    ---------
+    workers_power: Dict[worker_name: worker_power]
+    enemies_power: Dict[enemy_name: (enemy_power, enemy_hp)] in attack order
+
+    Returns
+    -------
+    RaidSolution
+    """
+    global cache_hits, cache_misses
+    worker_names = sorted(workers_power.keys(), key=lambda worker_name: workers_power[worker_name], reverse=True)
+    cache_key = (
+        tuple(workers_power[worker_name] for worker_name in worker_names),
+        tuple(enemies_power.values()),
+    )
+    cached_solution = _SOLUTION_CACHE.get(cache_key, None)
+    if cached_solution is not None:
+        cache_hits += 1
+        _SOLUTION_CACHE.move_to_end(cache_key)
+        killed_enemies, hp_left, order = cached_solution
+        return RaidSolution(killed_enemies, hp_left, tuple(worker_names[worker_index] for worker_index in order))
+    cache_misses += 1
+    enemies = [enemy_power_hp for enemy_power_hp in enemies_power.values() if enemy_power_hp[1] > 0]
+    enemies_killed_start = len(enemies_power) - len(enemies)
+    damage: List[List[int]] = [
+        [round(85 * workers_power[worker_name] / enemy_power) for enemy_power, _ in enemies]
+        for worker_name in worker_names
+    ]
+    memo: Dict[Tuple[int, int, int], Tuple[Tuple[int, int, int], Tuple[int, ...]]] = {}
+
+    def search(remaining_workers: int, enemy_index: int, enemy_hp: int) -> Tuple[Tuple[int, int, int], Tuple[int, ...]]:
+        """Returns the best score (-killed_enemies, hp_left, workers_used) and worker order from this state"""
+        if enemy_index == len(enemies):
+            return ((-len(enemies_power), 100, 0), ())
+        if remaining_workers == 0:
+            hp_left = enemy_hp if enemy_hp < enemies[enemy_index][1] else 100
+            return ((-(enemies_killed_start + enemy_index), hp_left, 0), ())
+        state = (remaining_workers, enemy_index, enemy_hp)
+        result = memo.get(state, None)
+        if result is not None: return result
+        best_score = best_order = None
+        # Every farm that is still alive needs at least one worker, so nothing beats this score
+        perfect_score = (-len(enemies_power), 100, len(enemies) - enemy_index)
+        powers_tried = set()
+        for worker_index, worker_name in enumerate(worker_names):
+            if not remaining_workers & (1 << worker_index): continue
+            # Workers with the same power are interchangeable
+            if workers_power[worker_name] in powers_tried: continue
+            powers_tried.add(workers_power[worker_name])
+            hp_remaining = enemy_hp - damage[worker_index][enemy_index]
+            if hp_remaining <= 0:
+                next_index = enemy_index + 1
+                next_hp = enemies[next_index][1] if next_index < len(enemies) else 0
+            else:
+                next_index, next_hp = enemy_index, hp_remaining
+            score, order = search(remaining_workers & ~(1 << worker_index), next_index, next_hp)
+            score = (score[0], score[1], score[2] + 1)
+            if best_score is None or score < best_score:
+                best_score, best_order = score, (worker_index,) + order
+                if best_score == perfect_score: break
+        memo[state] = (best_score, best_order)
+        return memo[state]
+
+    start_hp = enemies[0][1] if enemies else 0
+    (killed_enemies, hp_left, _), order = search((1 << len(worker_names)) - 1, 0, start_hp)
+    _SOLUTION_CACHE[cache_key] = (-killed_enemies, hp_left, order)
+    if len(_SOLUTION_CACHE) > _SOLUTION_CACHE_SIZE:
+        _SOLUTION_CACHE.popitem(last=False)
+    return RaidSolution(-killed_enemies, hp_left, tuple(worker_names[worker_index] for worker_index in order))
+
+
+# Teamraids
+class TeamraidWorker(NamedTuple):
+    """Worker of a teamraid participant"""
+    user_name: str
+    worker_type: str
+    power: float
+
+
+class TeamraidPlanner():
+    """Plans the order in which all workers of all teamraid participants should attack.
+
+    In teamraids, workers deal round(100 * worker power / farm power) damage and farms are attacked in order.
+    The planner assigns the workers to the farms so the most farms are killed, then the least HP is left on the next
+    farm, then the least damage is wasted on overkill. For every farm, only worker sets that need their strongest
+    worker to kill the farm are tried, cheapest first, and workers with the same power are treated as one.
+
+    Results are memoized by the remaining worker powers and farms. Create one planner per teamraid and call get_plan
+    again after every attack: states on the planned path are already solved, so updates are instant. If the plan is
+    not followed, only the new part of the state space is searched.
+    If a search takes more than MAX_NODES steps, the best plan found so far is returned.
+    """
+    MAX_NODES = 20000
+    __slots__ = ('_enemies', '_memo', '_nodes', '_plan', '_workers')
+
+    def __init__(self) -> None:
+        self._enemies: Tuple[Tuple[float, int], ...] = ()
+        self._memo: Dict[Tuple[Tuple[float, ...], Tuple[Tuple[float, int], ...]],
+                         Tuple[Tuple[int, int, int], Tuple[float, ...]]] = {}
+        self._nodes = 0
+        self._plan: Tuple[TeamraidWorker, ...] = ()
+        self._workers: Tuple[TeamraidWorker, ...] = ()
+
+    def _get_max_kills(self, powers: Tuple[float, ...], enemies: Tuple[Tuple[float, int], ...]) -> int:
+        """Returns an upper bound of the farms the workers can kill.
+        A worker deals at most 100 * power / farm power + 0.5 damage, so the next farms can only be killed if their HP
+        is covered by the total power against the weakest of them."""
+        total_power = sum(powers)
+        rounding_bonus = 0.5 * len(powers)
+        hp_needed = 0
+        weakest_enemy_power = None
+        for enemy_count, (enemy_power, enemy_hp) in enumerate(enemies):
+            hp_needed += enemy_hp
+            if weakest_enemy_power is None or enemy_power < weakest_enemy_power: weakest_enemy_power = enemy_power
+            if hp_needed > 100 * total_power / weakest_enemy_power + rounding_bonus: return enemy_count
+        return len(enemies)
+
+    def _search(self, powers: Tuple[float, ...],
+                enemies: Tuple[Tuple[float, int], ...]) -> Tuple[Tuple[int, int, int], Tuple[float, ...]]:
+        """Returns the best score (-killed_enemies, hp_left, wasted_damage) and the worker powers in attack order.
+        powers has to be sorted descending, enemies only contains farms that are alive, the next one first."""
+        if not enemies: return ((0, 0, 0), ())
+        enemy_power, enemy_hp = enemies[0]
+        damages = [round(100 * power / enemy_power) for power in powers]
+        if sum(damages) < enemy_hp:
+            return ((0, enemy_hp - sum(damages), 0), tuple(reversed(powers)))
+        state = (powers, enemies)
+        result = self._memo.get(state, None)
+        if result is not None: return result
+        self._nodes += 1
+        kill_sets = []
+
+        def find_kill_sets(start_index: int, chosen: List[int], chosen_damage: int) -> None:
+            """Collects all sets of worker indices whose damage kills the farm but not without their strongest
+            worker. Workers are sorted by power, so the first chosen worker is the strongest."""
+            for index in range(start_index, len(powers)):
+                if self._nodes > self.MAX_NODES: return
+                # Workers with the same power are interchangeable
+                if index > start_index and powers[index] == powers[index - 1]: continue
+                self._nodes += 1
+                damage = chosen_damage + damages[index]
+                if chosen and damage - damages[chosen[0]] >= enemy_hp: continue
+                if damage >= enemy_hp:
+                    kill_sets.append((damage - enemy_hp, chosen + [index]))
+                else:
+                    find_kill_sets(index + 1, chosen + [index], damage)
+
+        find_kill_sets(0, [], 0)
+        if not kill_sets:
+            # Search limit reached, fall back to the strongest workers
+            chosen, chosen_damage = [], 0
+            for index, damage in enumerate(damages):
+                chosen.append(index)
+                chosen_damage += damage
+                if chosen_damage >= enemy_hp: break
+            kill_sets.append((chosen_damage - enemy_hp, chosen))
+        kill_sets.sort(key=lambda kill_set: kill_set[0])
+        best_score = best_order = None
+        for wasted_damage, kill_set in kill_sets:
+            if best_score is not None and self._nodes > self.MAX_NODES: break
+            remaining_powers = tuple(power for index, power in enumerate(powers) if index not in kill_set)
+            if best_score is not None and -1 - self._get_max_kills(remaining_powers, enemies[1:]) > best_score[0]:
+                continue
+            score, order = self._search(remaining_powers, enemies[1:])
+            score = (score[0] - 1, score[1], score[2] + wasted_damage)
+            if best_score is None or score < best_score:
+                # The strongest worker of the set attacks last
+                best_score = score
+                best_order = tuple(powers[index] for index in reversed(kill_set)) + order
+            if best_score == (-len(enemies), 0, 0): break
+        if self._nodes <= self.MAX_NODES: self._memo[state] = (best_score, best_order)
+        return (best_score, best_order)
+
+    async def get_plan(self, teamraid_workers: List[TeamraidWorker],
+                       enemies_power: List[Tuple[float, int]]) -> Tuple[TeamraidWorker, ...]:
+        """Returns the order in which the workers should attack.
+
+        Arguments
+        ---------
+        teamraid_workers: All workers that didn't attack yet
+        enemies_power: List[(enemy_power, enemy_hp)] of all farms in attack order. Killed farms are ignored.
+
+        Returns
+        -------
+        Tuple with the workers in attack order. Empty if there are no workers or no farms left.
+        """
+        enemies = tuple(enemy_power_hp for enemy_power_hp in enemies_power if enemy_power_hp[1] > 0)
+        remaining_plan = self._get_remaining_plan(teamraid_workers, enemies)
+        if remaining_plan is not None: return remaining_plan
+        self._nodes = 0
+        powers = tuple(sorted((teamraid_worker.power for teamraid_worker in teamraid_workers), reverse=True))
+        _, order = self._search(powers, enemies)
+        remaining_workers = list(teamraid_workers)
+        plan = []
+        for power in order:
+            for teamraid_worker in remaining_workers:
+                if teamraid_worker.power == power:
+                    plan.append(teamraid_worker)
+                    remaining_workers.remove(teamraid_worker)
+                    break
+        self._enemies = enemies
+        self._plan = tuple(plan)
+        self._workers = tuple(teamraid_workers)
+        return self._plan
+
+    def _get_remaining_plan(self, teamraid_workers: List[TeamraidWorker],
+                            enemies: Tuple[Tuple[float, int], ...]) -> Optional[Tuple[TeamraidWorker, ...]]:
+        """Checks if the last plan was followed so far and returns the rest of it.
+        Workers of the same farm can attack in any order, so only the resulting farm state is compared.
+
+        Returns
+        -------
+        Tuple with the remaining workers of the plan. None if the plan wasn't followed.
+        """
+        if not self._plan: return None
+        if any(teamraid_worker not in self._workers for teamraid_worker in teamraid_workers): return None
+        used_workers = [teamraid_worker for teamraid_worker in self._workers if teamraid_worker not in teamraid_workers]
+        remaining_plan = tuple(teamraid_worker for teamraid_worker in self._plan
+                               if teamraid_worker in teamraid_workers)
+        if not remaining_plan: return None
+        expected_enemies = list(self._enemies)
+        for teamraid_worker in self._plan[:len(used_workers)]:
+            if teamraid_worker not in used_workers or not expected_enemies: return None
+            enemy_power, enemy_hp = expected_enemies[0]
+            enemy_hp -= round(100 * teamraid_worker.power / enemy_power)
+            if enemy_hp <= 0:
+                del expected_enemies[0]
+            else:
+                expected_enemies[0] = (enemy_power, enemy_hp)
+        if tuple(expected_enemies) != enemies: return None
+        return remaining_plan
@@ -3,21 +3,34 @@
 
 import copy
 from datetime import timedelta
-from itertools import combinations
 import random
 import re
-from typing import Dict, Optional, Union
+from typing import Dict, Optional, Tuple, Union
 
 import discord
 from discord import utils
 
-from cache import messages
+from cache import edits, messages
 from database import clans, reminders, users, workers
-from resources import emojis, exceptions, functions, logs, regex, settings, strings
+from processing import detection, parsing, router, solver
+from resources import emojis, exceptions, functions, logs, regex, settings, strings, workerstats
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User], clan_settings: Optional[clans.Clan]) -> bool:
+SIGNATURES = (
+    router.Signature('footer', (
+        'farms will be raided in order', #English
+    )),
+    router.Signature('description', (
+        'estimated raid worth', #English
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_CLAN, router.SIDE_EFFECT_ENERGY)
+TIMEOUT = None # Waits for user interaction
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], clan_settings: Optional[clans.Clan],
+                          context: detection.DetectionContext) -> bool:
     """Processes the message for all tracking related actions.
 
     Returns
@@ -26,13 +39,14 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await call_teamraid_helper(bot, message, embed_data, user, user_settings, clan_settings))
     return_values.append(await create_clan_reminder(message, embed_data, clan_settings))
+    return_values.append(await call_teamraid_helper(bot, message, embed_data, user, user_settings, clan_settings, context))
     return any(return_values)
 
 
-async def call_teamraid_helper(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                               user_settings: Optional[users.User], clan_settings: Optional[clans.Clan]) -> bool:
+async def call_teamraid_helper(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                               user_settings: Optional[users.User], clan_settings: Optional[clans.Clan],
+                               context: detection.DetectionContext) -> bool:
     """Calls the teamraid helper
 
     Returns
@@ -61,99 +75,49 @@ async def call_teamraid_helper(bot: discord.Bot, message: discord.Message, embed
         for field_index, field in enumerate(fields):
             if not 'farm' in field['name'].lower() and field['name'] != '': continue
             for line in field['value'].split('\n'):
-                enemy_data_match = re.search(r'<a:(.+?)worker.+lv(\d+) \|.+`(\d+)/(\d+)`', line.lower())
+                enemy_data_match = re.search(regex.RAID_ENEMY_FARM, line.lower())
                 if not enemy_data_match and 'none' in line.lower(): continue
                 enemy_type = enemy_data_match.group(1)
                 enemy_level = int(re.sub('\D','',enemy_data_match.group(2)))
                 enemy_hp_current = int(enemy_data_match.group(3))
                 enemy_hp_max = int(enemy_data_match.group(4))
-                enemy_power = (
-                    (strings.WORKER_STATS[enemy_type]['speed'] + strings.WORKER_STATS[enemy_type]['strength']
-                    + strings.WORKER_STATS[enemy_type]['intelligence'])
-                    * (1 + (strings.WORKER_STATS[enemy_type]['tier']) / 2.5) * (1 + enemy_level / 1.25)
-                )
+                enemy_power = await workerstats.get_enemy_power(enemy_type, enemy_level)
                 enemies_power[f'{enemy_type}{field_index}'] = (enemy_power, enemy_hp_current)
         return enemies_power
 
-    async def get_recommended_worker(next_enemy_power_hp: (int, int),
+    async def get_recommended_worker(enemies_power: Dict[str, Tuple[float, int]],
                                      workers_still_alive: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
-        """Returns the next recommended worker.
+        """Returns the next recommended worker. Uses the plan of teamraid_planner, which is updated from the current
+        state on every call.
 
         Returns
         -------
-        Dict with the next recommended worker (Dict[user_name: Dict[enemy_name: enemy_power]])
+        Dict with the next recommended worker (Dict[user_name: Dict[worker_type: worker_power]]). Empty if there is
+        no worker left.
         """
-        recommended_worker = {}
-        next_enemy_power, next_enemy_hp = next_enemy_power_hp
-        if len(list(workers_still_alive.keys())) == 1:
-            teamraid_user = list(workers_still_alive.keys())[0]
-            if len(list(workers_still_alive[teamraid_user].keys())) == 1:
-                return workers_still_alive
-        for teamraid_user, worker_data in workers_still_alive.items():
-            for worker_type, worker_power in worker_data.items():
-                worker_damage = round(100 * worker_power / next_enemy_power)
-                hp_remaining = next_enemy_hp - worker_damage
-                if hp_remaining <= 0:
-                    if not recommended_worker:
-                        recommended_worker[teamraid_user] = {}
-                        recommended_worker[teamraid_user][worker_type] = worker_power
-                        continue
-                    recommended_worker_user = list(recommended_worker.keys())[0]
-                    recommended_worker_type = list(recommended_worker[recommended_worker_user].keys())[0]
-                    recommended_worker_power = recommended_worker[recommended_worker_user][recommended_worker_type]
-                    if worker_power < recommended_worker_power:
-                        recommended_worker = {}
-                        recommended_worker[teamraid_user] = {}
-                        recommended_worker[teamraid_user][worker_type] = worker_power
-        if not recommended_worker:
-            all_worker_powers = []
-            for teamraid_user, worker_data in workers_still_alive.items():
-                for worker_type, worker_power in worker_data.items():
-                    worker_damage = round(100 * worker_power / next_enemy_power)
-                    all_worker_powers.append((worker_power, worker_damage))
-            best_combination = []
-            for combination in combinations(all_worker_powers, 2):
-                summed_damage = combination[0][1] + combination[1][1]
-                if summed_damage >= next_enemy_hp:
-                    if not best_combination:
-                        best_combination = combination
-                    elif summed_damage < best_combination[0][1] + best_combination[1][1]:
-                        best_combination = combination
-            for teamraid_user, worker_data in workers_still_alive.items():
-                for worker_type, worker_power in worker_data.items():
-                    for best_worker_power, best_worker_damage in best_combination:
-                        if best_worker_power == worker_power:
-                            recommended_worker[teamraid_user] = {}
-                            recommended_worker[teamraid_user][worker_type] = worker_power
-        if not recommended_worker:
-            best_combination = []
-            for combination in combinations(all_worker_powers, 3):
-                summed_damage = combination[0][1] + combination[1][1] + combination[2][1]
-                if summed_damage >= next_enemy_hp:
-                    if not best_combination:
-                        best_combination = combination
-                    elif summed_damage < best_combination[0][1] + best_combination[1][1] + best_combination[2][1]:
-                        best_combination = combination
-            for teamraid_user, worker_data in workers_still_alive.items():
-                for worker_type, worker_power in worker_data.items():
-                    for best_worker_power, best_worker_damage in best_combination:
-                        if best_worker_power == worker_power:
-                            recommended_worker[teamraid_user] = {}
-                            recommended_worker[teamraid_user][worker_type] = worker_power
-        return recommended_worker
+        teamraid_workers = [
+            solver.TeamraidWorker(teamraid_user, worker_type, worker_power)
+            for teamraid_user, worker_data in workers_still_alive.items()
+            for worker_type, worker_power in worker_data.items()
+        ]
+        plan = await teamraid_planner.get_plan(teamraid_workers, list(enemies_power.values()))
+        if not plan: return {}
+        return {plan[0].user_name: {plan[0].worker_type: plan[0].power}}
+
+    teamraid_planner = solver.TeamraidPlanner()
 
     add_reaction = False
     search_strings = [
         'farms will be raided in order', #English
     ]
-    if (any(search_string in embed_data['footer']['text'].lower() for search_string in search_strings)
-        and not 'raidpoints' in embed_data['field0']['name']):
+    if (any(search_string in embed_data.footer.text_lower for search_string in search_strings)
+        and not 'raidpoints' in embed_data.field(0).name):
         teamraid_users_workers = {}
         workers_incomplete = False
         for row in message.components:
             found_workers = []
             for button in row.children:
-                worker_type_match = re.search(r'^(.+?)worker', button.emoji.name.lower())
+                worker_type_match = re.search(regex.WORKER_TYPE_FROM_EMOJI_NAME, button.emoji.name.lower())
                 found_workers.append(worker_type_match.group(1))
             teamraid_users_workers[button.label] = found_workers
         if user is not None:
@@ -162,10 +126,10 @@ async def call_teamraid_helper(bot: discord.Bot, message: discord.Message, embed
                 guild_members = await functions.get_guild_member_by_name(message.guild, teamraid_user_name)
                 teamraid_users.append(guild_members[0])
         else:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
-            user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data['author']['name'])
+            if context.embed_user is not None:
+                user = context.embed_user
+                user_settings = context.embed_user_settings
+            user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data.author.name)
             user_name = user_name_match.group(1)
             user_command_message = (
                 await messages.find_message(message.channel.id, regex.COMMAND_TEAMRAID, user_name=user_name)
@@ -174,20 +138,12 @@ async def call_teamraid_helper(bot: discord.Bot, message: discord.Message, embed
             teamraid_users = [user,] + user_command_message.mentions
         if clan_settings is None:
             try:
-                clan_settings: clans.Clan = await clans.get_clan_by_member_id(user.id)
+                clan_settings: clans.Clan = await context.get_clan_by_member_id(user.id)
             except exceptions.NoDataFoundError:
                 return add_reaction
         if not clan_settings.helper_teamraid_enabled: return add_reaction
 
-        def raid_message_check(payload: discord.RawMessageUpdateEvent):
-            #return message_after.id == message.id
-            try:
-                author_name = payload.data['embeds'][0]['author']['name']
-                return author_name == message.embeds[0].author.name and payload.data['embeds'][0]['fields'][0]['name'].count('farm') >= 4 # Temporary workaround for that weird issue
-            except:
-                return False
-
-        enemy_name_match = re.search(r'\*\*(.+?) farms', embed_data['field0']['name'].lower())
+        enemy_name_match = re.search(regex.TEAMRAID_ENEMY_NAME, embed_data.field(0).name_lower)
         enemy_name = enemy_name_match.group(1).upper()
         embed = discord.Embed(color=settings.EMBED_COLOR)
         user_workers_power = {}
@@ -196,7 +152,7 @@ async def call_teamraid_helper(bot: discord.Bot, message: discord.Message, embed
             user_workers_power[teamraid_user.name] = {}
             field_workers = ''
             try:
-                user_settings: users.User = await users.get_user(teamraid_user.id)
+                user_settings: users.User = await context.get_user(teamraid_user.id)
                 user_workers = await workers.get_user_workers(teamraid_user.id)
                 for user_worker in user_workers:
                     if user_worker.worker_name in teamraid_users_workers[teamraid_user.name]:
@@ -220,11 +176,8 @@ async def call_teamraid_helper(bot: discord.Bot, message: discord.Message, embed
                     workers_incomplete = True
                     current_worker = f'{worker_emoji} `       ?`{emojis.WORKER_POWER}'
                 else:
-                    worker_power = (
-                        ((strings.WORKER_STATS[worker_type]['speed'] + strings.WORKER_STATS[worker_type]['strength']
-                        + strings.WORKER_STATS[worker_type]['intelligence']))
-                        * (1 + (strings.WORKER_STATS[worker_type]['tier']) / 2.5) * (1 + user_workers_required[worker_type] / 1.25)
-                    )
+                    worker_power = await workerstats.get_worker_power(worker_type,
+                                                                      user_workers_required[worker_type])
                     user_workers_power[teamraid_user.name][worker_type] = worker_power
                     worker_power = round(worker_power, 2)
                     worker_power_str = f'{worker_power:,g}'.rjust(8)
@@ -264,9 +217,8 @@ async def call_teamraid_helper(bot: discord.Bot, message: discord.Message, embed
                 inline = False
             )
         else:
-            next_enemy_power, next_enemy_hp = enemies_power[list(enemies_power.keys())[0]]
             workers_still_alive = copy.deepcopy(user_workers_power)
-            recommended_worker = await get_recommended_worker((next_enemy_power, next_enemy_hp), workers_still_alive)
+            recommended_worker = await get_recommended_worker(enemies_power, workers_still_alive)
             if recommended_worker:
                 recommended_worker_user = list(recommended_worker.keys())[0]
                 recommended_worker_type = list(recommended_worker[recommended_worker_user].keys())[0]
@@ -313,13 +265,16 @@ async def call_teamraid_helper(bot: discord.Bot, message: discord.Message, embed
             value = '_If a worker power shows as `?`, the player is not using Molly or has not shown me their workers list._',
             inline = False
         )
+        await router.release_side_effects()
+        if not workers_incomplete:
+            edit_subscription = await edits.subscribe(message.id)
+            if edit_subscription is None: return add_reaction
         message_helper = await message.reply(embed=embed)
 
         if not workers_incomplete:
             while True:
                 try:
-                    payload = await bot.wait_for('raw_message_edit', check=raid_message_check,
-                                                 timeout=settings.INTERACTION_TIMEOUT)
+                    payload = await edit_subscription.wait_for_edit()
                 except TimeoutError:
                     embed.remove_field(0)
                     embed.insert_field_at(
@@ -330,6 +285,10 @@ async def call_teamraid_helper(bot: discord.Bot, message: discord.Message, embed
                     )
                     await message_helper.edit(embed=embed)
                     break
+                try:
+                    if payload.data['embeds'][0]['fields'][0]['name'].count('farm') < 4: continue
+                except (KeyError, IndexError):
+                    continue
                 active_component = False
                 if 'components' not in payload.data: continue
                 message_components = payload.data['components']
@@ -337,7 +296,8 @@ async def call_teamraid_helper(bot: discord.Bot, message: discord.Message, embed
                     for component in row['components']:
                         disabled = component.get('disabled', False)
                         if disabled:
-                            worker_name_match = re.search(r'^(.+?)worker', component['emoji']['name'].lower())
+                            worker_name_match = re.search(regex.WORKER_TYPE_FROM_EMOJI_NAME,
+                                                          component['emoji']['name'].lower())
                             try:
                                 del workers_still_alive[component['label']][worker_name_match.group(1)]
                                 if not workers_still_alive[component['label']]: del workers_still_alive[component['label']]
@@ -375,8 +335,7 @@ async def call_teamraid_helper(bot: discord.Bot, message: discord.Message, embed
                     )
                     for enemy_type, enemy_power_hp in enemies_power.copy().items():
                         if enemy_power_hp[1] == 0: del enemies_power[enemy_type]
-                    next_enemy_power, next_enemy_hp = enemies_power[list(enemies_power.keys())[0]]
-                    recommended_worker = await get_recommended_worker((next_enemy_power, next_enemy_hp), workers_still_alive)
+                    recommended_worker = await get_recommended_worker(enemies_power, workers_still_alive)
                     if recommended_worker:
                         recommended_worker_user = list(recommended_worker.keys())[0]
                         recommended_worker_type = list(recommended_worker[recommended_worker_user].keys())[0]
@@ -450,10 +409,11 @@ async def call_teamraid_helper(bot: discord.Bot, message: discord.Message, embed
                     )
                 await message_helper.edit(embed=embed)
                 if not active_component: break
+            await edits.unsubscribe(edit_subscription)
 
 
 
-async def create_clan_reminder(message: discord.Message, embed_data: Dict, clan_settings: Optional[clans.Clan]) -> bool:
+async def create_clan_reminder(message: discord.Message, embed_data: parsing.EmbedData, clan_settings: Optional[clans.Clan]) -> bool:
     """Create clan reminder from teamraids
 
     Returns
@@ -469,20 +429,13 @@ async def create_clan_reminder(message: discord.Message, embed_data: Dict, clan_
         '🔱',
         ':trident:',
     ]
-    field_values = (
-        f"{embed_data['field0']['value']}\n"
-        f"{embed_data['field1']['value']}\n"
-        f"{embed_data['field2']['value']}\n"
-        f"{embed_data['field3']['value']}\n"
-        f"{embed_data['field4']['value']}\n"
-        f"{embed_data['field5']['value']}"
-    )
-    if (any(search_string in embed_data['description'].lower() for search_string in search_strings_description)
+    field_values = '\n'.join(field.value for field in embed_data.fields)
+    if (any(search_string in embed_data.description_lower for search_string in search_strings_description)
         and any(search_string in field_values.lower() for search_string in search_strings_teamraid)):
         if clan_settings is None:
             clan_name_match = None
             for line in field_values.split('\n'):
-                clan_name_match = re.search(r"^\*\*(.+?)\*\*:", line)
+                clan_name_match = re.search(regex.TEAMRAID_CLAN_NAME, line)
                 if clan_name_match: break
             try:
                 clan_settings: clans.Clan = await clans.get_clan_by_clan_name(clan_name_match.group(1))
@@ -1,17 +1,29 @@
 # upgrades.py
 
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
-from cache import messages
+from cache import energy, messages
 from database import upgrades, users
+from processing import detection, parsing, router
 from resources import exceptions, regex
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+SIGNATURES = (
+    router.Signature('description', (
+        'buy an upgrade with `', #English
+    )),
+    router.Signature('content', (
+        '` upgraded to level ', #English
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_USER, router.SIDE_EFFECT_ENERGY)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Processes the message for all /use related actions.
 
     Returns
@@ -20,13 +32,13 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await track_upgrades_overview(message, embed_data, user, user_settings))
-    return_values.append(await track_upgrade(message, user))
+    return_values.append(await track_upgrades_overview(message, embed_data, user, user_settings, context))
+    return_values.append(await track_upgrade(message, user, context))
     return any(return_values)
 
 
-async def track_upgrades_overview(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                                  user_settings: Optional[users.User]) -> bool:
+async def track_upgrades_overview(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                                  user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Tacks upgrades from the upgrades overview embed
 
     Returns
@@ -38,32 +50,32 @@ async def track_upgrades_overview(message: discord.Message, embed_data: Dict, us
     search_strings = [
         'buy an upgrade with `', #English
     ]
-    if any(search_string in embed_data['description'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.description_lower for search_string in search_strings):
         if user is None:
             user_command_message = (
                 await messages.find_message(message.channel.id, regex.COMMAND_UPGRADES_OVERVIEW)
             )
             user = user_command_message.author
         try:
-            user_settings: users.User = await users.get_user(user.id)
+            user_settings: users.User = await context.get_user(user.id)
         except exceptions.FirstTimeUserError:
             return add_reaction
         if not user_settings.bot_enabled: return add_reaction
+        user_upgrades = {}
         for field in message.embeds[0].fields:
-            data_match = re.search(r'^`(\d+)`.+__\*\*(.+?)\*\*.+level\*\*:\s(\d+)\s\|', field.value.lower(), re.DOTALL)
+            data_match = re.search(regex.UPGRADES_OVERVIEW_UPGRADE, field.value.lower())
             sort_index = int(data_match.group(1))
             name = data_match.group(2)
             level = int(data_match.group(3))
-            try:
-                upgrade: upgrades.Upgrade = await upgrades.get_upgrade(user.id, name)
-                await upgrade.update(sort_index=sort_index, level=level)
-            except exceptions.NoDataFoundError:
-                await upgrades.insert_upgrade(user.id, name, level, sort_index)
+            user_upgrades[name] = (level, sort_index)
+        await upgrades.upsert_upgrades(user.id, user_upgrades)
+        await energy.invalidate_energy_state(user.id)
         if user_settings.reactions_enabled: add_reaction = True
     return add_reaction
 
 
-async def track_upgrade(message: discord.Message, user: Optional[discord.User]) -> bool:
+async def track_upgrade(message: discord.Message, user: Optional[discord.User],
+                        context: detection.DetectionContext) -> bool:
     """Tacks upgrades from the upgrade message
 
     Returns
@@ -79,18 +91,19 @@ async def track_upgrade(message: discord.Message, user: Optional[discord.User])
         if user is None:
             user = message.mentions[0]
         try:
-            user_settings: users.User = await users.get_user(user.id)
+            user_settings: users.User = await context.get_user(user.id)
         except exceptions.FirstTimeUserError:
             return add_reaction
         if not user_settings.bot_enabled or not user_settings.helper_context_enabled: return add_reaction
-        name_level_match = re.search(r'\d+> `(.+?)` .+level\s(\d+)\s', message.content.lower())
-        idlucks_match = re.search(r'for ([0-9,]+) <', message.content.lower())
+        name_level_match = re.search(regex.UPGRADE_NAME_LEVEL, message.content.lower())
+        idlucks_match = re.search(regex.UPGRADE_IDLUCKS, message.content.lower())
         name = name_level_match.group(1)
         level = int(name_level_match.group(2))
         idlucks = int(re.sub('\D','', idlucks_match.group(1)))
         try:
             upgrade: upgrades.Upgrade = await upgrades.get_upgrade(user.id, name)
             await upgrade.update(level=level)
+            await energy.invalidate_energy_state(user.id)
         except exceptions.NoDataFoundError:
             return
         await user_settings.update(idlucks=user_settings.idlucks - idlucks)
@@ -2,18 +2,29 @@
 
 from datetime import timedelta
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 
 from cache import messages
 from database import reminders, users
+from processing import detection, parsing, router
 from resources import exceptions, functions, regex, strings
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+SIGNATURES = (
+    router.Signature('content', (
+        '**energy** was recovered!', #English
+        'timespeeder',
+        'timecompressor',
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_USER, router.SIDE_EFFECT_ENERGY, router.SIDE_EFFECT_REMINDERS)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Processes the message for all /use related actions.
 
     Returns
@@ -22,13 +33,14 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await call_context_helper_on_energy_item(message, embed_data, user, user_settings))
-    return_values.append(await track_time_items(message, user))
+    return_values.append(await call_context_helper_on_energy_item(message, embed_data, user, user_settings, context))
+    return_values.append(await track_time_items(message, user, context))
     return any(return_values)
 
 
-async def call_context_helper_on_energy_item(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                                              user_settings: Optional[users.User]) -> bool:
+async def call_context_helper_on_energy_item(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                                              user_settings: Optional[users.User],
+                                             context: detection.DetectionContext) -> bool:
     """Call the context helper when using an energy item
 
     Returns
@@ -41,7 +53,7 @@ async def call_context_helper_on_energy_item(message: discord.Message, embed_dat
         '**energy** was recovered!', #English
     ]
 
-    if any(search_string in message.content.lower() for search_string in search_strings):
+    if any(search_string in embed_data.content_lower for search_string in search_strings):
         if user is None:
             user_name_match = re.search(regex.NAME_FROM_MESSAGE_START, message.content)
             user_name = user_name_match.group(1)
@@ -51,7 +63,7 @@ async def call_context_helper_on_energy_item(message: discord.Message, embed_dat
             user = user_command_message.author
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled: return add_reaction
@@ -61,7 +73,7 @@ async def call_context_helper_on_energy_item(message: discord.Message, embed_dat
                 f"➜ {strings.SLASH_COMMANDS['raid']}\n"
                 f"➜ {strings.SLASH_COMMANDS['worker hire']}"
             )
-        energy_amount_match = re.search(r'>\s([0-9,]+)\s\*\*', message.content.lower())
+        energy_amount_match = re.search(regex.USE_ENERGY_AMOUNT, embed_data.content_lower)
         energy_amount = int(re.sub('\D','', energy_amount_match.group(1)))
         try:
             await functions.change_user_energy(user_settings, energy_amount)
@@ -74,7 +86,7 @@ async def call_context_helper_on_energy_item(message: discord.Message, embed_dat
     return add_reaction
 
 
-async def track_time_items(message: discord.Message, user: discord.User) -> bool:
+async def track_time_items(message: discord.Message, user: discord.User, context: detection.DetectionContext) -> bool:
     """Tacks time speeders and compressors used
 
     Returns
@@ -96,11 +108,11 @@ async def track_time_items(message: discord.Message, user: discord.User) -> bool
             )
             user = user_command_message.author
         try:
-            user_settings: users.User = await users.get_user(user.id)
+            user_settings: users.User = await context.get_user(user.id)
         except exceptions.FirstTimeUserError:
             return add_reaction
         if not user_settings.bot_enabled: return add_reaction
-        timestring_match = re.search(r'🕓 \*\*(.+?)\*\*', message.content.lower())
+        timestring_match = re.search(regex.USE_TIMESTRING, message.content.lower())
         item_time_left = await functions.parse_timestring_to_timedelta(timestring_match.group(1))
         kwargs = {}
         if 'timespeeder' in message.content.lower():
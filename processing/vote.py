@@ -2,17 +2,26 @@
 
 from math import ceil
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
 from cache import messages
 from database import reminders, users
+from processing import detection, parsing, router
 from resources import emojis, exceptions, functions, regex, strings
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+SIGNATURES = (
+    router.Signature('description', (
+        'you can vote for idle farm', #All languages
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_REMINDERS,)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Processes the message for all vote related actions.
 
     Returns
@@ -21,12 +30,12 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await create_vote_reminder(message, embed_data, user, user_settings))
+    return_values.append(await create_vote_reminder(message, embed_data, user, user_settings, context))
     return any(return_values)
 
 
-async def create_vote_reminder(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                               user_settings: Optional[users.User]) -> bool:
+async def create_vote_reminder(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                               user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Create a reminder when the vote embed is opened and on cooldown. If not on cooldown, show info to open it.
 
     Returns
@@ -38,7 +47,7 @@ async def create_vote_reminder(message: discord.Message, embed_data: Dict, user:
     search_strings = [
         'you can vote for idle farm', #All languages
     ]
-    if any(search_string in embed_data['description'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.description_lower for search_string in search_strings):
         if user is None:
             user_command_message = (
                 await messages.find_message(message.channel.id, regex.COMMAND_VOTE)
@@ -46,18 +55,17 @@ async def create_vote_reminder(message: discord.Message, embed_data: Dict, user:
             user = user_command_message.author
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.reminder_vote.enabled: return add_reaction
         user_command = await functions.get_game_command(user_settings, 'vote')
-        timestring_match = re.search(r'cooldown: \*\*(.+?)\*\*\n', embed_data['field0']['value'].lower())
-        energy_refill_amount_match = re.search(r'energy refill\*\*: (\d+)%', embed_data['field0']['value'].lower())
+        timestring_match = re.search(regex.VOTE_TIMESTRING, embed_data.field(0).value_lower)
+        energy_refill_amount_match = re.search(regex.VOTE_ENERGY_REFILL, embed_data.field(0).value_lower)
         energy_refill_amount = int(energy_refill_amount_match.group(1))
         energy_from_vote = ceil(user_settings.energy_max * energy_refill_amount / 100)
-        energy_regen_time = await functions.get_energy_regen_time(user_settings)
         try:
-            current_energy = await functions.get_current_energy_amount(user_settings, energy_regen_time)
+            current_energy = await functions.get_current_energy_amount(user_settings)
         except (exceptions.EnergyFullTimeOutdatedError, exceptions.EnergyFullTimeNoneError):
             if not timestring_match:
                 await message.reply(strings.MSG_ENERGY_OUTDATED.format(user=user.display_name,
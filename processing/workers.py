@@ -2,18 +2,32 @@
 
 from datetime import timedelta
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 from discord import utils
 
 from cache import messages
 from database import clans, users, workers, tracking, workers
+from processing import detection, parsing, router
 from resources import exceptions, functions, regex, strings
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User], clan_settings: Optional[clans.Clan]) -> bool:
+SIGNATURES = (
+    router.Signature('author', (
+        '— worker roll', #All languages
+        '— workers', #English
+    )),
+    router.Signature('field0_name', (
+        'hired the', #English
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_ENERGY, router.SIDE_EFFECT_WORKERS)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], clan_settings: Optional[clans.Clan],
+                          context: detection.DetectionContext) -> bool:
     """Processes the message for all worker related commands and events.
 
     Returns
@@ -22,14 +36,15 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await track_worker_hire_event(message, embed_data, user, user_settings, clan_settings))
-    return_values.append(await track_worker_roll(message, embed_data, user, user_settings, clan_settings))
-    return_values.append(await track_worker_stats(message, embed_data, user, user_settings, clan_settings))
+    return_values.append(await track_worker_hire_event(message, embed_data, user, user_settings, clan_settings, context))
+    return_values.append(await track_worker_roll(message, embed_data, user, user_settings, clan_settings, context))
+    return_values.append(await track_worker_stats(message, embed_data, user, user_settings, clan_settings, context))
     return any(return_values)
 
 
-async def track_worker_hire_event(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                                  user_settings: Optional[users.User], clan_settings: Optional[clans.Clan]) -> bool:
+async def track_worker_hire_event(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                                  user_settings: Optional[users.User], clan_settings: Optional[clans.Clan],
+                                  context: detection.DetectionContext) -> bool:
     """Tracks worker hire
 
     Returns
@@ -44,24 +59,24 @@ async def track_worker_hire_event(message: discord.Message, embed_data: Dict, us
     search_strings_2 = [
         'worker**!', #English
     ]
-    if (any(search_string in embed_data['field0']['name'].lower() for search_string in search_strings_1)
-        and any(search_string in embed_data['field0']['name'].lower() for search_string in search_strings_2)):
-        user_name_match = re.search(r'^(.+?) hired', embed_data['field0']['name'].lower())
+    if (any(search_string in embed_data.field(0).name_lower for search_string in search_strings_1)
+        and any(search_string in embed_data.field(0).name_lower for search_string in search_strings_2)):
+        user_name_match = re.search(regex.WORKER_HIRE_USER_NAME, embed_data.field(0).name_lower)
         guild_members = await functions.get_guild_member_by_name(message.guild, user_name_match.group(1), False)
         if len(guild_members) != 1: return add_reaction
         user = guild_members[0]
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if clan_settings is None:
             try:
-                clan_settings: clans.Clan = await clans.get_clan_by_member_id(user.id)
+                clan_settings: clans.Clan = await context.get_clan_by_member_id(user.id)
             except exceptions.NoDataFoundError:
                 pass
         if not user_settings.bot_enabled: return add_reaction
-        worker_name_match = re.search(r'<a:(.+?)worker:', embed_data['field0']['name'].lower())
+        worker_name_match = re.search(regex.WORKER_TYPE_FROM_EMOJI, embed_data.field(0).name_lower)
         worker_name = worker_name_match.group(1)
         try:
             user_worker: workers.UserWorker = await workers.get_user_worker(user.id, worker_name)
@@ -79,8 +94,9 @@ async def track_worker_hire_event(message: discord.Message, embed_data: Dict, us
     return add_reaction
 
 
-async def track_worker_roll(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                            user_settings: Optional[users.User], clan_settings: Optional[clans.Clan]) -> bool:
+async def track_worker_roll(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                            user_settings: Optional[users.User], clan_settings: Optional[clans.Clan],
+                            context: detection.DetectionContext) -> bool:
     """Tracks worker rolls
 
     Returns
@@ -92,13 +108,13 @@ async def track_worker_roll(message: discord.Message, embed_data: Dict, user: Op
     search_strings = [
         '— worker roll', #All languages
     ]
-    if any(search_string in embed_data['author']['name'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.author.name_lower for search_string in search_strings):
         if user is None:
-            if embed_data['embed_user'] is not None:
-                user = embed_data['embed_user']
-                user_settings = embed_data['embed_user_settings']
+            if context.embed_user is not None:
+                user = context.embed_user
+                user_settings = context.embed_user_settings
             else:
-                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data['author']['name'])
+                user_name_match = re.search(regex.USERNAME_FROM_EMBED_AUTHOR, embed_data.author.name)
                 user_name = user_name_match.group(1)
                 user_command_message = (
                     await messages.find_message(message.channel.id, regex.COMMAND_WORKER_HIRE, user_name=user_name)
@@ -106,12 +122,12 @@ async def track_worker_roll(message: discord.Message, embed_data: Dict, user: Op
                 user = user_command_message.author
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if clan_settings is None:
             try:
-                clan_settings: clans.Clan = await clans.get_clan_by_member_id(user.id)
+                clan_settings: clans.Clan = await context.get_clan_by_member_id(user.id)
             except exceptions.NoDataFoundError:
                 pass
         if not user_settings.bot_enabled: return add_reaction
@@ -119,13 +135,13 @@ async def track_worker_roll(message: discord.Message, embed_data: Dict, user: Op
         if user_settings.tracking_enabled:
             # Update worker roll tracking log
             for field in message.embeds[0].fields:
-                worker_type_match = re.search(r'<a:(.+?)worker:', field.name.lower())
+                worker_type_match = re.search(regex.WORKER_TYPE_FROM_EMOJI, field.name.lower())
                 worker_type = worker_type_match.group(1)
                 worker_amount = 1
-                amount_match = re.search(r'\(\+([0-9,]+)\)', field.value.lower())
-                worker_data_match = re.search(r'`\[([0-9,]+)/([0-9,]+)]`', field.name.lower())
+                amount_match = re.search(regex.WORKER_ROLL_AMOUNT, field.value.lower())
+                worker_data_match = re.search(regex.WORKER_PROGRESS, field.name.lower())
                 if not worker_data_match:
-                    worker_data_match = re.search(r'`\[([0-9,]+)/([0-9,]+)]`', field.value.lower())
+                    worker_data_match = re.search(regex.WORKER_PROGRESS, field.value.lower())
                 if amount_match: worker_amount = int(re.sub('\D','', amount_match.group(1)))
                 workers_total = int(re.sub(r'\D','', worker_data_match.group(1)))
                 workers_required = int(re.sub(r'\D','', worker_data_match.group(2)))
@@ -135,14 +151,13 @@ async def track_worker_roll(message: discord.Message, embed_data: Dict, user: Op
                     await tracking.insert_log_entry(user.id, message.guild.id, f'worker-{worker_type}',
                                                     utils.utcnow().replace(microsecond=0), worker_amounts[0])
         # Update energy time until full
-        energy_match = re.search(r':\s([0-9,]+)/([0-9,]+)$', embed_data['footer']['text'])
+        energy_match = re.search(regex.ENERGY_FROM_FOOTER, embed_data.footer.text)
         energy_current = int(re.sub('\D','',energy_match.group(1)))
         energy_max = int(re.sub('\D','',energy_match.group(2)))
         energy_regen_time = await functions.get_energy_regen_time(user_settings)
         seconds_until_max = (int(energy_max) - int(energy_current)) * energy_regen_time.total_seconds()
         energy_full_time = utils.utcnow() + timedelta(seconds=seconds_until_max)
-        await user_settings.update(energy_max=energy_max, energy_full_time=energy_full_time)
-        await functions.recalculate_energy_reminder(user_settings, energy_regen_time)
+        await functions.update_user_energy(user_settings, energy_full_time, energy_max)
         # Update user workers
         for worker_type, worker_amounts in workers_found.items():
             _, workers_total, workers_required = worker_amounts
@@ -163,9 +178,10 @@ async def track_worker_roll(message: discord.Message, embed_data: Dict, user: Op
     return add_reaction
 
 
-async def track_worker_stats(message: discord.Message, embed_data: Dict,
+async def track_worker_stats(message: discord.Message, embed_data: parsing.EmbedData,
                              interaction_user: Optional[discord.User],
-                             user_settings: Optional[users.User], clan_settings: Optional[clans.Clan]) -> bool:
+                             user_settings: Optional[users.User], clan_settings: Optional[clans.Clan],
+                             context: detection.DetectionContext) -> bool:
     """Tacks workers from the worker stats overview embed
 
     Returns
@@ -177,42 +193,44 @@ async def track_worker_stats(message: discord.Message, embed_data: Dict,
     search_strings = [
         '— workers', #English
     ]
-    if any(search_string in embed_data['author']['name'].lower() for search_string in search_strings):
+    if any(search_string in embed_data.author.name_lower for search_string in search_strings):
         if interaction_user is None:
             user_command_message = (
                 await messages.find_message(message.channel.id, regex.COMMAND_WORKER_STATS)
             )
             if user_command_message is None: return add_reaction
             interaction_user = user_command_message.author
-        if embed_data['embed_user'] is not None and embed_data['embed_user'] != interaction_user: return add_reaction
-        if interaction_user.name not in embed_data['author']['name']: return
+        if context.embed_user is not None and context.embed_user != interaction_user: return add_reaction
+        if interaction_user.name not in embed_data.author.name: return
         try:
-            user_settings: users.User = await users.get_user(interaction_user.id)
+            user_settings: users.User = await context.get_user(interaction_user.id)
         except exceptions.FirstTimeUserError:
             return add_reaction
         if clan_settings is None:
             try:
-                clan_settings: clans.Clan = await clans.get_clan_by_member_id(interaction_user.id)
+                clan_settings: clans.Clan = await context.get_clan_by_member_id(interaction_user.id)
             except exceptions.NoDataFoundError:
                 pass
         if not user_settings.bot_enabled: return add_reaction
+        try:
+            worker_levels = {worker_level.level: worker_level for worker_level in await workers.get_worker_levels()}
+        except exceptions.NoDataFoundError:
+            worker_levels = {}
+        user_workers = {}
         for field in message.embeds[0].fields:
-            worker_name_match = re.search(r'<a:(.+?)worker:', field.name.lower())
-            worker_data_match = re.search(r'level\*\*: ([0-9,]+) `\[([0-9,]+)/([0-9,]+)]`', field.value.lower())
+            worker_name_match = re.search(regex.WORKER_TYPE_FROM_EMOJI, field.name.lower())
+            worker_data_match = re.search(regex.WORKER_STATS_LEVEL_PROGRESS, field.value.lower())
             worker_name = worker_name_match.group(1)
             level = int(re.sub(r'\D','', worker_data_match.group(1)))
             amount = int(re.sub(r'\D','', worker_data_match.group(2)))
             workers_required = int(re.sub(r'\D','', worker_data_match.group(3)))
-            try:
-                user_worker = await workers.get_user_worker(interaction_user.id, worker_name)
-                await user_worker.update(worker_level=level, worker_amount=amount)
-            except exceptions.NoDataFoundError:
-                user_worker = await workers.insert_user_worker(interaction_user.id, worker_name, level, amount)
-            try:
-                worker_level = await workers.get_worker_level(level + 1)
+            user_workers[worker_name] = (level, amount)
+            worker_level = worker_levels.get(level + 1, None)
+            if worker_level is not None:
                 if worker_level.workers_required != workers_required:
                     await worker_level.update(workers_required=workers_required)
-            except exceptions.NoDataFoundError:
-                worker_level = await workers.insert_worker_level(level, workers_required)
+            else:
+                worker_levels[level + 1] = await workers.insert_worker_level(level + 1, workers_required)
+        await workers.upsert_user_workers(interaction_user.id, user_workers)
         if user_settings.reactions_enabled: add_reaction = True
     return add_reaction
\ No newline at end of file
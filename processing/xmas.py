@@ -2,17 +2,26 @@
 
 from datetime import timedelta
 import re
-from typing import Dict, Optional
+from typing import Optional
 
 import discord
 
 from cache import messages
 from database import reminders, users
+from processing import detection, parsing, router
 from resources import emojis, exceptions, functions, regex
 
 
-async def process_message(bot: discord.Bot, message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                          user_settings: Optional[users.User]) -> bool:
+SIGNATURES = (
+    router.Signature('content', (
+        'was blessed with the **christmas spirit**', #English
+    )),
+)
+SIDE_EFFECTS = (router.SIDE_EFFECT_REMINDERS,)
+
+
+async def process_message(bot: discord.Bot, message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                          user_settings: Optional[users.User], context: detection.DetectionContext) -> bool:
     """Processes the message for all christmas related actions.
 
     Returns
@@ -21,12 +30,13 @@ async def process_message(bot: discord.Bot, message: discord.Message, embed_data
     - False otherwise
     """
     return_values = []
-    return_values.append(await use_christmas_bell(message, embed_data, user, user_settings))
+    return_values.append(await use_christmas_bell(message, embed_data, user, user_settings, context))
     return any(return_values)
 
 
-async def use_christmas_bell(message: discord.Message, embed_data: Dict, user: Optional[discord.User],
-                                              user_settings: Optional[users.User]) -> bool:
+async def use_christmas_bell(message: discord.Message, embed_data: parsing.EmbedData, user: Optional[discord.User],
+                                              user_settings: Optional[users.User],
+                             context: detection.DetectionContext) -> bool:
     """Create boost reminder when using a christmas bell
 
     Returns
@@ -39,7 +49,7 @@ async def use_christmas_bell(message: discord.Message, embed_data: Dict, user: O
         'was blessed with the **christmas spirit**', #English
     ]
 
-    if any(search_string in message.content.lower() for search_string in search_strings):
+    if any(search_string in embed_data.content_lower for search_string in search_strings):
         if user is None:
             user_name_match = re.search(regex.NAME_FROM_MESSAGE_START, message.content)
             user_name = user_name_match.group(1)
@@ -50,7 +60,7 @@ async def use_christmas_bell(message: discord.Message, embed_data: Dict, user: O
             user = user_command_message.author
         if user_settings is None:
             try:
-                user_settings: users.User = await users.get_user(user.id)
+                user_settings: users.User = await context.get_user(user.id)
             except exceptions.FirstTimeUserError:
                 return add_reaction
         if not user_settings.bot_enabled or not user_settings.reminder_boosts.enabled: return add_reaction
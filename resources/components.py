@@ -1202,7 +1202,7 @@ class SetEnergyReminder(discord.ui.Select):
         select_value = self.values[0]
         energy_regen_time = await functions.get_energy_regen_time(self.view.user_settings)
         try:
-            energy_current = await functions.get_current_energy_amount(self.view.user_settings, energy_regen_time)
+            energy_current = await functions.get_current_energy_amount(self.view.user_settings)
         except exceptions.EnergyFullTimeNoneError:
             await interaction.response.send_message(
                 (
@@ -1316,7 +1316,8 @@ class ClanMembersViewSelect(discord.ui.Select):
 
     async def callback(self, interaction: discord.Interaction):
         self.view.current_view = int(self.values[0])
-        embeds = await self.view.embed_function(self.view.clan_settings, self.view.current_view, self.view.sort_key)
+        embeds = await self.view.embed_function(self.view.clan_settings, self.view.current_view, self.view.sort_key,
+                                                self.view.clan_members_data)
         image = discord.MISSING
         if len(embeds) > 1:
             image = discord.File(settings.IMG_EMBED_WIDTH_LINE, filename='embed_width_line.png')
@@ -1349,7 +1350,8 @@ class ClanMembersViewSortSelect(discord.ui.Select):
                     options.append(discord.SelectOption(label=sort_method, value=sort_key, emoji=emoji))
                 child.options = options
                 break
-        embeds = await self.view.embed_function(self.view.clan_settings, self.view.current_view, self.view.sort_key)
+        embeds = await self.view.embed_function(self.view.clan_settings, self.view.current_view, self.view.sort_key,
+                                                self.view.clan_members_data)
         image = discord.MISSING
         if len(embeds) > 1:
             image = discord.File(settings.IMG_EMBED_WIDTH_LINE, filename='embed_width_line.png')
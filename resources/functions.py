@@ -1,15 +1,16 @@
 # functions.py
 
 import asyncio
-from datetime import timedelta
+from datetime import datetime, timedelta
 import re
-from typing import Any, Coroutine, List, Optional, Union
+from typing import Any, Coroutine, List, Optional, Sequence, Union
 
 import discord
 from discord.ext import commands
 from discord import utils
 
-from database import cooldowns, errors, reminders, upgrades, users
+from cache import energy, interactions, members, mentions, reactions
+from database import cooldowns, errors, reminders, users
 from resources import emojis, exceptions, functions, regex, settings, strings, views
 
 
@@ -21,11 +22,19 @@ async def get_interaction(message: discord.Message) -> discord.Interaction:
             message = message.reference.cached_message
         else:
             message = await message.channel.fetch_message(message.reference.message_id)
+        await interactions.store_interaction(message)
     return message.interaction
 
 
 async def get_interaction_user(message: discord.Message) -> discord.User:
-    """Returns the user object if the message was triggered by a slash command. Returns None if no user was found."""
+    """Returns the user object if the message was triggered by a slash command. Returns None if no user was found.
+    Uses the interaction owner cache in cache.interactions to avoid fetching referenced messages."""
+    message_id = message.reference.message_id if message.reference is not None else message.id
+    interaction_owner = await interactions.get_interaction_owner(message_id)
+    if interaction_owner is not None and message.guild is not None:
+        if interaction_owner.user_id is None: return None
+        user = message.guild.get_member(interaction_owner.user_id)
+        if user is not None: return user
     interaction = await get_interaction(message)
     return interaction.user if interaction is not None else None
 
@@ -59,13 +68,17 @@ async def get_discord_channel(bot: discord.Bot, channel_id: int) -> discord.User
 
 # --- Reactions
 async def add_logo_reaction(message: discord.Message) -> None:
-    """Adds a Molly reaction if not already added"""
-    reaction_exists = False
+    """Adds a Molly reaction if not already added. Messages that were reacted to are remembered in cache.reactions,
+    so a message is only reacted to once, even if it is processed again after edits."""
+    if await reactions.check_reacted_message(message.id): return
+    await reactions.add_reacted_message(message.id)
     for reaction in message.reactions:
-        if reaction.emoji == emojis.LOGO:
-            reaction_exists = True
-            break
-    if not reaction_exists: await message.add_reaction(emojis.LOGO)
+        if reaction.emoji == emojis.LOGO: return
+    try:
+        await message.add_reaction(emojis.LOGO)
+    except discord.HTTPException:
+        await reactions.remove_reacted_message(message.id)
+        raise
         
 
 async def add_reminder_reaction(message: discord.Message, reminder: reminders.Reminder,  user_settings: users.User) -> None:
@@ -85,12 +98,17 @@ async def add_warning_reaction(message: discord.Message) -> None:
 
 
 # --- Regex ---
-async def get_match_from_patterns(patterns: List[str], string: str) -> re.Match:
+async def get_match_from_patterns(patterns: Sequence[Union[str, re.Pattern]], string: str) -> re.Match:
     """Searches a string for a regex patterns out of a list of patterns and returns the first match.
+    String patterns are searched case insensitive, compiled patterns use their own flags.
     Returns None if no match is found.
     """
+    match = None
     for pattern in patterns:
-        match = re.search(pattern, string, re.IGNORECASE)
+        if isinstance(pattern, re.Pattern):
+            match = pattern.search(string)
+        else:
+            match = re.search(pattern, string, re.IGNORECASE)
         if match: break
     return match
 
@@ -98,17 +116,13 @@ async def get_match_from_patterns(patterns: List[str], string: str) -> re.Match:
 # --- Time calculations ---
 async def get_guild_member_by_name(guild: discord.Guild, user_name: str,
                                    bot_users_only: Optional[bool] = True) -> List[discord.Member]:
-    """Returns all guild members found by the given name"""
-    members = []
-    for member in guild.members:
-        if await encode_text(member.name) == await encode_text(user_name) and not member.bot:
-            if bot_users_only:
-                try:
-                    await users.get_user(member.id)
-                except exceptions.FirstTimeUserError:
-                    continue
-            members.append(member)
-    return members
+    """Returns all guild members found by the given name. Uses the member name index in cache.members."""
+    guild_members = []
+    for member_id in await members.get_member_ids_by_name(guild, user_name):
+        if bot_users_only and not await members.is_registered_user(member_id): continue
+        member = guild.get_member(member_id)
+        if member is not None: guild_members.append(member)
+    return guild_members
 
 
 async def calculate_time_left_from_cooldown(message: discord.Message, user_settings: users.User, activity: str) -> timedelta:
@@ -456,11 +470,7 @@ async def get_game_command(user_settings: users.User, command_name: str) -> str:
 async def get_bot_slash_command(bot: discord.Bot, command_name: str) -> str:
     """Gets a slash command from the bot. If found, returns the slash mention. If not found, just returns /command.
     Note that slash mentions only work with GLOBAL commands."""
-    main_command, *sub_commands = command_name.lower().split(' ')
-    for command in bot.application_commands:
-        if command.name == main_command:
-            return f'</{command_name}:{command.id}>'
-    return f'`/{command_name}`'
+    return await mentions.get_command_mention(bot, command_name)
 
 
 def await_coroutine(coro):
@@ -650,31 +660,16 @@ async def wait_for_inventory_message(bot: commands.Bot, ctx: discord.Application
 
 async def get_energy_regen_time(user_settings: users.User) -> timedelta:
     """Returns the time it takes to generate 1 energy"""
-    try:
-        energy_upgrade: upgrades.Upgrade = await upgrades.get_upgrade(user_settings.user_id, 'energy regeneration')
-        multiplier_upgrade = strings.ENERGY_UPGRADE_LEVEL_MULTIPLIERS[energy_upgrade.level]
-    except exceptions.NoDataFoundError:
-        multiplier_upgrade = 1
-    multiplier_donor = list(strings.DONOR_TIER_ENERGY_MULTIPLIERS.values())[user_settings.donor_tier]
-    energy_regen = 5 / (multiplier_donor * multiplier_upgrade * settings.ENERGY_REGEN_MULTIPLIER_EVENT)
-    return timedelta(minutes=energy_regen)
+    energy_state = await energy.get_energy_state(user_settings)
+    return energy_state.energy_regen_time
 
 
-async def get_current_energy_amount(user_settings: users.User, energy_regen_time: Optional[timedelta] = None) -> int:
+async def get_current_energy_amount(user_settings: users.User) -> int:
     """Returns the energy amount the user currently has based on energy_max and energy_full_time
-    The amount is NOT rounded.
+    The amount is truncated to an int.
     """
-    current_time = utils.utcnow()
-    if user_settings.energy_full_time is None:
-        raise exceptions.EnergyFullTimeNoneError
-    if user_settings.energy_full_time <= current_time:
-        return user_settings.energy_max
-    if energy_regen_time is None:
-        energy_regen_time = await get_energy_regen_time(user_settings)
-    energy_until_max = (user_settings.energy_full_time - current_time).total_seconds() / energy_regen_time.total_seconds()
-    if energy_until_max > user_settings.energy_max:
-        raise exceptions.EnergyFullTimeOutdatedError
-    return int(user_settings.energy_max - energy_until_max)
+    energy_state = await energy.get_energy_state(user_settings)
+    return int(energy_state.get_energy(utils.utcnow()))
 
 
 async def change_user_energy(user_settings: users.User, energy_amount: int) -> None:
@@ -685,48 +680,37 @@ async def change_user_energy(user_settings: users.User, energy_amount: int) -> N
     If an energy reminder is active, this also updates the reminder end time.
     """
     if user_settings.energy_full_time is None: return
-    energy_regen_time = await get_energy_regen_time(user_settings)
-    amount_negative = False
-    energy_amount_original = energy_amount
-    if energy_amount < 0:
-        energy_amount *= -1
-        amount_negative = True
-    current_time = utils.utcnow()
-    energy_full_time = user_settings.energy_full_time
-    try:
-        energy_current = await get_current_energy_amount(user_settings, energy_regen_time)
-    except exceptions.EnergyFullTimeOutdatedError:
-        energy_current = user_settings.energy_max
-        energy_full_time = current_time
-    if energy_current == user_settings.energy_max:
-        energy_full_time = current_time
-    if energy_amount_original > (user_settings.energy_max - energy_current):
-        energy_full_time_new = current_time
-    else:
-        energy_amount_time = timedelta(seconds=energy_amount * energy_regen_time.total_seconds())
-        if amount_negative:
-            energy_full_time_new = energy_full_time + energy_amount_time
-        else:
-            energy_full_time_new = energy_full_time - energy_amount_time
-    await user_settings.update(energy_full_time=energy_full_time_new)
-    await recalculate_energy_reminder(user_settings, energy_regen_time)
+    energy_state = await energy.get_energy_state(user_settings)
+    energy_full_time = energy_state.get_energy_full_time_after_change(energy_amount, utils.utcnow())
+    await update_user_energy(user_settings, energy_full_time)
 
 
-async def recalculate_energy_reminder(user_settings: users.User, energy_regen_time: Optional[timedelta] = None) -> None:
-    """Recalculates the end time of an energy reminder based on energy_max and energy_full_time in the user settings."""
+async def update_user_energy(user_settings: users.User, energy_full_time: datetime,
+                             energy_max: Optional[int] = None) -> None:
+    """Updates energy_full_time and energy_max of a user. If an energy reminder is active, its end time is
+    recalculated and written together with the user.
+
+    Raises
+    ------
+    exceptions.EnergyFullTimeOutdatedError if the new energy_full_time is further away than a full regeneration. The
+    user is updated anyway, the reminder is not.
+    """
     try:
         reminder: reminders.Reminder = await reminders.get_user_reminder(user_settings.user_id, 'energy')
-        if reminder.triggered: return
-        if energy_regen_time is None:
-            energy_regen_time = await get_energy_regen_time(user_settings)
-        energy_current = await get_current_energy_amount(user_settings, energy_regen_time)
-        energy_amount_reminder = int(reminder.activity[7:])
-        current_time = utils.utcnow()
-        reminder_end_time_new = (
-            current_time
-            + timedelta(seconds=(energy_amount_reminder - energy_current) * energy_regen_time.total_seconds())
-        )
-        if reminder_end_time_new <= current_time: reminder_end_time_new = current_time + timedelta(seconds=1)
-        await reminder.update(end_time=reminder_end_time_new)
+        if reminder.triggered: reminder = None
     except exceptions.NoDataFoundError:
-        return
\ No newline at end of file
+        reminder = None
+    reminder_end_time = None
+    if reminder is not None:
+        energy_state = await energy.get_energy_state(user_settings)
+        energy_state.energy_full_time = energy_full_time
+        if energy_max is not None: energy_state.energy_max = energy_max
+        current_time = utils.utcnow()
+        try:
+            reminder_end_time = current_time + energy_state.get_time_until_energy(int(reminder.activity[7:]),
+                                                                                  current_time)
+        except exceptions.EnergyFullTimeOutdatedError:
+            await users.update_energy(user_settings, energy_full_time, energy_max)
+            raise
+        if reminder_end_time <= current_time: reminder_end_time = current_time + timedelta(seconds=1)
+    await users.update_energy(user_settings, energy_full_time, energy_max, reminder, reminder_end_time)
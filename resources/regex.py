@@ -33,4 +33,93 @@ COMMAND_USE_TIME_ITEM = re.compile(r"(?:\buse\b|\bconsume\b|\bconsoom\b)\s+\btim
 COMMAND_UPGRADES_OVERVIEW = re.compile(r"\bupgrades?\b\s*$")
 COMMAND_VOTE = re.compile(r"\bvote\b")
 COMMAND_WORKER_HIRE = re.compile(r"(?:\broll\b|(\bwo(?:rkers?)?\b\s+\bhire\b|\buse\b\s+\bcandy\b\s+\bapple\b))")
-COMMAND_WORKER_STATS = re.compile(r"\bwo(?:rkers?)?\b")
\ No newline at end of file
+COMMAND_WORKER_STATS = re.compile(r"\bwo(?:rkers?)?\b")
+
+# --- Message data extraction ---
+# Activities
+ACTIVITIES_TIMESTRING_DAILY = re.compile(r"daily`\*\* \(\*\*(.+?)\*\*")
+ACTIVITIES_TIMESTRING_VOTE = re.compile(r"vote`\*\* \(\*\*(.+?)\*\*")
+
+# Boosts
+BOOSTS_ACTIVE_ITEM = re.compile(r' \*\*(.+?)\*\*: (.+?)$')
+
+# Buy
+BUY_ITEM_NAME = re.compile(r'\s`(.+?)`\s')
+
+# Claim
+CLAIM_GUILD_SEALS = re.compile(r"\+([0-9,]+) <:guildseal")
+
+# Clan
+CLAN_PLAYER_COUNT = re.compile(r'players\*\*: (\d+)\/')
+CLAN_NAME_FROM_MEMBERS = re.compile(r'^\*\*(.+?)\*\* members')
+CLAN_OWNER_NAME = re.compile(r'Owner: (.+?)$')
+CLAN_MEMBER_NAME_SEALS = re.compile(r'^\*\*(.+?)\*\* - (\d+?) <')
+CLAN_MEMBER_ID_SEALS = re.compile(r'^ID: \*\*(\d+?)\*\* - (\d+?) <')
+CLAN_CONTRIBUTED_SEALS = re.compile(r', ([0-9,]+) <')
+CLAN_NAME_FROM_MESSAGE_END = re.compile(r' \*\*(.+?)\*\*$')
+
+# Donate
+DONOR_TIER = re.compile(r'\| (.+?) donator')
+
+# Halloween
+HAL_TRICKORTREAT_USER_NAMES = (
+    re.compile(r'^\*\*(.+?)\*\* spooked \*\*(.+?)\*\*', re.IGNORECASE),
+    re.compile(r'^\*\*(.+?)\*\* gave.+to \*\*(.+?)\*\*', re.IGNORECASE),
+)
+HAL_BOOST_NAME = re.compile(r'and received the \*\*(.+?)\*\*')
+
+# Inventory
+INVENTORY_GUILD_SEALS = re.compile(r"guild seal\*\*: ([\-0-9,]+)")
+
+# Open
+OPEN_WORKER_AMOUNT_NAME = re.compile(r'^\+([0-9,]+)\s<a:(.+?)worker:')
+
+# Payday
+PAYDAY_IDLUCKS_PREVIEW = re.compile(r'^• ([0-9,]+?) <')
+PAYDAY_IDLUCKS_RECEIVED = re.compile(r'got ([0-9,]+?) <')
+
+# Profile
+PROFILE_IDLUCKS = re.compile(r'idlucks\*\*: ([0-9,]+?)\n')
+PROFILE_ENERGY = re.compile(r'1084593332312887396> ([0-9,]+)/([0-9,]+)\n')
+
+# Raid
+RAID_ENEMY_FARM = re.compile(r'<a:(.+?)worker.+lv(\d+) \|.+`(\d+)/(\d+)`')
+WORKER_TYPE_FROM_EMOJI_NAME = re.compile(r'^(.+?)worker')
+RAID_USER_NAME_AMOUNT = re.compile(r'^\*\*(.+?)\*\*: (.+?) <:')
+
+# Request
+REQUEST_WORKER_RECEIVED = (
+    re.compile(r'\*\* got .+/.+worker\*\*', re.IGNORECASE), #English
+)
+REQUEST_WORKER_AMOUNT_NAME = re.compile(r'got (\d+)/.+<a:(.+?)worker:')
+REQUEST_SUPPLIER_IDLUCKS = re.compile(r'^(.+?) —.+\(\+(\d+) <')
+
+# Shop
+SHOP_ITEM_NAME_FROM_COMMAND = re.compile(r'\bbuy\b\s+\b(.+?)$')
+SHOP_TIMESTRING = re.compile(r'🕓\s\*\*(.+?)\*\*\n')
+SHOP_ITEM_DATA = re.compile(r'__\*\*(.+?)\*\*__.+`(\d+?)/(\d+?)`.+\*\*(.+?)\*\*', re.DOTALL)
+
+# Teamraid
+TEAMRAID_ENEMY_NAME = re.compile(r'\*\*(.+?) farms')
+TEAMRAID_CLAN_NAME = re.compile(r"^\*\*(.+?)\*\*:")
+
+# Upgrades
+UPGRADES_OVERVIEW_UPGRADE = re.compile(r'^`(\d+)`.+__\*\*(.+?)\*\*.+level\*\*:\s(\d+)\s\|', re.DOTALL)
+UPGRADE_NAME_LEVEL = re.compile(r'\d+> `(.+?)` .+level\s(\d+)\s')
+UPGRADE_IDLUCKS = re.compile(r'for ([0-9,]+) <')
+
+# Use
+USE_ENERGY_AMOUNT = re.compile(r'>\s([0-9,]+)\s\*\*')
+USE_TIMESTRING = re.compile(r'🕓 \*\*(.+?)\*\*')
+
+# Vote
+VOTE_TIMESTRING = re.compile(r'cooldown: \*\*(.+?)\*\*\n')
+VOTE_ENERGY_REFILL = re.compile(r'energy refill\*\*: (\d+)%')
+
+# Workers
+WORKER_HIRE_USER_NAME = re.compile(r'^(.+?) hired')
+WORKER_TYPE_FROM_EMOJI = re.compile(r'<a:(.+?)worker:')
+WORKER_ROLL_AMOUNT = re.compile(r'\(\+([0-9,]+)\)')
+WORKER_PROGRESS = re.compile(r'`\[([0-9,]+)/([0-9,]+)]`')
+ENERGY_FROM_FOOTER = re.compile(r':\s([0-9,]+)/([0-9,]+)$')
+WORKER_STATS_LEVEL_PROGRESS = re.compile(r'level\*\*: ([0-9,]+) `\[([0-9,]+)/([0-9,]+)]`')
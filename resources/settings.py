@@ -27,6 +27,7 @@ LOG_FILE = os.path.join(BOT_DIR, 'logs/discord.log')
 IMG_LOGO = os.path.join(BOT_DIR, 'images/molly.png')
 IMG_EMBED_WIDTH_LINE = os.path.join(BOT_DIR, 'images/embed_with_line.png')
 VERSION_FILE = os.path.join(BOT_DIR, 'VERSION')
+MESSAGE_CACHE_FILE = os.path.join(BOT_DIR, 'cache/messages.json')
 
 
 # Load .env variables
@@ -91,5 +92,7 @@ DEFAULT_PREFIX = 'molly '
 EMBED_COLOR = 0xEF6180
 ABORT_TIMEOUT = 60
 INTERACTION_TIMEOUT = 300
+MESSAGE_CACHE_TIMESPAN = 10 # Minutes
 
-ENERGY_REGEN_MULTIPLIER_EVENT = 1.75
\ No newline at end of file
+ENERGY_REGEN_MULTIPLIER_EVENT_FALLBACK = 1.75 # Used by processing.seasons until the event calendar is configured
+ENERGY_REGEN_MULTIPLIER_EVENT = ENERGY_REGEN_MULTIPLIER_EVENT_FALLBACK # Set by processing.seasons
\ No newline at end of file
@@ -2,7 +2,7 @@
 """Contains global interaction views"""
 
 import random
-from typing import Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import discord
 from discord.ext import commands
@@ -688,6 +688,8 @@ class ClanMembersView(discord.ui.View):
     topics: Topics to select from - dict (description: function). The functions need to return an embed and have no
     arguments
     active_topic: Currently chosen topic
+    clan_members_data: Computed member rows that are passed to embed_function, so sorting doesn't read the database
+    again
 
     Returns
     -------
@@ -696,13 +698,15 @@ class ClanMembersView(discord.ui.View):
     """
     def __init__(self, ctx: discord.ApplicationContext, clan_settings: clans.Clan, current_view: int,
                  embed_function: Callable, sort_key: Optional[str] = None,
-                 interaction_message: Optional[Union[discord.Message, discord.Interaction]] = None):
+                 interaction_message: Optional[Union[discord.Message, discord.Interaction]] = None,
+                 clan_members_data: Optional[Any] = None):
         super().__init__(timeout=settings.INTERACTION_TIMEOUT)
         self.value = None
         self.ctx = ctx
         self.interaction_message = interaction_message
         self.user = ctx.author
         self.clan_settings = clan_settings
+        self.clan_members_data = clan_members_data
         self.current_view = current_view
         self.sort_key = sort_key
         self.embed_function = embed_function
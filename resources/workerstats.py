@@ -0,0 +1,58 @@
+# workerstats.py
+"""Contains the worker power table used by raids, teamraids and worker lists.
+
+The power of a worker is (speed + strength + intelligence) * (1 + tier / 2.5) * (1 + level / 1.25).
+Powers are precomputed for all worker types up to TABLE_MAX_LEVEL. Higher levels are calculated on first use and
+added to the table.
+"""
+
+from typing import Dict, Optional
+
+from resources import strings
+
+
+TABLE_MAX_LEVEL = 150
+
+
+def _calculate_worker_power(worker_type: str, level: int) -> float:
+    """Calculates the power of a worker with the power formula"""
+    worker_stats = strings.WORKER_STATS[worker_type]
+    return (
+        (worker_stats['speed'] + worker_stats['strength'] + worker_stats['intelligence'])
+        * (1 + worker_stats['tier'] / 2.5) * (1 + level / 1.25)
+    )
+
+
+WORKER_POWER_TABLE: Dict[str, Dict[int, float]] = {
+    worker_type: {level: _calculate_worker_power(worker_type, level) for level in range(TABLE_MAX_LEVEL + 1)}
+    for worker_type in strings.WORKER_STATS
+}
+
+
+async def get_worker_power(worker_type: str, level: int) -> float:
+    """Returns the power of a worker.
+
+    Raises
+    ------
+    KeyError if the worker type doesn't exist.
+    """
+    worker_powers = WORKER_POWER_TABLE[worker_type]
+    worker_power = worker_powers.get(level, None)
+    if worker_power is None:
+        worker_power = worker_powers[level] = _calculate_worker_power(worker_type, level)
+    return worker_power
+
+
+async def get_enemy_power(worker_type: str, level: int, hp_current: Optional[int] = None,
+                          hp_max: Optional[int] = None) -> float:
+    """Returns the power of an enemy farm. If the HP are set, the power is scaled to the remaining HP, as it is in
+    raids.
+
+    Raises
+    ------
+    KeyError if the worker type doesn't exist.
+    """
+    enemy_power = await get_worker_power(worker_type, level)
+    if hp_current is not None and hp_max is not None:
+        enemy_power = enemy_power * (hp_max / 100) / hp_max * hp_current
+    return enemy_power
@@ -0,0 +1,314 @@
+# benchmark.py
+"""Benchmarks the raid solver and the teamraid planner of processing.solver.
+
+Runs all scenarios of scenarios.json plus randomly generated ones and reports
+- the solver latency percentiles (cold, cached and, for teamraids, the updates after every attack)
+- how many solutions are optimal compared to brute force on scenarios with few workers
+- regressions compared to the results of an earlier run
+
+Usage (from the bot directory):
+python -m simulator.benchmark [--rounds 5] [--generated 200] [--output results.json] [--baseline results.json]
+
+The exit code is 1 if a regression was found, 0 otherwise.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+from processing import solver
+from simulator import damage, scenarios
+
+
+BOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VERSION_FILE = os.path.join(BOT_DIR, 'VERSION')
+
+BRUTE_FORCE_MAX_WORKERS = 7 # 5,040 worker orders
+DEFAULT_TOLERANCE = 0.25 # Latency increase that counts as a regression
+MIN_LATENCY_INCREASE = 0.25 # ms, smaller increases are measuring noise
+PERCENTILES = (50, 90, 99)
+
+
+# Helpers
+def get_percentile(values: List[float], percentile: int) -> float:
+    """Returns a percentile of a list of values with the nearest rank method. Returns 0 if the list is empty."""
+    if not values: return 0.0
+    values = sorted(values)
+    rank = max(1, -(-percentile * len(values) // 100))
+    return values[rank - 1]
+
+
+def get_latency_stats(timings: List[float]) -> Dict[str, float]:
+    """Returns the percentiles and the maximum of a list of timings in ms"""
+    latency_stats = {f'p{percentile}': get_percentile(timings, percentile) for percentile in PERCENTILES}
+    latency_stats['max'] = max(timings) if timings else 0.0
+    latency_stats['count'] = len(timings)
+    return latency_stats
+
+
+def get_version() -> str:
+    """Returns the bot version from the file VERSION"""
+    with open(VERSION_FILE, 'r') as version_file:
+        return version_file.readline().rstrip('\n')
+
+
+# Raids
+async def benchmark_raids(raid_scenarios: List[scenarios.Scenario], rounds: int) -> Dict[str, object]:
+    """Runs the raid solver on all scenarios.
+
+    Returns
+    -------
+    Dict with the results
+    """
+    timings_cold = []
+    timings_cached = []
+    optimality_checked = 0
+    not_optimal = []
+    inconsistent = []
+    for scenario in raid_scenarios:
+        workers_power = list((await scenarios.get_workers_power(scenario)).values())[0]
+        enemies_power = await scenarios.read_enemy_farms(scenario)
+        if not workers_power or not enemies_power: continue
+        for _ in range(rounds):
+            solver._SOLUTION_CACHE.clear()
+            start_time = perf_counter()
+            raid_solution = await solver.solve_raid(workers_power, enemies_power)
+            timings_cold.append((perf_counter() - start_time) * 1000)
+            start_time = perf_counter()
+            await solver.solve_raid(workers_power, enemies_power)
+            timings_cached.append((perf_counter() - start_time) * 1000)
+        order_powers = [workers_power[worker_name] for worker_name in raid_solution.workers]
+        raid_result = damage.simulate_attacks(order_powers, list(enemies_power.values()), damage.RAID_DAMAGE_FACTOR)
+        raid_score = damage.get_raid_score(raid_result)
+        if (raid_solution.killed_enemies, raid_solution.hp_left) != (-raid_score[0], raid_score[1]):
+            inconsistent.append(scenario.name)
+        if len(workers_power) <= BRUTE_FORCE_MAX_WORKERS:
+            optimality_checked += 1
+            best_result = damage.brute_force_raid(list(workers_power.values()), list(enemies_power.values()))
+            if raid_score != damage.get_raid_score(best_result): not_optimal.append(scenario.name)
+    solver._SOLUTION_CACHE.clear()
+    return {
+        'latency_cold': get_latency_stats(timings_cold),
+        'latency_cached': get_latency_stats(timings_cached),
+        'optimality_checked': optimality_checked,
+        'optimal': optimality_checked - len(not_optimal),
+        'not_optimal': not_optimal,
+        'inconsistent': inconsistent,
+    }
+
+
+# Teamraids
+def _get_teamraid_workers(workers_power: Dict[str, Dict[str, float]]) -> List[solver.TeamraidWorker]:
+    """Returns the workers of all participants"""
+    return [
+        solver.TeamraidWorker(user_name, worker_type, worker_power)
+        for user_name, user_workers_power in workers_power.items()
+        for worker_type, worker_power in user_workers_power.items()
+    ]
+
+
+async def _play_teamraid(teamraid_workers: List[solver.TeamraidWorker],
+                         enemies_power: List[Tuple[float, int]]) -> Tuple[List[float], Tuple[float, ...]]:
+    """Plays a teamraid like the teamraid helper does: after every attack, the next worker is taken from an updated
+    plan of the same planner.
+
+    Returns
+    -------
+    Tuple with the timings of the updates in ms and the worker powers in attack order
+    """
+    teamraid_planner = solver.TeamraidPlanner()
+    await teamraid_planner.get_plan(teamraid_workers, enemies_power)
+    remaining_workers = list(teamraid_workers)
+    enemies = list(enemies_power)
+    timings = []
+    order = []
+    while True:
+        start_time = perf_counter()
+        plan = await teamraid_planner.get_plan(remaining_workers, enemies)
+        timings.append((perf_counter() - start_time) * 1000)
+        if not plan: break
+        next_worker = plan[0]
+        order.append(next_worker.power)
+        remaining_workers.remove(next_worker)
+        for enemy_index, (enemy_power, enemy_hp) in enumerate(enemies):
+            if enemy_hp <= 0: continue
+            enemy_hp -= damage.get_damage(next_worker.power, enemy_power, damage.TEAMRAID_DAMAGE_FACTOR)
+            enemies[enemy_index] = (enemy_power, max(enemy_hp, 0))
+            break
+    return (timings, tuple(order))
+
+
+async def benchmark_teamraids(teamraid_scenarios: List[scenarios.Scenario], rounds: int) -> Dict[str, object]:
+    """Runs the teamraid planner on all scenarios.
+
+    Returns
+    -------
+    Dict with the results
+    """
+    timings_cold = []
+    timings_update = []
+    optimality_checked = 0
+    not_optimal = []
+    for scenario in teamraid_scenarios:
+        teamraid_workers = _get_teamraid_workers(await scenarios.get_workers_power(scenario))
+        enemies_power = list((await scenarios.read_enemy_farms(scenario)).values())
+        if not teamraid_workers or not enemies_power: continue
+        for _ in range(rounds):
+            teamraid_planner = solver.TeamraidPlanner()
+            start_time = perf_counter()
+            await teamraid_planner.get_plan(teamraid_workers, enemies_power)
+            timings_cold.append((perf_counter() - start_time) * 1000)
+        play_timings, order = await _play_teamraid(teamraid_workers, enemies_power)
+        timings_update += play_timings
+        if len(teamraid_workers) <= BRUTE_FORCE_MAX_WORKERS:
+            optimality_checked += 1
+            teamraid_result = damage.simulate_attacks(order, enemies_power, damage.TEAMRAID_DAMAGE_FACTOR)
+            best_result = damage.brute_force_teamraid([teamraid_worker.power for teamraid_worker in teamraid_workers],
+                                                      enemies_power)
+            if damage.get_teamraid_score(teamraid_result) != damage.get_teamraid_score(best_result):
+                not_optimal.append(scenario.name)
+    return {
+        'latency_cold': get_latency_stats(timings_cold),
+        'latency_update': get_latency_stats(timings_update),
+        'optimality_checked': optimality_checked,
+        'optimal': optimality_checked - len(not_optimal),
+        'not_optimal': not_optimal,
+    }
+
+
+# Regressions
+def find_regressions(results: Dict[str, object], baseline: Dict[str, object], tolerance: float) -> List[str]:
+    """Compares the results to the results of an earlier run.
+    Latencies regress if their p90 increased by more than the tolerance and by more than MIN_LATENCY_INCREASE.
+    Optimality regresses if the share of optimal solutions decreased.
+
+    Returns
+    -------
+    List with a description of every regression
+    """
+    regressions = []
+    for solver_name in ('raid', 'teamraid'):
+        solver_results = results.get(solver_name, {})
+        solver_baseline = baseline.get(solver_name, {})
+        for metric_name, metric in solver_results.items():
+            if not metric_name.startswith('latency_'): continue
+            baseline_metric = solver_baseline.get(metric_name, None)
+            if not baseline_metric or not baseline_metric.get('p90', 0): continue
+            if (metric['p90'] > baseline_metric['p90'] * (1 + tolerance)
+                and metric['p90'] - baseline_metric['p90'] > MIN_LATENCY_INCREASE):
+                regressions.append(
+                    f'{solver_name} {metric_name}: p90 {baseline_metric["p90"]:,.3f} ms ➜ {metric["p90"]:,.3f} ms'
+                )
+        if solver_results.get('optimality_checked', 0) and solver_baseline.get('optimality_checked', 0):
+            optimal_share = solver_results['optimal'] / solver_results['optimality_checked']
+            baseline_optimal_share = solver_baseline['optimal'] / solver_baseline['optimality_checked']
+            if optimal_share < baseline_optimal_share:
+                regressions.append(
+                    f'{solver_name} optimality: {baseline_optimal_share:.1%} ➜ {optimal_share:.1%}'
+                )
+        if solver_results.get('inconsistent', None):
+            regressions.append(f'{solver_name} reported results that differ from the simulation: '
+                               f'{", ".join(solver_results["inconsistent"])}')
+    return regressions
+
+
+# Report
+def get_report(results: Dict[str, object]) -> str:
+    """Returns a readable report of the results"""
+    report = f'Version: {results["version"]} | Python {results["python"]} | {results["scenarios"]} scenarios'
+    for solver_name in ('raid', 'teamraid'):
+        solver_results = results[solver_name]
+        report = f'{report}\n\n{solver_name.capitalize()}'
+        for metric_name, metric in solver_results.items():
+            if not metric_name.startswith('latency_'): continue
+            percentiles = ' | '.join(f'p{percentile} {metric[f"p{percentile}"]:,.3f} ms' for percentile in PERCENTILES)
+            report = (
+                f'{report}\n'
+                f'- {metric_name.replace("_", " ").capitalize()}: {percentiles} | max {metric["max"]:,.3f} ms '
+                f'({metric["count"]:,} runs)'
+            )
+        report = (
+            f'{report}\n'
+            f'- Optimal: {solver_results["optimal"]:,}/{solver_results["optimality_checked"]:,} '
+            f'(brute force up to {BRUTE_FORCE_MAX_WORKERS} workers)'
+        )
+        if solver_results['not_optimal']:
+            report = f'{report}\n- Not optimal: {", ".join(solver_results["not_optimal"])}'
+    return report
+
+
+async def run_benchmark(rounds: int, generated: int, seed: int,
+                        scenarios_file: Optional[str] = None) -> Dict[str, object]:
+    """Runs the benchmark.
+
+    Arguments
+    ---------
+    rounds: How often every scenario is solved for the latency stats
+    generated: Amount of random scenarios per raid type that are added to the recorded ones
+    seed: Seed of the random scenarios
+    scenarios_file: File with the recorded scenarios. Defaults to scenarios.SCENARIOS_FILE.
+
+    Returns
+    -------
+    Dict with the results
+    """
+    if scenarios_file is None: scenarios_file = scenarios.SCENARIOS_FILE
+    raid_scenarios = scenarios.load_scenarios(scenarios_file, 'raid')
+    raid_scenarios += scenarios.generate_scenarios(generated, 'raid', seed)
+    teamraid_scenarios = scenarios.load_scenarios(scenarios_file, 'teamraid')
+    teamraid_scenarios += scenarios.generate_scenarios(generated, 'teamraid', seed, max_workers=3)
+    return {
+        'version': get_version(),
+        'python': platform.python_version(),
+        'scenarios': len(raid_scenarios) + len(teamraid_scenarios),
+        'rounds': rounds,
+        'generated': generated,
+        'seed': seed,
+        'raid': await benchmark_raids(raid_scenarios, rounds),
+        'teamraid': await benchmark_teamraids(teamraid_scenarios, rounds),
+    }
+
+
+def main() -> int:
+    """Runs the benchmark from the command line and returns the exit code"""
+    parser = argparse.ArgumentParser(description='Benchmarks the raid solver and the teamraid planner.')
+    parser.add_argument('--rounds', type=int, default=5, help='How often every scenario is solved')
+    parser.add_argument('--generated', type=int, default=100,
+                        help='Amount of random scenarios per raid type')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the random scenarios')
+    parser.add_argument('--scenarios', default=None, help='File with recorded scenarios')
+    parser.add_argument('--output', default=None, help='Saves the results to this file')
+    parser.add_argument('--baseline', default=None, help='Compares the results to the results in this file')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Latency increase that counts as a regression (0.25 = 25%%)')
+    arguments = parser.parse_args()
+    results = asyncio.run(run_benchmark(arguments.rounds, arguments.generated, arguments.seed, arguments.scenarios))
+    print(get_report(results))
+    if arguments.output is not None:
+        with open(arguments.output, 'w', encoding='utf-8') as output_file:
+            json.dump(results, output_file, indent=2, ensure_ascii=False)
+    if arguments.baseline is None: return 0
+    with open(arguments.baseline, 'r', encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)
+    for setting in ('scenarios', 'rounds', 'generated', 'seed'):
+        if results[setting] != baseline.get(setting, None):
+            print(f'\nWarning: The baseline was run with a different setting "{setting}". Results may not be '
+                  f'comparable.')
+            break
+    regressions = find_regressions(results, baseline, arguments.tolerance)
+    if not regressions:
+        print(f'\nNo regressions compared to version {baseline.get("version", "?")}.')
+        return 0
+    print(f'\nRegressions compared to version {baseline.get("version", "?")}:')
+    for regression in regressions:
+        print(f'- {regression}')
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+# damage.py
+"""Contains the damage model of raids and teamraids as used in processing.raid and processing.teamraid.
+
+Workers attack the enemy farms in order. Every worker attacks the first farm that is still alive and deals
+round(damage factor * worker power / farm power) damage to its HP. The damage factor is 85 in raids and 100 in
+teamraids. Damage that exceeds the HP of a farm is lost.
+
+Also contains brute force solvers that try every worker order. They are slow and only meant to check the results of
+processing.solver on small cases.
+"""
+
+from itertools import permutations
+from typing import List, NamedTuple, Sequence, Tuple
+
+
+RAID_DAMAGE_FACTOR = 85
+TEAMRAID_DAMAGE_FACTOR = 100
+
+
+class RaidResult(NamedTuple):
+    """Result of a simulated raid. hp_left is the HP of the next farm, 0 if all farms are killed."""
+    killed_enemies: int
+    hp_left: int
+    next_enemy_attacked: bool
+    wasted_damage: int
+    workers_used: int
+
+
+def get_damage(worker_power: float, enemy_power: float, damage_factor: int) -> int:
+    """Returns the damage a worker deals to a farm"""
+    return round(damage_factor * worker_power / enemy_power)
+
+
+def simulate_attacks(workers_power: Sequence[float], enemies_power: Sequence[Tuple[float, int]],
+                     damage_factor: int) -> RaidResult:
+    """Lets the workers attack the farms in the given order. Workers that attack after all farms are killed are not
+    used.
+
+    Arguments
+    ---------
+    workers_power: Powers of the workers in attack order
+    enemies_power: List[(enemy_power, enemy_hp)] of all farms in attack order. Killed farms are ignored.
+    damage_factor: RAID_DAMAGE_FACTOR or TEAMRAID_DAMAGE_FACTOR
+
+    Returns
+    -------
+    RaidResult
+    """
+    enemies: List[List[float]] = [
+        [enemy_power, enemy_hp] for enemy_power, enemy_hp in enemies_power if enemy_hp > 0
+    ]
+    killed_enemies = len(enemies_power) - len(enemies)
+    wasted_damage = workers_used = 0
+    next_enemy_attacked = False
+    for worker_power in workers_power:
+        if not enemies: break
+        workers_used += 1
+        damage = get_damage(worker_power, enemies[0][0], damage_factor)
+        enemies[0][1] -= damage
+        if damage > 0: next_enemy_attacked = True
+        if enemies[0][1] <= 0:
+            wasted_damage -= enemies[0][1]
+            del enemies[0]
+            killed_enemies += 1
+            next_enemy_attacked = False
+    hp_left = enemies[0][1] if enemies else 0
+    return RaidResult(killed_enemies, int(hp_left), next_enemy_attacked, int(wasted_damage), workers_used)
+
+
+def brute_force_raid(workers_power: Sequence[float], enemies_power: Sequence[Tuple[float, int]]) -> RaidResult:
+    """Returns the best possible result of a raid. Uses the same order of goals as processing.solver.solve_raid:
+    most farms killed, then least HP left on the next farm, then fewest workers used."""
+    best_result = best_score = None
+    for order in permutations(workers_power):
+        result = simulate_attacks(order, enemies_power, RAID_DAMAGE_FACTOR)
+        score = get_raid_score(result)
+        if best_score is None or score < best_score:
+            best_result, best_score = result, score
+    return best_result
+
+
+def brute_force_teamraid(workers_power: Sequence[float], enemies_power: Sequence[Tuple[float, int]]) -> RaidResult:
+    """Returns the best possible result of a teamraid. Uses the same order of goals as
+    processing.solver.TeamraidPlanner: most farms killed, then least HP left on the next farm, then least damage
+    wasted."""
+    best_result = best_score = None
+    for order in permutations(workers_power):
+        result = simulate_attacks(order, enemies_power, TEAMRAID_DAMAGE_FACTOR)
+        score = get_teamraid_score(result)
+        if best_score is None or score < best_score:
+            best_result, best_score = result, score
+    return best_result
+
+
+def get_raid_score(result: RaidResult) -> Tuple[int, int, int]:
+    """Returns a score of a raid result. Lower is better. Like processing.solver.RaidSolution, the HP left are 100 if
+    the next farm wasn't attacked."""
+    hp_left = result.hp_left if result.next_enemy_attacked else 100
+    return (-result.killed_enemies, hp_left, result.workers_used)
+
+
+def get_teamraid_score(result: RaidResult) -> Tuple[int, int, int]:
+    """Returns a score of a teamraid result. Lower is better."""
+    return (-result.killed_enemies, result.hp_left, result.wasted_damage)
@@ -0,0 +1,164 @@
+# scenarios.py
+"""Contains the raid and teamraid scenarios used by the benchmark.
+
+A scenario consists of the worker levels of all participants and the embed fields with the enemy farms, as they are
+sent by IDLE FARM. Enemy farms are read the same way as in processing.raid and processing.teamraid.
+Scenarios are stored in scenarios.json. Additional scenarios can be generated randomly.
+"""
+
+import json
+import os
+import random
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from resources import regex, strings, workerstats
+
+
+SCENARIOS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scenarios.json')
+
+RAID_TYPES = ('raid', 'teamraid')
+
+
+class Scenario(NamedTuple):
+    """Raid or teamraid scenario. Raids have exactly one participant."""
+    name: str
+    raid_type: str
+    workers: Dict[str, Dict[str, int]] # user_name: {worker_type: worker_level}
+    fields: Tuple[Dict[str, str], ...] # Embed fields with the keys 'name' and 'value'
+
+
+# Loading
+def load_scenarios(file_path: str = SCENARIOS_FILE, raid_type: Optional[str] = None) -> List[Scenario]:
+    """Loads the scenarios from a json file. If raid_type is set, only scenarios of that type are returned.
+
+    Raises
+    ------
+    OSError if the file can't be read.
+    ValueError if the file contains an invalid scenario.
+    """
+    with open(file_path, 'r', encoding='utf-8') as scenarios_file:
+        scenarios_data = json.load(scenarios_file)
+    scenarios = []
+    for scenario_data in scenarios_data:
+        scenario = Scenario(
+            scenario_data['name'],
+            scenario_data['raid_type'],
+            scenario_data['workers'],
+            tuple(scenario_data['fields']),
+        )
+        if scenario.raid_type not in RAID_TYPES:
+            raise ValueError(f'Scenario "{scenario.name}" has an unknown raid type "{scenario.raid_type}".')
+        if scenario.raid_type == 'raid' and len(scenario.workers) != 1:
+            raise ValueError(f'Raid scenario "{scenario.name}" needs exactly one participant.')
+        if raid_type is None or scenario.raid_type == raid_type: scenarios.append(scenario)
+    return scenarios
+
+
+def save_scenarios(scenarios: List[Scenario], file_path: str = SCENARIOS_FILE) -> None:
+    """Saves scenarios to a json file. Existing scenarios in that file are overwritten."""
+    scenarios_data = [
+        {'name': scenario.name, 'raid_type': scenario.raid_type, 'workers': scenario.workers,
+         'fields': list(scenario.fields)}
+        for scenario in scenarios
+    ]
+    with open(file_path, 'w', encoding='utf-8') as scenarios_file:
+        json.dump(scenarios_data, scenarios_file, indent=2, ensure_ascii=False)
+        scenarios_file.write('\n')
+
+
+# Generating
+def _get_enemy_farm_line(worker_type: str, level: int, hp_current: int, hp_max: int = 100) -> str:
+    """Returns a line with an enemy farm as it is shown in raid embeds"""
+    return f'<a:{worker_type}worker:1> **{worker_type.capitalize()}** lv{level} | `{hp_current}/{hp_max}`'
+
+
+def generate_scenarios(count: int, raid_type: str, seed: int = 0, max_workers: int = 9,
+                       max_level: int = 60) -> List[Scenario]:
+    """Generates random scenarios. The same seed always returns the same scenarios.
+
+    Arguments
+    ---------
+    count: Amount of scenarios
+    raid_type: 'raid' or 'teamraid'
+    seed: Seed of the random generator
+    max_workers: Maximum amount of workers per participant
+    max_level: Maximum level of workers and enemy farms
+
+    Raises
+    ------
+    ValueError if the raid type is unknown.
+    """
+    if raid_type not in RAID_TYPES: raise ValueError(f'Unknown raid type "{raid_type}".')
+    random_generator = random.Random(seed)
+    scenarios = []
+    for scenario_index in range(count):
+        participants = 1 if raid_type == 'raid' else random_generator.randint(2, 4)
+        workers = {}
+        for participant_index in range(participants):
+            worker_amount = random_generator.randint(1, min(max_workers, len(strings.WORKER_TYPES_RAID)))
+            worker_types = random_generator.sample(strings.WORKER_TYPES_RAID, worker_amount)
+            workers[f'player{participant_index + 1}'] = {
+                worker_type: random_generator.randint(1, max_level) for worker_type in worker_types
+            }
+        fields = []
+        if raid_type == 'raid':
+            enemy_types = random_generator.sample(strings.WORKER_TYPES_RAID, random_generator.randint(1, 3))
+            enemy_lines = [
+                _get_enemy_farm_line(enemy_type, random_generator.randint(1, max_level), 100)
+                for enemy_type in enemy_types
+            ]
+            fields.append({'name': 'Raidpoints', 'value': '\n'.join(enemy_lines)})
+        else:
+            for farm_index in range(random_generator.randint(2, 5)):
+                enemy_type = random_generator.choice(strings.WORKER_TYPES_RAID)
+                enemy_level = random_generator.randint(1, max_level * participants)
+                fields.append({'name': f'Farm {farm_index + 1}',
+                               'value': _get_enemy_farm_line(enemy_type, enemy_level, 100)})
+        scenarios.append(Scenario(f'generated-{raid_type}-{seed}-{scenario_index}', raid_type, workers, tuple(fields)))
+    return scenarios
+
+
+# Reading
+async def get_workers_power(scenario: Scenario) -> Dict[str, Dict[str, float]]:
+    """Returns the worker powers of all participants.
+
+    Returns
+    -------
+    Dict[user_name: Dict[worker_type: worker_power]]
+    """
+    workers_power = {}
+    for user_name, worker_levels in scenario.workers.items():
+        workers_power[user_name] = {}
+        for worker_type, worker_level in worker_levels.items():
+            workers_power[user_name][worker_type] = await workerstats.get_worker_power(worker_type, worker_level)
+    return workers_power
+
+
+async def read_enemy_farms(scenario: Scenario) -> Dict[str, Tuple[float, int]]:
+    """Returns the enemy farms of a scenario. Raid farms are read from field 0 and scaled to their HP, teamraid farms
+    are read from all farm fields, as in processing.raid and processing.teamraid.
+
+    Returns
+    -------
+    Dict[enemy_name: (enemy_power, enemy_hp)] in attack order
+    """
+    enemies_power = {}
+    fields = scenario.fields[:1] if scenario.raid_type == 'raid' else scenario.fields
+    for field_index, field in enumerate(fields):
+        if scenario.raid_type == 'teamraid' and not 'farm' in field['name'].lower() and field['name'] != '': continue
+        for line in field['value'].split('\n'):
+            if 'none' in line.lower(): continue
+            enemy_data_match = re.search(regex.RAID_ENEMY_FARM, line.lower())
+            enemy_type = enemy_data_match.group(1)
+            enemy_level = int(re.sub(r'\D', '', enemy_data_match.group(2)))
+            enemy_hp_current = int(enemy_data_match.group(3))
+            enemy_hp_max = int(enemy_data_match.group(4))
+            if scenario.raid_type == 'raid':
+                enemy_power = await workerstats.get_enemy_power(enemy_type, enemy_level, enemy_hp_current,
+                                                                enemy_hp_max)
+                enemies_power[enemy_type] = (enemy_power, enemy_hp_current)
+            else:
+                enemy_power = await workerstats.get_enemy_power(enemy_type, enemy_level)
+                enemies_power[f'{enemy_type}{field_index}'] = (enemy_power, enemy_hp_current)
+    return enemies_power